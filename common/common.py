@@ -11,15 +11,17 @@ MAPS_DIR = os.path.join(SETUP_DIR, 'maps')
 POINTS_DIR = os.path.join(SETUP_DIR, 'points')
 
 # ----------------------- Heuristics & Scoring -----------------------
+# Speed per time bucket used by dynamic_heuristic (bucket = int(t) % len)
+SPEED_PROFILE = (350, 350, 500, 500, 600, 600, 550, 500, 400, 300,
+                 600, 550, 500, 400, 300, 600, 550, 500, 400, 300)
+
 def dynamic_heuristic(node, goal, graph, t=0.0):
     """Heuristic based on Euclidean distance divided by time-varying speed."""
     x1, y1 = graph.nodes[node]['x'], graph.nodes[node]['y']
     x2, y2 = graph.nodes[goal]['x'], graph.nodes[goal]['y']
     dx, dy = x1 - x2, y1 - y2
     distance = (dx ** 2 + dy ** 2) ** 0.5
-    speeds = [350, 350, 500, 500, 600, 600, 550, 500, 400, 300,
-              600, 550, 500, 400, 300, 600, 550, 500, 400, 300]
-    speed = speeds[int(t) % len(speeds)]
+    speed = SPEED_PROFILE[int(t) % len(SPEED_PROFILE)]
     return distance / speed
 
 def f_vector_basic(g_score, h_score, hopper_count, t=0.0):
@@ -41,9 +43,41 @@ def _original_load_map(city_name: str):
     graph = ox.graph_from_place(city_name, network_type='drive', simplify=True)
     return graph
 
+def map_pickle_path(city_name: str):
+    return os.path.join(MAPS_DIR, f"{city_name}.pkl")
+
+def map_fingerprint(city_name: str):
+    """(size, mtime_ns) of the cached map pickle, or None if it is missing."""
+    try:
+        st = os.stat(map_pickle_path(city_name))
+    except FileNotFoundError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+def map_artifact_path(city_name: str, kind: str):
+    """Path of a derived structure (e.g. kind='alt') stored next to the map pickle."""
+    return os.path.join(MAPS_DIR, f"{city_name}.{kind}.pkl")
+
+def save_map_artifact(city_name: str, kind: str, data):
+    """Pickle data next to the map, stamped with the current map fingerprint."""
+    ensure_setup_dirs()
+    with open(map_artifact_path(city_name, kind), 'wb') as f:
+        pickle.dump({'fingerprint': map_fingerprint(city_name), 'data': data}, f)
+
+def load_map_artifact(city_name: str, kind: str):
+    """Load a derived structure; None if missing or built from another map version."""
+    path = map_artifact_path(city_name, kind)
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'rb') as f:
+        stored = pickle.load(f)
+    if stored.get('fingerprint') != map_fingerprint(city_name):
+        return None
+    return stored['data']
+
 def load_map(city_name: str):
     ensure_setup_dirs()
-    pkl_path = os.path.join(MAPS_DIR, f"{city_name}.pkl")
+    pkl_path = map_pickle_path(city_name)
     if os.path.isfile(pkl_path):
         with open(pkl_path, 'rb') as f:
             return pickle.load(f)
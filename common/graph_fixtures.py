@@ -0,0 +1,98 @@
+import heapq
+import math
+import random
+
+from part1.algorithms import WEIGHT_COST, WEIGHT_HOP
+
+# Graph fixtures and reference solvers shared by the unit tests. Generators
+# return plain adjacency dicts (node -> list of (neighbor, cost)); each test
+# module wraps them in its own SimpleGraph adapter.
+
+GRID_MOVES = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+def random_grid(size, seed, costs=(1, 2, 3), keep=0.85, moves=GRID_MOVES):
+    """
+    size x size grid of (x, y) nodes. Each arc of moves is kept independently
+    with probability keep (so some streets end up one-way; keep=1 keeps every
+    arc without drawing) and costs a random choice from costs, scaled by the
+    move length for diagonal moves.
+    """
+    rnd = random.Random(seed)
+    edges = {}
+    for x in range(size):
+        for y in range(size):
+            nbrs = []
+            for dx, dy in moves:
+                v = (x + dx, y + dy)
+                if 0 <= v[0] < size and 0 <= v[1] < size and (keep >= 1 or rnd.random() < keep):
+                    cost = rnd.choice(costs)
+                    nbrs.append((v, cost * math.hypot(dx, dy) if dx and dy else cost))
+            edges[(x, y)] = nbrs
+    return edges
+
+def random_jump_grid(size, seed):
+    """Full grid plus long (2, 2) diagonal jumps, so fewer hops can cost more."""
+    rnd = random.Random(seed)
+    edges = {}
+    for x in range(size):
+        for y in range(size):
+            nbrs = []
+            for dx, dy in GRID_MOVES + ((2, 2),):
+                v = (x + dx, y + dy)
+                if 0 <= v[0] < size and 0 <= v[1] < size:
+                    cost = rnd.choice([1, 1, 2, 3]) if dx != 2 else rnd.choice([4, 6, 9])
+                    nbrs.append((v, cost))
+            edges[(x, y)] = nbrs
+    return edges
+
+def blocked_grid(size, blocked=()):
+    """size x size unit-cost grid; nodes in blocked keep no arcs and get none."""
+    edges = {}
+    for x in range(size):
+        for y in range(size):
+            u = (x, y)
+            nbrs = []
+            if u not in blocked:
+                for dx, dy in GRID_MOVES:
+                    v = (x + dx, y + dy)
+                    if 0 <= v[0] < size and 0 <= v[1] < size and v not in blocked:
+                        nbrs.append((v, 1))
+            edges[u] = nbrs
+    return edges
+
+def random_digraph(n, m, seed):
+    """
+    n points in a 1000 x 1000 square and m random arcs, each at least as long
+    as the straight line. Returns (edges, coords).
+    """
+    rnd = random.Random(seed)
+    coords = {u: (rnd.uniform(0, 1000), rnd.uniform(0, 1000)) for u in range(n)}
+    edges = {u: [] for u in range(n)}
+    arcs = set()
+    while len(arcs) < m:
+        u, v = rnd.sample(range(n), 2)
+        if (u, v) not in arcs:
+            arcs.add((u, v))
+            edges[u].append((v, math.dist(coords[u], coords[v]) * rnd.uniform(1.0, 1.5)))
+    return edges, coords
+
+def weighted_dijkstra(adj, start, goal, wc=WEIGHT_COST, wh=WEIGHT_HOP):
+    """Reference: plain Dijkstra on wc * cost + wh per edge; None when goal is unreachable."""
+    dist = {start: 0.0}
+    heap = [(0.0, start)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u == goal:
+            return d
+        if d > dist[u]:
+            continue
+        for v, cost in adj.get(u, []):
+            nd = d + wc * cost + wh
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return None
+
+def score(fvec):
+    """Scalar objective of a [cost, hop] result."""
+    return WEIGHT_COST * fvec[0] + WEIGHT_HOP * fvec[1]
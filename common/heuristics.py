@@ -0,0 +1,99 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from common.common import SPEED_PROFILE
+
+
+class GoalCache:
+    """
+    Thread-safe LRU of per-goal rows. compute(key) must return a list indexed
+    by dense node id; the most recent row is also kept outside the lock so
+    repeated lookups toward the same goal cost one attribute read.
+    """
+
+    def __init__(self, compute, maxsize=32):
+        self.compute = compute
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._rows = OrderedDict()
+        self._last = (object(), None)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        last_key, last_row = self._last
+        if last_key == key:
+            return last_row
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                self.misses += 1
+                row = self.compute(key)
+                self._rows[key] = row
+                if len(self._rows) > self.maxsize:
+                    self._rows.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self.hits += 1
+                self._rows.move_to_end(key)
+            self._last = (key, row)
+        return row
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+            self._last = (object(), None)
+
+
+class HeuristicTable:
+    """
+    Vectorised replacement for per-call heuristics on a road graph.
+
+    Node coordinates are copied once into numpy arrays; the first query toward
+    a goal computes the distance from every node to it in one pass, later
+    calls are a dict lookup plus a list index. Rows are cached per goal (and
+    per speed bucket for dynamic()) with LRU eviction.
+
+    table.euclidean and table.dynamic have the h_func signature used by
+    astar_solver and astar_parallel.
+    """
+
+    def __init__(self, graph, speed_profile=SPEED_PROFILE, cache_size=32):
+        self.node_ids = list(graph.nodes)
+        self.index = {node: i for i, node in enumerate(self.node_ids)}
+        nodes = graph.nodes
+        self.xs = np.array([nodes[n].get('x', 0.0) for n in self.node_ids], dtype=np.float64)
+        self.ys = np.array([nodes[n].get('y', 0.0) for n in self.node_ids], dtype=np.float64)
+        self.speed_profile = list(speed_profile)
+        self._distance = GoalCache(self._distance_row, cache_size)
+        self._dynamic = GoalCache(self._dynamic_row, cache_size)
+
+    def _distance_array(self, goal):
+        return np.hypot(self.xs - self.xs[goal], self.ys - self.ys[goal])
+
+    def _distance_row(self, goal):
+        return self._distance_array(goal).tolist()
+
+    def _dynamic_row(self, key):
+        goal, bucket = key
+        return (self._distance_array(goal) / self.speed_profile[bucket]).tolist()
+
+    def euclidean(self, u, v, graph=None):
+        """Euclidean distance in coordinate units, like part1's euclidean_h."""
+        iu = self.index.get(u)
+        iv = self.index.get(v)
+        if iu is None or iv is None:
+            return 0.0
+        return self._distance.get(iv)[iu]
+
+    def dynamic(self, u, v, graph=None, t=0.0):
+        """Same values as common.dynamic_heuristic (time-bucketed speed)."""
+        iu = self.index.get(u)
+        iv = self.index.get(v)
+        if iu is None or iv is None:
+            return 0.0
+        bucket = int(t) % len(self.speed_profile)
+        return self._dynamic.get((iv, bucket))[iu]
@@ -0,0 +1,225 @@
+import sys
+import threading
+import types
+from collections import OrderedDict
+
+from common.common import map_fingerprint, load_map_artifact, save_map_artifact
+
+ARTIFACT_KIND = 'routes'
+
+
+def callable_key(func):
+    """
+    Key for a heuristic / f-vector function or solver. Module-level
+    functions are keyed by qualified name, which is stable across runs.
+    Lambdas, nested functions, bound methods and callable instances can
+    behave differently under one name, so their key also carries the id()
+    of the function or bound instance ("name@0x..."); such keys are only
+    valid in this process and never written to disk.
+    """
+    if func is None:
+        return None
+    owner = getattr(func, '__self__', None)
+    name = getattr(func, '__qualname__', None)
+    if owner is not None and name is not None and not isinstance(owner, types.ModuleType):
+        return f"{type(owner).__module__}.{name}@{id(owner):#x}"
+    if name is not None:
+        key = f"{getattr(func, '__module__', '')}.{name}"
+        return f"{key}@{id(func):#x}" if '<' in name else key
+    return f"{type(func).__module__}.{type(func).__qualname__}@{id(func):#x}"
+
+
+def _local_names(key):
+    """The id()-based callable keys (see callable_key) that a cache key refers to."""
+    _, _, solver, _, _, heuristic, weights = key
+    return [part for part in (solver[0], heuristic, weights) if isinstance(part, str) and '@0x' in part]
+
+
+def _process_local(key):
+    """True if any callable in a cache key was keyed by id() (see callable_key)."""
+    return bool(_local_names(key))
+
+
+class RouteCache:
+    """
+    LRU cache of routing results for one city map.
+
+    Keys are (city, map version, solver, source, target, heuristic, weights);
+    the map version is the fingerprint of setup/maps/<city>.pkl and is
+    re-checked on every lookup, so a rewritten map pickle drops every entry.
+
+    With disk=True entries evicted from memory move to a second tier that is
+    stored as setup/maps/<city>.routes.pkl by flush() (stamped with the map
+    fingerprint, so a stale file is ignored on load). The disk tier keeps
+    at most disk_maxsize entries, oldest dropped first.
+
+    Callables keyed by id() are kept alive while a stored entry refers to
+    their key, so the id cannot be reused by another function meanwhile.
+    Pins no entry refers to any more are dropped once their number doubles,
+    so passing a fresh lambda per query does not grow the cache beyond its
+    entries.
+    """
+
+    def __init__(self, city_name, maxsize=1024, disk=False, disk_maxsize=100_000):
+        self.city_name = city_name
+        self.maxsize = maxsize
+        self.disk = disk
+        self.disk_maxsize = disk_maxsize
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._disk_entries = None
+        self._dirty = False
+        self._pinned = {}  # id()-keyed callables, kept alive so their ids are not reused
+        self._pin_limit = 64  # prune _pinned when it grows past this
+        self._lock = threading.Lock()
+        self.version = map_fingerprint(city_name)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, solver, source, target, heuristic=None, weights=None):
+        return (self.city_name, self.version, solver, source, target, heuristic, weights)
+
+    def _check_version(self):
+        version = map_fingerprint(self.city_name)
+        if version != self.version:
+            self.version = version
+            self._entries.clear()
+            self._disk_entries = None
+            self._dirty = False
+            self.invalidations += 1
+
+    def _disk_tier(self):
+        if self._disk_entries is None:
+            stored = load_map_artifact(self.city_name, ARTIFACT_KIND) if self.disk else None
+            self._disk_entries = OrderedDict(stored or {})
+        return self._disk_entries
+
+    def get(self, solver, source, target, heuristic=None, weights=None):
+        """Cached (path, [cost, hop]) or None on a miss."""
+        with self._lock:
+            self._check_version()
+            key = self.key(solver, source, target, heuristic, weights)
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            elif self.disk and key in self._disk_tier():
+                value = self._disk_entries.pop(key)
+                self._dirty = True
+                self._insert(key, value)
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                return None
+        path, fvec = value
+        return (list(path) if path is not None else None,
+                list(fvec) if fvec is not None else None)
+
+    def put(self, solver, source, target, heuristic, weights, result):
+        path, fvec = result
+        value = (tuple(path) if path is not None else None,
+                 tuple(fvec) if fvec is not None else None)
+        with self._lock:
+            self._check_version()
+            self._insert(self.key(solver, source, target, heuristic, weights), value)
+
+    def _insert(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            old_key, old_value = self._entries.popitem(last=False)
+            self.evictions += 1
+            if self.disk:
+                tier = self._disk_tier()
+                tier[old_key] = old_value
+                while len(tier) > self.disk_maxsize:
+                    tier.popitem(last=False)
+                self._dirty = True
+
+    def flush(self):
+        """Write memory and disk entries to setup/maps/<city>.routes.pkl (disk=True only)."""
+        if not self.disk:
+            return
+        with self._lock:
+            self._check_version()
+            tier = self._disk_tier()
+            if not self._dirty and not self._entries:
+                return
+            merged = OrderedDict((k, v) for k, v in tier.items() if not _process_local(k))
+            merged.update((k, v) for k, v in self._entries.items() if not _process_local(k))
+            while len(merged) > self.disk_maxsize:
+                merged.popitem(last=False)
+            save_map_artifact(self.city_name, ARTIFACT_KIND, dict(merged))
+            self._dirty = False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._disk_entries = OrderedDict() if self.disk else None
+            self._dirty = self.disk
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'size': len(self._entries),
+        }
+
+    def _pin(self, *pairs):
+        """
+        Keep the id()-keyed callables of (key, func) pairs alive; called after
+        their entry is stored, while the caller still holds func.
+        """
+        with self._lock:
+            for key, func in pairs:
+                if isinstance(key, str) and '@0x' in key:
+                    self._pinned[key] = func
+            if len(self._pinned) > self._pin_limit:
+                tiers = [self._entries] + ([self._disk_entries] if self._disk_entries else [])
+                live = {name for tier in tiers for key in tier for name in _local_names(key)}
+                self._pinned = {key: func for key, func in self._pinned.items() if key in live}
+                self._pin_limit = max(64, 2 * len(self._pinned))
+
+    def wrap(self, solver, weights=None, heuristic=None):
+        """
+        Cached version of an astar_solver-style solver:
+        solver(start_node, goal, graph, h_func, f_vector_func=None, **options).
+        weights goes into the key as given; when None it is the f_vector_func
+        (astar_parallel) or else (WEIGHT_COST, WEIGHT_HOP) of the solver's
+        module. heuristic names h_func in the key; when None it is
+        callable_key(h_func), which for bound methods and lambdas only holds
+        within this process, so pass a name to reuse disk entries across runs.
+        Pass one as well when h_func is built per query (a fresh lambda or
+        bound method each call): its key differs every time and never hits.
+        Other options (version, num_threads, ...) are part of the solver key;
+        a stats dict is ignored and not filled on a hit.
+        """
+        solver_name = callable_key(solver)
+        module = sys.modules.get(getattr(solver, '__module__', ''))
+
+        def cached_solver(start_node, goal, graph, h_func, f_vector_func=None, **options):
+            if weights is not None:
+                weight_key = weights
+            elif f_vector_func is not None:
+                weight_key = callable_key(f_vector_func)
+            else:
+                weight_key = (getattr(module, 'WEIGHT_COST', None), getattr(module, 'WEIGHT_HOP', None))
+            solver_key = (solver_name,) + tuple(sorted((k, v) for k, v in options.items() if k != 'stats'))
+            heuristic_key = heuristic if heuristic is not None else callable_key(h_func)
+            result = self.get(solver_key, start_node, goal, heuristic_key, weight_key)
+            if result is None:
+                result = solver(start_node, goal, graph, h_func, f_vector_func, **options)
+                self.put(solver_key, start_node, goal, heuristic_key, weight_key, result)
+                self._pin((solver_name, solver), (heuristic_key, h_func), (weight_key, f_vector_func))
+            return result
+
+        cached_solver.__wrapped__ = solver
+        return cached_solver
@@ -0,0 +1,206 @@
+import math
+import threading
+
+import numpy as np
+
+from common.common import load_map_artifact, save_map_artifact
+
+ARTIFACT_KIND = 'snap'
+NODES_PER_CELL = 2.0
+
+
+class SpatialIndex:
+    """
+    Uniform grid over node coordinates for nearest-node snapping.
+
+    Coordinates are (x, y) = (lon, lat) like ox.nearest_nodes. For an
+    unprojected graph x is scaled by cos(mean latitude), so distances are
+    equirectangular, which matches great-circle order at city scale.
+    Nodes are sorted by cell (column-major), so a column of cells is one
+    contiguous slice and a (2r+1) x (2r+1) block costs 2r+1 slices.
+
+    nearest() snaps whole arrays at once: queries are grouped by cell and
+    each group is scored against its block with one numpy broadcast; the
+    block grows until the best distance is no larger than the distance to
+    any cell left outside it. snap_named() memoizes named points.
+    """
+
+    def __init__(self, node_ids, order, px, py, cell_start, origin, cell_size, shape,
+                 x_scale=1.0, geographic=True):
+        self.node_ids = node_ids
+        self.order = order                # sorted position -> index into node_ids
+        self.px = px                      # scaled x, sorted by cell
+        self.py = py
+        self.cell_start = cell_start      # cell id -> first sorted position
+        self.x0, self.y0 = origin
+        self.cell_size = cell_size
+        self.nx, self.ny = shape
+        self.x_scale = x_scale
+        self.geographic = geographic
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+        self.memo_hits = 0
+
+    @classmethod
+    def from_graph(cls, graph, cell_size=None):
+        import osmnx as ox
+        node_ids = list(graph.nodes)
+        nodes = graph.nodes
+        crs = getattr(graph, 'graph', {}).get('crs')
+        geographic = crs is None or not ox.projection.is_projected(crs)
+        return build_spatial_index(node_ids,
+                                   [nodes[n]['x'] for n in node_ids],
+                                   [nodes[n]['y'] for n in node_ids],
+                                   geographic, cell_size)
+
+    def _cell_x(self, px):
+        return np.clip(((px - self.x0) / self.cell_size).astype(np.int64), 0, self.nx - 1)
+
+    def _cell_y(self, py):
+        return np.clip(((py - self.y0) / self.cell_size).astype(np.int64), 0, self.ny - 1)
+
+    def _block(self, cx, cy, r):
+        """Sorted positions of the nodes in cells [cx-r, cx+r] x [cy-r, cy+r]."""
+        lo_y, hi_y = max(cy - r, 0), min(cy + r, self.ny - 1)
+        starts = self.cell_start
+        parts = [np.arange(starts[col * self.ny + lo_y], starts[col * self.ny + hi_y + 1])
+                 for col in range(max(cx - r, 0), min(cx + r, self.nx - 1) + 1)]
+        return np.concatenate(parts)
+
+    def _clearance(self, qx, qy, cx, cy, r):
+        """Distance from each query to the nearest grid cell outside the block."""
+        c = self.cell_size
+        clear = np.full(len(qx), math.inf)
+        if cx - r > 0:
+            clear = np.minimum(clear, qx - (self.x0 + (cx - r) * c))
+        if cx + r < self.nx - 1:
+            clear = np.minimum(clear, self.x0 + (cx + r + 1) * c - qx)
+        if cy - r > 0:
+            clear = np.minimum(clear, qy - (self.y0 + (cy - r) * c))
+        if cy + r < self.ny - 1:
+            clear = np.minimum(clear, self.y0 + (cy + r + 1) * c - qy)
+        return clear
+
+    def nearest_index(self, xs, ys):
+        """Index into node_ids of the nearest node for every (x, y) query."""
+        qx = np.atleast_1d(np.asarray(xs, dtype=np.float64)) * self.x_scale
+        qy = np.atleast_1d(np.asarray(ys, dtype=np.float64))
+        result = np.empty(len(qx), dtype=np.int64)
+        if not len(qx):
+            return result
+        cells = self._cell_x(qx) * self.ny + self._cell_y(qy)
+        unique, inverse = np.unique(cells, return_inverse=True)
+        group_order = np.argsort(inverse, kind='stable')
+        bounds = np.searchsorted(inverse[group_order], np.arange(len(unique) + 1))
+
+        for g, cell in enumerate(unique.tolist()):
+            members = group_order[bounds[g]:bounds[g + 1]]
+            cx, cy = divmod(cell, self.ny)
+            gx, gy = qx[members], qy[members]
+            r = 0
+            while True:
+                block = self._block(cx, cy, r)
+                if len(block):
+                    d2 = (self.px[block][None, :] - gx[:, None]) ** 2 \
+                        + (self.py[block][None, :] - gy[:, None]) ** 2
+                    best = np.argmin(d2, axis=1)
+                    best_d2 = d2[np.arange(len(members)), best]
+                    clear = self._clearance(gx, gy, cx, cy, r)
+                    if np.all(best_d2 <= clear ** 2):
+                        result[members] = self.order[block[best]]
+                        break
+                r += 1
+        return result
+
+    def nearest(self, xs, ys):
+        """Nearest node ids for arrays of x (lon) and y (lat), as a list."""
+        node_ids = self.node_ids
+        return [node_ids[i] for i in self.nearest_index(xs, ys).tolist()]
+
+    def nearest_one(self, x, y):
+        return self.nearest([x], [y])[0]
+
+    def snap_named(self, points):
+        """
+        Node ids for [(name, (lat, lon)), ...] as in load_point_pairs.
+        Points seen before are answered from the memo; the rest are snapped
+        in one nearest() call.
+        """
+        keys = [(name, tuple(coord)) for name, coord in points]
+        with self._memo_lock:
+            missing = list(dict.fromkeys(k for k in keys if k not in self._memo))
+            self.memo_hits += len(keys) - len(missing)
+        if missing:
+            nodes = self.nearest([k[1][1] for k in missing], [k[1][0] for k in missing])
+            with self._memo_lock:
+                self._memo.update(zip(missing, nodes))
+        return [self._memo[k] for k in keys]
+
+    def snap_pairs(self, point_pairs):
+        """[(u, v), ...] node ids for load_point_pairs output, in one batch."""
+        ends = self.snap_named([p for pair in point_pairs for p in pair])
+        return list(zip(ends[0::2], ends[1::2]))
+
+    def to_dict(self):
+        return {
+            'node_ids': self.node_ids,
+            'order': self.order,
+            'px': self.px,
+            'py': self.py,
+            'cell_start': self.cell_start,
+            'origin': (self.x0, self.y0),
+            'cell_size': self.cell_size,
+            'shape': (self.nx, self.ny),
+            'x_scale': self.x_scale,
+            'geographic': self.geographic,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['node_ids'], data['order'], data['px'], data['py'], data['cell_start'],
+                   data['origin'], data['cell_size'], data['shape'], data['x_scale'], data['geographic'])
+
+
+def build_spatial_index(node_ids, xs, ys, geographic=True, cell_size=None):
+    """
+    Grid over (x, y) node coordinates; the default cell size gives about
+    NODES_PER_CELL nodes per cell for an even spread.
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    if not len(xs):
+        raise ValueError("cannot index an empty graph")
+    x_scale = math.cos(math.radians(float(ys.mean()))) if geographic else 1.0
+    px = xs * x_scale
+
+    x0, y0 = float(px.min()), float(ys.min())
+    width = max(float(px.max()) - x0, 1e-12)
+    height = max(float(ys.max()) - y0, 1e-12)
+    if cell_size is None:
+        cell_size = math.sqrt(width * height * NODES_PER_CELL / len(xs))
+        # degenerate (line-like) extents would otherwise need a huge grid
+        cell_size = max(cell_size, max(width, height) / (4 * math.sqrt(len(xs))))
+    cell_size = max(cell_size, 1e-12)
+    nx = int(width / cell_size) + 1
+    ny = int(height / cell_size) + 1
+
+    cx = np.clip(((px - x0) / cell_size).astype(np.int64), 0, nx - 1)
+    cy = np.clip(((ys - y0) / cell_size).astype(np.int64), 0, ny - 1)
+    cells = cx * ny + cy
+    order = np.argsort(cells, kind='stable')
+    cell_start = np.searchsorted(cells[order], np.arange(nx * ny + 1))
+    return SpatialIndex(list(node_ids), order, px[order], ys[order], cell_start,
+                        (x0, y0), cell_size, (nx, ny), x_scale, geographic)
+
+
+def load_spatial_index(city_name, graph):
+    """
+    Snapping index for a city, read from setup/maps/<city>.snap.pkl when it
+    was built for the current map pickle, built and stored there otherwise.
+    """
+    data = load_map_artifact(city_name, ARTIFACT_KIND)
+    if data is not None:
+        return SpatialIndex.from_dict(data)
+    index = SpatialIndex.from_graph(graph)
+    save_map_artifact(city_name, ARTIFACT_KIND, index.to_dict())
+    return index
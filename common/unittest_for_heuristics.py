@@ -0,0 +1,67 @@
+import math
+import unittest
+
+from common.common import dynamic_heuristic
+from common.heuristics import GoalCache, HeuristicTable
+from part1.algorithms import astar_solver
+from part3.algorithms import astar_parallel
+from common.graph_fixtures import random_grid
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+        self.nodes = {u: {'x': u[0] * 0.001, 'y': u[1] * 0.001} for u in edges}
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+def euclidean_h(u, v, g):
+    x1, y1 = g.nodes[u]['x'], g.nodes[u]['y']
+    x2, y2 = g.nodes[v]['x'], g.nodes[v]['y']
+    return math.hypot(x2 - x1, y2 - y1)
+
+class TestHeuristicTable(unittest.TestCase):
+    def setUp(self):
+        self.graph = SimpleGraph(random_grid(8, 1, costs=(100, 150, 200)))
+        self.table = HeuristicTable(self.graph, cache_size=4)
+
+    def test_0001_same_values_as_per_call_heuristics(self):
+        goal = (7, 3)
+        for u in self.graph.nodes:
+            self.assertAlmostEqual(self.table.euclidean(u, goal), euclidean_h(u, goal, self.graph))
+            for t in (0.0, 3.7, 25):
+                self.assertAlmostEqual(self.table.dynamic(u, goal, self.graph, t),
+                                       dynamic_heuristic(u, goal, self.graph, t))
+
+    def test_0002_lru_eviction(self):
+        """Only cache_size goal rows are kept; the oldest is evicted first."""
+        rows = self.table._distance
+        for goal in [(0, 0), (1, 1), (2, 2), (3, 3), (4, 4)]:
+            self.table.euclidean((5, 5), goal)
+        self.assertEqual(rows.misses, 5)
+        self.assertEqual(rows.evictions, 1)
+        self.table.euclidean((5, 5), (1, 1))
+        self.assertEqual(rows.hits, 1)
+        self.table.euclidean((5, 5), (0, 0))
+        self.assertEqual(rows.misses, 6)
+
+    def test_0003_solvers_unchanged(self):
+        expected = astar_solver((0, 0), (7, 7), self.graph, euclidean_h)
+        self.assertEqual(astar_solver((0, 0), (7, 7), self.graph, self.table.euclidean), expected)
+        path, fvec = astar_parallel((0, 0), (7, 7), self.graph, self.table.dynamic, None, "FineGrain", 1)
+        self.assertEqual(fvec[0], expected[1][0])
+
+    def test_0004_goal_cache_compute_once(self):
+        calls = []
+        cache = GoalCache(lambda key: calls.append(key) or [key], maxsize=2)
+        self.assertEqual(cache.get(3), [3])
+        self.assertEqual(cache.get(3), [3])
+        self.assertEqual(calls, [3])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
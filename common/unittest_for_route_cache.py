@@ -0,0 +1,158 @@
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from common import common
+from common.common import f_vector_basic
+from common.route_cache import RouteCache, _local_names
+from part1.algorithms import astar_solver
+from part3.algorithms import astar_parallel
+from common.graph_fixtures import random_grid
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+        self.nodes = {u: {'x': u[0], 'y': u[1]} for u in edges}
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+def manhattan_h(u, v, graph):
+    ux, uy = u; vx, vy = v
+    return abs(ux - vx) + abs(uy - vy)
+
+def zero_h(u, v, graph):
+    return 0.0
+
+class ScaledH:
+    def __init__(self, scale):
+        self.scale = scale
+
+    def h(self, u, v, graph):
+        return self.scale * manhattan_h(u, v, graph)
+
+    __call__ = h
+
+
+class TestRouteCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._patches = [mock.patch.object(common, 'MAPS_DIR', self._tmp.name),
+                         mock.patch.object(common, 'POINTS_DIR', self._tmp.name)]
+        for p in self._patches:
+            p.start()
+        self.write_map("map v1")
+        self.graph = SimpleGraph(random_grid(8, 0, costs=(1, 1, 2, 3), keep=1))
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+        self._tmp.cleanup()
+
+    def write_map(self, content):
+        with open(common.map_pickle_path("Test City"), 'wb') as f:
+            pickle.dump(content, f)
+
+    def test_0001_hits_and_misses(self):
+        cache = RouteCache("Test City")
+        search = mock.Mock(wraps=astar_solver, __module__='part1.algorithms', __qualname__='astar_solver')
+        solver = cache.wrap(search)
+        first = solver((0, 0), (7, 7), self.graph, manhattan_h)
+        second = solver((0, 0), (7, 7), self.graph, manhattan_h)
+        self.assertEqual(search.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(first, astar_solver((0, 0), (7, 7), self.graph, manhattan_h))
+        # another heuristic or another target is another key
+        solver((0, 0), (7, 7), self.graph, zero_h)
+        solver((0, 0), (6, 7), self.graph, manhattan_h)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 3)
+
+    def test_0002_lru_eviction(self):
+        cache = RouteCache("Test City", maxsize=2)
+        solver = cache.wrap(astar_solver)
+        solver((0, 0), (1, 1), self.graph, manhattan_h)
+        solver((0, 0), (2, 2), self.graph, manhattan_h)
+        solver((0, 0), (1, 1), self.graph, manhattan_h)    # refreshes (1, 1)
+        solver((0, 0), (3, 3), self.graph, manhattan_h)    # evicts (2, 2)
+        solver((0, 0), (1, 1), self.graph, manhattan_h)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (2, 3, 1))
+        self.assertEqual(len(cache), 2)
+
+    def test_0003_map_change_invalidates(self):
+        cache = RouteCache("Test City")
+        solver = cache.wrap(astar_solver)
+        solver((0, 0), (7, 7), self.graph, manhattan_h)
+        self.write_map("map v2 with more bytes")
+        solver((0, 0), (7, 7), self.graph, manhattan_h)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['invalidations']), (0, 2, 1))
+
+    def test_0004_disk_tier(self):
+        cache = RouteCache("Test City", maxsize=1, disk=True)
+        solver = cache.wrap(astar_solver)
+        expected = solver((0, 0), (7, 7), self.graph, manhattan_h)
+        solver((0, 0), (5, 5), self.graph, manhattan_h)    # (7, 7) moves to the disk tier
+        self.assertEqual(solver((0, 0), (7, 7), self.graph, manhattan_h), expected)
+        self.assertEqual(cache.stats()['disk_hits'], 1)
+        cache.flush()
+
+        reopened = RouteCache("Test City", disk=True)
+        self.assertEqual(reopened.wrap(astar_solver)((0, 0), (7, 7), self.graph, manhattan_h), expected)
+        self.assertEqual(reopened.stats()['disk_hits'], 1)
+
+        self.write_map("map v2 with more bytes")
+        stale = RouteCache("Test City", disk=True)
+        stale.wrap(astar_solver)((0, 0), (7, 7), self.graph, manhattan_h)
+        self.assertEqual(stale.stats()['misses'], 1)
+
+    def test_0005_parallel_options_in_key(self):
+        cache = RouteCache("Test City")
+        solver = cache.wrap(astar_parallel)
+        first = solver((0, 0), (7, 7), self.graph, manhattan_h, f_vector_basic, num_threads=1)
+        again = solver((0, 0), (7, 7), self.graph, manhattan_h, f_vector_basic, num_threads=1)
+        solver((0, 0), (7, 7), self.graph, manhattan_h, f_vector_basic, version="Optimictis", num_threads=1)
+        self.assertEqual(first, again)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_0006_heuristic_instances_and_lambdas_differ(self):
+        """Bound methods of two instances, two callable instances and two lambdas get separate keys."""
+        cache = RouteCache("Test City", disk=True)
+        search = mock.Mock(wraps=astar_solver, __module__='part1.algorithms', __qualname__='astar_solver')
+        solver = cache.wrap(search)
+        exact, inflated = ScaledH(1.0), ScaledH(50.0)
+        for first, second in [(exact.h, inflated.h), (exact, inflated),
+                              (lambda u, v, g: 0.0, lambda u, v, g: manhattan_h(u, v, g))]:
+            solver((0, 0), (7, 7), self.graph, first)
+            solver((0, 0), (7, 7), self.graph, second)
+            solver((0, 0), (7, 7), self.graph, first)
+        self.assertEqual((cache.hits, cache.misses, search.call_count), (3, 6, 6))
+        # id()-based keys are not written to disk, named ones are
+        named = cache.wrap(astar_solver, heuristic="ScaledH(1).h")
+        named((0, 0), (7, 7), self.graph, exact.h)
+        cache.flush()
+        reopened = RouteCache("Test City", disk=True)
+        reopened.wrap(astar_solver, heuristic="ScaledH(1).h")((0, 0), (7, 7), self.graph, exact.h)
+        self.assertEqual((reopened.disk_hits, len(reopened._disk_tier())), (1, 0))
+
+    def test_0007_fresh_lambdas_do_not_grow_pins(self):
+        """A new lambda per query is pinned only while an entry refers to it."""
+        cache = RouteCache("Test City", maxsize=8)
+        solver = cache.wrap(astar_solver)
+        for _ in range(300):
+            solver((0, 0), (1, 1), self.graph, lambda u, v, g: 0.0)
+            self.assertLessEqual(len(cache._pinned), 64)
+        self.assertEqual((cache.misses, len(cache)), (300, 8))
+        live = {name for key in cache._entries for name in _local_names(key)}
+        self.assertEqual(len(live), 8)
+        self.assertLessEqual(live, set(cache._pinned))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,80 @@
+import os
+import pickle
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import networkx as nx
+
+from common import common
+from common.snapping import SpatialIndex, build_spatial_index, load_spatial_index
+
+def random_city(n, seed):
+    """MultiDiGraph with n nodes scattered around Ho Chi Minh City (lon, lat)."""
+    rnd = random.Random(seed)
+    graph = nx.MultiDiGraph(crs='epsg:4326')
+    for i in range(n):
+        graph.add_node(1000 + i, x=106.6 + rnd.random() * 0.2, y=10.7 + rnd.random() * 0.15)
+    return graph
+
+def brute_force(graph, x, y, x_scale):
+    return min(graph.nodes, key=lambda n: ((graph.nodes[n]['x'] - x) * x_scale) ** 2
+               + (graph.nodes[n]['y'] - y) ** 2)
+
+
+class TestSnapping(unittest.TestCase):
+    def test_0001_batch_matches_brute_force(self):
+        graph = random_city(800, 1)
+        index = SpatialIndex.from_graph(graph)
+        rnd = random.Random(2)
+        # inside the map, clustered in one cell, and outside the bounding box
+        xs = [106.6 + rnd.random() * 0.2 for _ in range(300)] + [106.7001] * 5 + [106.4, 107.0, 106.7]
+        ys = [10.7 + rnd.random() * 0.15 for _ in range(300)] + [10.77] * 5 + [10.5, 10.9, 11.2]
+        snapped = index.nearest(xs, ys)
+        for x, y, node in zip(xs, ys, snapped):
+            self.assertEqual(node, brute_force(graph, x, y, index.x_scale))
+        self.assertEqual(index.nearest_one(xs[0], ys[0]), snapped[0])
+
+    def test_0002_cell_size_does_not_change_answers(self):
+        graph = random_city(300, 3)
+        coarse = SpatialIndex.from_graph(graph, cell_size=0.05)
+        fine = SpatialIndex.from_graph(graph, cell_size=0.001)
+        xs = np.linspace(106.55, 106.85, 97)
+        ys = np.linspace(10.65, 10.9, 97)
+        self.assertEqual(coarse.nearest(xs, ys), fine.nearest(xs, ys))
+
+    def test_0003_named_points_are_memoized(self):
+        index = SpatialIndex.from_graph(random_city(200, 4))
+        pairs = [(("A", (10.75, 106.65)), ("B", (10.8, 106.7))),
+                 (("B", (10.8, 106.7)), ("A", (10.75, 106.65)))]
+        with mock.patch.object(index, 'nearest', wraps=index.nearest) as nearest:
+            first = index.snap_pairs(pairs)
+            second = index.snap_pairs(pairs)
+        self.assertEqual(nearest.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(first[0], first[1][::-1])
+        self.assertEqual(index.memo_hits, 6)
+
+    def test_0004_persisted_with_map(self):
+        graph = random_city(150, 5)
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(common, 'MAPS_DIR', tmp), \
+                mock.patch.object(common, 'POINTS_DIR', tmp):
+            with open(common.map_pickle_path("Test City"), 'wb') as f:
+                pickle.dump("map", f)
+            built = load_spatial_index("Test City", graph)
+            self.assertTrue(os.path.isfile(common.map_artifact_path("Test City", "snap")))
+            with mock.patch('common.snapping.build_spatial_index') as build:
+                loaded = load_spatial_index("Test City", graph)
+                build.assert_not_called()
+            self.assertEqual(loaded.nearest([106.7], [10.8]), built.nearest([106.7], [10.8]))
+
+    def test_0005_degenerate_extent(self):
+        index = build_spatial_index(['a', 'b', 'c'], [0.0, 1.0, 2.0], [0.0, 0.0, 0.0], geographic=False)
+        self.assertEqual(index.nearest([0.4, 1.6, 5.0], [3.0, -1.0, 0.0]), ['a', 'c', 'c'])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -1,5 +1,11 @@
 import heapq
 import math
+import time
+from array import array
+
+from part1.graph_csr import csr_euclidean_h
+from part1.search_state import SearchTree, NO_PARENT
+from part1.open_list import make_open_list
 
 # Adjustable weights
 WEIGHT_COST = 0.6
@@ -14,29 +20,45 @@ def get_edge_cost(graph, u, v):
     except Exception:
         return 1.0
 
-def astar_solver(start_node, goal, graph, h_func, f_vector_func=None):
+def astar_solver(start_node, goal, graph, h_func, f_vector_func=None, early_exit=True, stats=None,
+                 open_list='heap', arc_flags=None):
     """
     A* search with weighted scalar f = WEIGHT_COST * cost + WEIGHT_HOP * hop
+    With early_exit the search stops once the smallest open key cannot beat
+    the best goal found (exact for admissible h_func); early_exit=False
+    drains the whole open list. If a dict is passed as stats it receives
+    'expansions' and 'open_left' (entries still queued when early_exit stopped
+    the search, counting the one just popped; 0 after a full drain) plus
+    the open-list counters (pushes, pops, decrease_keys, max_size).
+    open_list picks the queue: 'heap', 'indexed', 'dary' or 'radix'
+    (see part1.open_list). With arc_flags (part1.arc_flags.ArcFlags) edges
+    that cannot lead into the goal's cell are skipped.
     Returns: (path, [cost, hop]) or (None, None)
     """
     visited = {}  # node -> (g_cost, hopper)
-    open_heap = []  # (f_weighted, node, g, hop, prev_dir, path)
+    tree = SearchTree()
+    open_heap = make_open_list(open_list)  # f_weighted, node, (g, hop, parent_record)
 
-    h0 = h_func(start_node, goal, graph)
-    heapq.heappush(open_heap, (WEIGHT_COST * 0.0 + WEIGHT_HOP * 0, start_node, 0.0, 0, [start_node]))
+    open_heap.push(WEIGHT_COST * 0.0 + WEIGHT_HOP * 0, start_node, (0.0, 0, NO_PARENT))
 
     best_goal = None
-    best_goal_score = (float('inf'), float('inf'))
+    f_best = float('inf')
+    expansions = 0
+    open_left = 0
 
     while open_heap:
-        f_weighted, node, g_score_current_node, hop, path = heapq.heappop(open_heap)
+        f_weighted, node, (g_score_current_node, hop, parent) = open_heap.pop()
+
+        if early_exit and f_weighted >= f_best:
+            # keys never overestimate the goal score, so nothing left can improve it
+            open_left = len(open_heap) + 1
+            break
 
         if node == goal:
             f_current = WEIGHT_COST * g_score_current_node + WEIGHT_HOP * hop
-            f_best = WEIGHT_COST * best_goal_score[0] + WEIGHT_HOP * best_goal_score[1]
             if f_current < f_best:
-                best_goal = (path, [g_score_current_node, hop])
-                best_goal_score = (g_score_current_node, hop)
+                best_goal = (tree.path(parent, goal), [g_score_current_node, hop])
+                f_best = f_current
             continue
 
         if node in visited:
@@ -46,8 +68,12 @@ def astar_solver(start_node, goal, graph, h_func, f_vector_func=None):
             if g_score_current_node == old_g and hop >= old_hop:
                 continue
         visited[node] = (g_score_current_node, hop)
+        record = tree.add(node, parent)
+        expansions += 1
 
         for neighbor_node in graph.neighbors(node):
+            if arc_flags is not None and not arc_flags.allows(node, neighbor_node, goal):
+                continue
             edge_cost = get_edge_cost(graph, node, neighbor_node)
             g_score_of_neighbor = g_score_current_node + edge_cost
 
@@ -58,6 +84,603 @@ def astar_solver(start_node, goal, graph, h_func, f_vector_func=None):
 
             f_weighted = WEIGHT_COST * f_cost + WEIGHT_HOP * new_hop
 
-            heapq.heappush(open_heap, (f_weighted, neighbor_node, g_score_of_neighbor, new_hop, path + [neighbor_node]))
+            open_heap.push(f_weighted, neighbor_node, (g_score_of_neighbor, new_hop, record))
+
+    if stats is not None:
+        stats['expansions'] = expansions
+        stats['open_left'] = open_left
+        stats.update(open_heap.stats())
+    return best_goal if best_goal else (None, None)
+
+def astar_csr(start_node, goal, csr, h_func=None, early_exit=True, stats=None, open_list='heap',
+              arc_flags=None):
+    """
+    astar_solver running directly on a CSRGraph (see part1.graph_csr).
+    start_node/goal are original (OSM) node ids; h_func takes dense ids:
+    h_func(u_idx, goal_idx, csr), defaulting to csr_euclidean_h.
+    early_exit, stats, open_list and arc_flags behave as in astar_solver.
+    Returns: (path of OSM ids, [cost, hop]) or (None, None)
+    """
+    if h_func is None:
+        h_func = csr_euclidean_h
+    if start_node not in csr.index or goal not in csr.index:
+        return None, None
+    start = csr.index[start_node]
+    target = csr.index[goal]
+
+    offsets, targets, lengths = csr.offsets, csr.targets, csr.lengths
+    allowed = arc_flags.dense_mask(target) if arc_flags is not None else None
+    best_g = {}  # dense id -> (g_cost, hopper)
+    tree = SearchTree()
+    open_heap = make_open_list(open_list)
+    open_heap.push(0.0, start, (0.0, 0, NO_PARENT))
+
+    best_goal = None
+    f_best = float('inf')
+    expansions = 0
+    open_left = 0
+
+    while open_heap:
+        f_weighted, node, (g_score_current_node, hop, parent) = open_heap.pop()
+
+        if early_exit and f_weighted >= f_best:
+            # keys never overestimate the goal score, so nothing left can improve it
+            open_left = len(open_heap) + 1
+            break
+
+        if node == target:
+            f_current = WEIGHT_COST * g_score_current_node + WEIGHT_HOP * hop
+            if f_current < f_best:
+                best_goal = (tree.path(parent, target), [g_score_current_node, hop])
+                f_best = f_current
+            continue
+
+        seen = best_g.get(node)
+        if seen is not None:
+            old_g, old_hop = seen
+            if g_score_current_node > old_g:
+                continue
+            if g_score_current_node == old_g and hop >= old_hop:
+                continue
+        best_g[node] = (g_score_current_node, hop)
+        record = tree.add(node, parent)
+        expansions += 1
+
+        new_hop = hop + 1
+        for e in range(offsets[node], offsets[node + 1]):
+            if allowed is not None and not allowed[e]:
+                continue
+            neighbor_node = targets[e]
+            g_score_of_neighbor = g_score_current_node + lengths[e]
+            f_cost = g_score_of_neighbor + h_func(neighbor_node, target, csr)
+            f_weighted = WEIGHT_COST * f_cost + WEIGHT_HOP * new_hop
+            open_heap.push(f_weighted, neighbor_node, (g_score_of_neighbor, new_hop, record))
+
+    if stats is not None:
+        stats['expansions'] = expansions
+        stats['open_left'] = open_left
+        stats.update(open_heap.stats())
+    if best_goal is None:
+        return None, None
+    path, fvec = best_goal
+    return csr.to_osm(path), fvec
+
+def astar_bidirectional(start_node, goal, graph, h_func, reverse_graph=None, stats=None):
+    """
+    Bidirectional A* on the weighted objective WEIGHT_COST * cost + WEIGHT_HOP * hop.
+    A forward search grows from start_node on graph and a backward search grows
+    from goal on reverse_graph (default: graph.reverse(copy=False)). Both use the
+    average potential p(v) = WEIGHT_COST * (h(v, goal) - h(start, v)) / 2, so the
+    searches stop as soon as top_forward + top_backward >= best meeting score.
+    h_func must be consistent (e.g. Euclidean on node coordinates).
+    Returns: (path, [cost, hop]) or (None, None)
+    """
+    if reverse_graph is None:
+        reverse_graph = graph.reverse(copy=False)
+
+    potentials = {}
+
+    def potential(node):
+        p = potentials.get(node)
+        if p is None:
+            p = WEIGHT_COST * (h_func(node, goal, graph) - h_func(start_node, node, graph)) / 2
+            potentials[node] = p
+        return p
+
+    # per direction: score (weighted), cost, hop, parent, settled, heap
+    score = ({start_node: 0.0}, {goal: 0.0})
+    cost = ({start_node: 0.0}, {goal: 0.0})
+    hops = ({start_node: 0}, {goal: 0})
+    parent = ({start_node: None}, {goal: None})
+    settled = (set(), set())
+    heaps = ([(potential(start_node), start_node)], [(-potential(goal), goal)])
+    graphs = (graph, reverse_graph)
+    signs = (1, -1)
+
+    best = 0.0 if start_node == goal else float('inf')
+    meet = start_node if start_node == goal else None
+    expansions = 0
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        other = 1 - side
+        _, node = heapq.heappop(heaps[side])
+        if node in settled[side]:
+            continue
+        settled[side].add(node)
+        expansions += 1
+
+        g = graphs[side]
+        node_score = score[side][node]
+        for nbr in g.neighbors(node):
+            edge_cost = get_edge_cost(g, node, nbr)
+            nbr_score = node_score + WEIGHT_COST * edge_cost + WEIGHT_HOP
+            if nbr_score >= score[side].get(nbr, float('inf')):
+                continue
+            score[side][nbr] = nbr_score
+            cost[side][nbr] = cost[side][node] + edge_cost
+            hops[side][nbr] = hops[side][node] + 1
+            parent[side][nbr] = node
+            heapq.heappush(heaps[side], (nbr_score + signs[side] * potential(nbr), nbr))
+
+            if nbr in score[other] and nbr_score + score[other][nbr] < best:
+                best = nbr_score + score[other][nbr]
+                meet = nbr
+
+    if stats is not None:
+        stats['expansions'] = expansions
+
+    if meet is None:
+        return None, None
+
+    path = []
+    node = meet
+    while node is not None:
+        path.append(node)
+        node = parent[0][node]
+    path.reverse()
+    node = parent[1][meet]
+    while node is not None:
+        path.append(node)
+        node = parent[1][node]
+    return path, [cost[0][meet] + cost[1][meet], hops[0][meet] + hops[1][meet]]
+
+def astar_anytime(start_node, goal, graph, h_func, epsilon=3.0, epsilon_step=0.5, time_limit=None,
+                  stats=None):
+    """
+    Anytime Repairing A* (ARA*) on WEIGHT_COST * cost + WEIGHT_HOP * hop.
+    The first search uses f = g + epsilon * WEIGHT_COST * h and always runs
+    to a solution; epsilon then drops by epsilon_step per iteration down to 1,
+    each iteration reusing the g-values of the previous ones and reopening
+    only the nodes that improved after being closed. Improvement stops when
+    time_limit seconds have passed or epsilon = 1 has finished (optimal for
+    a consistent h_func).
+    If a dict is passed as stats it receives 'expansions', 'iterations',
+    'epsilon' (of the last completed iteration; an iteration cut short by
+    the deadline does not count), 'bound' (the returned route costs at
+    most bound times the optimum) and 'solutions' [(elapsed_s, bound, cost,
+    hop)].
+    Returns: (path, [cost, hop]) or (None, None)
+    """
+    t0 = time.perf_counter()
+    t_end = t0 + time_limit if time_limit is not None else None
+
+    h_cache = {}
+
+    def h(node):
+        value = h_cache.get(node)
+        if value is None:
+            value = WEIGHT_COST * h_func(node, goal, graph)
+            h_cache[node] = value
+        return value
+
+    g = {start_node: 0.0}
+    parent = {start_node: None}
+    open_nodes = {start_node}
+    closed = set()
+    incons = set()
+    eps = epsilon
+    heap = [(eps * h(start_node), start_node)]
+    expansions = 0
+    iterations = 0
+    completed_eps = None
+    bound = math.inf
+    best = None
+    goal_g = math.inf
+    solutions = []
+
+    def improve_path(check_deadline):
+        nonlocal expansions
+        while heap:
+            f, node = heap[0]
+            if node not in open_nodes or f != g[node] + eps * h(node):
+                heapq.heappop(heap)
+                continue
+            if g.get(goal, math.inf) <= f:
+                return True
+            if check_deadline and expansions % 64 == 0 and time.perf_counter() >= t_end:
+                return False
+            heapq.heappop(heap)
+            open_nodes.discard(node)
+            closed.add(node)
+            expansions += 1
+            for neighbor_node in graph.neighbors(node):
+                edge_cost = get_edge_cost(graph, node, neighbor_node)
+                new_g = g[node] + WEIGHT_COST * edge_cost + WEIGHT_HOP
+                if new_g < g.get(neighbor_node, math.inf):
+                    g[neighbor_node] = new_g
+                    parent[neighbor_node] = node
+                    if neighbor_node in closed:
+                        incons.add(neighbor_node)
+                    else:
+                        open_nodes.add(neighbor_node)
+                        heapq.heappush(heap, (new_g + eps * h(neighbor_node), neighbor_node))
+        return True
+
+    while True:
+        finished = improve_path(t_end is not None and best is not None)
+        if goal not in g:
+            break
+        if finished:
+            iterations += 1
+            completed_eps = eps
+            lower = min((g[n] + h(n) for n in open_nodes | incons), default=math.inf)
+            bound = max(1.0, min(eps, g[goal] / lower)) if lower > 0 else eps
+        if g[goal] < goal_g:
+            goal_g = g[goal]
+            path = [goal]
+            while parent[path[-1]] is not None:
+                path.append(parent[path[-1]])
+            path.reverse()
+            # ancestors may have improved after goal's g was set, so the
+            # objective is read off the route that is actually returned
+            path_cost = sum(get_edge_cost(graph, u, v) for u, v in zip(path, path[1:]))
+            path_score = WEIGHT_COST * path_cost + WEIGHT_HOP * (len(path) - 1)
+            if best is None or path_score < best[2]:
+                best = (path, [path_cost, len(path) - 1], path_score)
+                solutions.append((time.perf_counter() - t0, bound, path_cost, len(path) - 1))
+        if finished and solutions and bound < solutions[-1][1]:
+            solutions.append((time.perf_counter() - t0, bound, best[1][0], best[1][1]))
+        if not finished or eps <= 1.0 or bound <= 1.0:
+            break
+        if t_end is not None and time.perf_counter() >= t_end:
+            break
+        eps = max(1.0, eps - epsilon_step)
+        open_nodes |= incons
+        incons.clear()
+        closed.clear()
+        heap = [(g[n] + eps * h(n), n) for n in open_nodes]
+        heapq.heapify(heap)
+
+    if stats is not None:
+        stats['expansions'] = expansions
+        stats['iterations'] = iterations
+        stats['epsilon'] = completed_eps
+        stats['bound'] = bound
+        stats['solutions'] = solutions
+    if best is None:
+        return None, None
+    return best[0], best[1]
+
+class _BoundedNode:
+    """One stored node of astar_bounded's search tree (a path prefix, not a graph node)."""
+    __slots__ = ('state', 'score', 'cost', 'hop', 'parent', 'index', 'f', 'succ', 'next_i', 'status',
+                 'children', 'open_key', 'alive')
+
+    def __init__(self, state, score, cost, hop, parent, index, f):
+        self.state = state
+        self.score = score      # WEIGHT_COST * cost + WEIGHT_HOP * hop so far
+        self.cost = cost
+        self.hop = hop
+        self.parent = parent
+        self.index = index      # position among the parent's successors
+        self.f = f              # lower bound on any route through this node, never decreases
+        self.succ = None        # [(neighbor, edge_cost)], listed on first expansion
+        self.next_i = 0         # successors before next_i have been generated
+        self.status = []        # per generated successor: stored child, or f it had when forgotten
+        self.children = 0       # stored children
+        self.open_key = None
+        self.alive = True
+
+def astar_bounded(start_node, goal, graph, h_func, max_nodes=100_000, stats=None, trace_memory=False,
+                  max_expansions=None):
+    """
+    Memory-bounded A* (SMA*) on WEIGHT_COST * cost + WEIGHT_HOP * hop.
+    At most max_nodes search nodes are stored. The best open node (lowest
+    f, deepest on ties) generates one successor per step: the next one not
+    yet generated, or else its forgotten successor with the lowest
+    remembered f. When the budget is full the shallowest of the worst leaves
+    is forgotten and its parent remembers its f, so f-values only grow
+    (f = max(parent f, remembered f, g + h)). Once all successors of a node
+    are generated its f is backed up to the best of them, up the tree. A
+    non-goal node at depth max_nodes - 1 cannot be extended within the
+    budget and counts as a dead end. A new node whose graph node is
+    already stored with no larger score and depth is pruned (this also
+    cuts cycles), and stored leaves the new node dominates are dropped. So any budget larger than the hop count of an optimal
+    route finds it (for a consistent h_func). Far below the memory plain A*
+    needs the number of regenerations grows quickly; max_expansions, if
+    given, caps the work and the search then gives up with (None, None)
+    and stats['truncated'] set.
+    If a dict is passed as stats it receives 'expansions' (successors
+    generated), 'forgotten', 'regenerations', 'peak_nodes', 'truncated'
+    and, with trace_memory (tracemalloc, process-wide, so single query
+    only), 'peak_bytes'.
+    Returns: (path, [cost, hop]) or (None, None)
+    """
+    if trace_memory:
+        import tracemalloc
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base_bytes = tracemalloc.get_traced_memory()[0]
+    if max_expansions is None:
+        max_expansions = math.inf
+
+    seq = 0
+    open_heap = []   # (key, -hop, seq, node): lowest key, deepest first
+    leaf_heap = []   # (-f, hop, seq, node): worst f, shallowest first
+    stored = {}      # graph node -> stored search nodes for it
+    size = 0
+    expansions = 0
+    forgotten = 0
+    regenerations = 0
+    peak_nodes = 1
+    truncated = False
+    result = (None, None)
+
+    def open_key(node):
+        # a node is open while it has successors that are not stored
+        if node.succ is None or node.next_i < len(node.succ) or node.state == goal:
+            return node.f
+        remembered = min((v for v in node.status if v.__class__ is float), default=math.inf)
+        return max(node.f, remembered) if remembered < math.inf else None
+
+    def push_open(node):
+        nonlocal seq
+        key = open_key(node)
+        node.open_key = key
+        if key is not None:
+            seq += 1
+            heapq.heappush(open_heap, (key, -node.hop, seq, node))
+
+    def push_leaf(node):
+        nonlocal seq
+        if node.parent is not None:
+            seq += 1
+            heapq.heappush(leaf_heap, (-node.f, node.hop, seq, node))
+
+    def value(node, i):
+        v = node.status[i]
+        return v if v.__class__ is float else v.f
+
+    def back_up(node):
+        # f of a fully generated node is at least the best f among its successors
+        while node is not None and node.succ is not None and node.next_i == len(node.succ) \
+                and node.state != goal:
+            best = min((value(node, i) for i in range(len(node.status))), default=math.inf)
+            if best <= node.f:
+                break
+            node.f = best
+            if node.children == 0:
+                push_leaf(node)
+            if node.open_key is not None:
+                push_open(node)
+            node = node.parent
+
+    def forget_leaf(keep):
+        nonlocal forgotten
+        held = []
+        while leaf_heap:
+            entry = heapq.heappop(leaf_heap)
+            leaf = entry[3]
+            if not leaf.alive or leaf.children or -entry[0] != leaf.f:
+                continue
+            if leaf is keep:
+                held.append(entry)
+                continue
+            drop(leaf, float(leaf.f))
+            forgotten += 1
+            break
+        for entry in held:
+            heapq.heappush(leaf_heap, entry)
+
+    def drop(leaf, remembered):
+        # remove a stored leaf; its parent keeps remembered as that successor's f
+        nonlocal size
+        parent = leaf.parent
+        parent.status[leaf.index] = remembered
+        parent.children -= 1
+        leaf.alive = False
+        stored[leaf.state].remove(leaf)
+        size -= 1
+        if parent.children == 0:
+            push_leaf(parent)
+        if remembered == math.inf:
+            back_up(parent)
+        elif parent.open_key is None or parent.open_key > max(parent.f, remembered):
+            push_open(parent)
+
+    root = _BoundedNode(start_node, 0.0, 0.0, 0, None, None,
+                        float(WEIGHT_COST * h_func(start_node, goal, graph)))
+    stored[start_node] = [root]
+    size = 1
+    push_open(root)
+
+    while open_heap:
+        key, _, _, node = heapq.heappop(open_heap)
+        if not node.alive or key != node.open_key:
+            continue
+        if key == math.inf:
+            break
+        if node.state == goal:
+            path = []
+            walk = node
+            while walk is not None:
+                path.append(walk.state)
+                walk = walk.parent
+            path.reverse()
+            result = (path, [node.cost, node.hop])
+            break
+        if expansions >= max_expansions:
+            truncated = True
+            break
+        expansions += 1
+
+        if node.succ is None:
+            node.succ = [(v, get_edge_cost(graph, node.state, v)) for v in graph.neighbors(node.state)]
+            if not node.succ:
+                node.f = math.inf
+                node.open_key = None
+                push_leaf(node)
+                back_up(node.parent)
+                continue
+        fresh = node.next_i < len(node.succ)
+        if fresh:
+            i = node.next_i
+            remembered = -math.inf
+        else:
+            i = min((j for j, v in enumerate(node.status) if v.__class__ is float),
+                    key=lambda j: node.status[j])
+            remembered = node.status[i]
+            regenerations += 1
+
+        neighbor_node, edge_cost = node.succ[i]
+        score = node.score + WEIGHT_COST * edge_cost + WEIGHT_HOP
+        hop = node.hop + 1
+        dominated = any(other.score <= score and other.hop <= hop for other in stored.get(neighbor_node, ()))
+        if dominated or (hop >= max_nodes - 1 and neighbor_node != goal):
+            child = math.inf
+        else:
+            if size >= max_nodes:
+                forget_leaf(node)
+            f = max(node.f, remembered, score + WEIGHT_COST * h_func(neighbor_node, goal, graph))
+            child = _BoundedNode(neighbor_node, score, node.cost + edge_cost, hop, node, i, float(f))
+            node.children += 1
+            # stored leaves for the same graph node that the new path dominates are dead ends
+            for other in [m for m in stored.get(neighbor_node, ()) if m.children == 0
+                          and m.score >= score and m.hop >= hop]:
+                drop(other, math.inf)
+            stored.setdefault(neighbor_node, []).append(child)
+            size += 1
+            peak_nodes = max(peak_nodes, size)
+            push_open(child)
+            push_leaf(child)
+        # the slot is filled only now, so forgetting a leaf above never backs
+        # up a node whose last successor is still being generated
+        if fresh:
+            node.status.append(child)
+            node.next_i += 1
+        else:
+            node.status[i] = child
+        back_up(node)
+        push_open(node)
+
+        if len(open_heap) + len(leaf_heap) > 8 * size + 64:
+            live = [n for nodes in stored.values() for n in nodes]
+            open_heap = [(n.open_key, -n.hop, j, n) for j, n in enumerate(live) if n.open_key is not None]
+            leaf_heap = [(-n.f, n.hop, j, n) for j, n in enumerate(live) if n.children == 0 and n.parent is not None]
+            heapq.heapify(open_heap)
+            heapq.heapify(leaf_heap)
+
+    if stats is not None:
+        stats['expansions'] = expansions
+        stats['forgotten'] = forgotten
+        stats['regenerations'] = regenerations
+        stats['peak_nodes'] = peak_nodes
+        stats['truncated'] = truncated
+        if trace_memory:
+            stats['peak_bytes'] = tracemalloc.get_traced_memory()[1] - base_bytes
+    if trace_memory and started:
+        tracemalloc.stop()
+    return result
+
+class ParetoFront:
+    """
+    Non-dominated (cost, hop) routes between two nodes, sorted by cost
+    (hops strictly decreasing). Paths are kept as records in a SearchTree
+    and rebuilt on demand.
+    """
+
+    def __init__(self, tree, records, costs, hops):
+        self._tree = tree
+        self._records = records
+        self.costs = costs
+        self.hops = hops
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        for i in range(len(self._records)):
+            yield self.path(i), [self.costs[i], self.hops[i]]
+
+    def path(self, i):
+        return self._tree.path(self._records[i])
+
+    def best(self, weight_cost=WEIGHT_COST, weight_hop=WEIGHT_HOP):
+        """
+        Route minimising weight_cost * cost + weight_hop * hop, for any
+        non-negative weights, without a new search.
+        Returns: (path, [cost, hop]) or (None, None)
+        """
+        if not self._records:
+            return None, None
+        i = min(range(len(self._records)),
+                key=lambda k: (weight_cost * self.costs[k] + weight_hop * self.hops[k], self.hops[k]))
+        return self.path(i), [self.costs[i], self.hops[i]]
+
+def astar_pareto(start_node, goal, graph, h_func=None, stats=None):
+    """
+    Multi-criteria label-setting A* on (cost, hop).
+    Labels are popped in lexicographic (cost + h, hop) order, so with a
+    consistent h_func (default: none) a label is dominated exactly when an
+    earlier label at the same node, or an earlier route to goal, has no
+    more hops. That reduces dominance pruning to one min-hop value per node.
+    If a dict is passed as stats it receives 'labels' (expanded) and 'front'.
+    Returns: ParetoFront (empty when goal is unreachable)
+    """
+    tree = SearchTree()
+    costs = array('d')
+    hops = array('i')
+    min_hop = {}          # node -> fewest hops of any expanded label
+    h_cache = {}
+    goal_hop = math.inf   # fewest hops of any route to goal found so far
+    front = []
+
+    def h(node):
+        value = h_cache.get(node)
+        if value is None:
+            value = h_func(node, goal, graph) if h_func is not None else 0.0
+            h_cache[node] = value
+        return value
+
+    open_heap = [(h(start_node), 0, 0.0, start_node, NO_PARENT)]
+    while open_heap:
+        _, hop, g, node, parent = heapq.heappop(open_heap)
+        if hop >= goal_hop or hop >= min_hop.get(node, math.inf):
+            continue
+        min_hop[node] = hop
+        record = tree.add(node, parent)
+        costs.append(g)
+        hops.append(hop)
+        if node == goal:
+            goal_hop = hop
+            front.append(record)
+            continue
+        new_hop = hop + 1
+        if new_hop >= goal_hop:
+            continue
+        for neighbor_node in graph.neighbors(node):
+            if new_hop >= min_hop.get(neighbor_node, math.inf):
+                continue
+            g_neighbor = g + get_edge_cost(graph, node, neighbor_node)
+            heapq.heappush(open_heap, (g_neighbor + h(neighbor_node), new_hop, g_neighbor,
+                                       neighbor_node, record))
 
-    return best_goal if best_goal else (None, None)
\ No newline at end of file
+    if stats is not None:
+        stats['labels'] = len(tree)
+        stats['front'] = len(front)
+    return ParetoFront(tree, front, [costs[r] for r in front], [hops[r] for r in front])
@@ -0,0 +1,153 @@
+import numpy as np
+
+from common.common import load_map_artifact, save_map_artifact
+from part1.algorithms import WEIGHT_COST, WEIGHT_HOP
+from part1.graph_csr import dijkstra
+
+ARTIFACT_KIND = 'arcflags'
+TIGHT_TOLERANCE = 1e-9
+
+
+class ArcFlags:
+    """
+    Arc-flags over a CSRGraph split into k geographic cells.
+
+    flags is a uint8 bit matrix with one row per CSR edge (same order as
+    csr.targets) and ceil(k / 8) bytes per row: bit c of edge e is set when
+    e lies on some shortest path, for WEIGHT_COST * length + WEIGHT_HOP,
+    into cell c. Searches toward a goal in cell c may skip every other edge
+    and still find an optimal route.
+    """
+
+    def __init__(self, node_ids, offsets, targets, cells, flags):
+        self.node_ids = node_ids
+        self.index = {node: i for i, node in enumerate(node_ids)}
+        self.offsets = offsets
+        self.targets = targets
+        self.cells = cells                  # dense id -> cell
+        self.flags = flags                  # uint8 (num_edges, ceil(k / 8))
+        self.k = int(cells.max()) + 1 if len(cells) else 0
+        self._masks = {}
+        self._edge_ids = None
+
+    def cell_of(self, dense):
+        return int(self.cells[dense])
+
+    def edge_mask(self, cell):
+        """bytes with one 0/1 entry per CSR edge: may the edge lead into cell?"""
+        mask = self._masks.get(cell)
+        if mask is None:
+            column = self.flags[:, cell >> 3]
+            mask = ((column >> (cell & 7)) & 1).tobytes()
+            self._masks[cell] = mask
+        return mask
+
+    def dense_mask(self, goal):
+        """edge_mask for a dense goal id."""
+        return self.edge_mask(self.cell_of(goal))
+
+    def allows(self, u, v, goal):
+        """Edge check with OSM ids, for solvers that do not run on the CSR arrays."""
+        if self._edge_ids is None:
+            self._edge_ids = {}
+            for i, node in enumerate(self.node_ids):
+                for e in range(self.offsets[i], self.offsets[i + 1]):
+                    self._edge_ids[(node, self.node_ids[self.targets[e]])] = e
+        e = self._edge_ids.get((u, v))
+        g = self.index.get(goal)
+        if e is None or g is None:
+            return True
+        return bool(self.dense_mask(g)[e])
+
+    def to_dict(self):
+        return {
+            'node_ids': self.node_ids,
+            'offsets': self.offsets,
+            'targets': self.targets,
+            'cells': self.cells,
+            'flags': self.flags,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['node_ids'], data['offsets'], data['targets'], data['cells'], data['flags'])
+
+
+def partition_cells(xs, ys, k):
+    """
+    Split nodes into k geographic cells of near-equal size by recursive
+    median cuts along the wider side. Returns an int32 cell per node.
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    cells = np.zeros(len(xs), dtype=np.int32)
+    stack = [(np.arange(len(xs)), 0, k)]
+    while stack:
+        members, first, count = stack.pop()
+        if count <= 1 or len(members) <= 1:
+            cells[members] = first
+            continue
+        span_x = np.ptp(xs[members])
+        span_y = np.ptp(ys[members])
+        coords = xs[members] if span_x >= span_y else ys[members]
+        order = members[np.argsort(coords, kind='stable')]
+        left = count // 2
+        cut = len(order) * left // count
+        stack.append((order[:cut], first, left))
+        stack.append((order[cut:], first + left, count - left))
+    return cells
+
+
+def build_arc_flags(csr, k=16):
+    """
+    Compute arc-flags for a CSRGraph: edges inside a cell get its flag, and
+    for every boundary node b of cell c (a node of c with an edge coming in
+    from another cell) a backward Dijkstra from b flags each edge u -> v
+    with d(u, b) == w(u, v) + d(v, b).
+    """
+    n = csr.num_nodes
+    offsets, targets, lengths, xs, ys = csr.as_numpy()
+    k = max(1, min(k, n))
+    cells = partition_cells(xs, ys, k)
+    sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+    weights = WEIGHT_COST * lengths + WEIGHT_HOP
+
+    flags = np.zeros((len(targets), (k + 7) // 8), dtype=np.uint8)
+    src_cell = cells[sources]
+    dst_cell = cells[targets]
+    inside = src_cell == dst_cell
+    np.bitwise_or.at(flags, (np.nonzero(inside)[0], dst_cell[inside] >> 3),
+                     (1 << (dst_cell[inside] & 7)).astype(np.uint8))
+
+    reverse = csr.reverse()
+    _, _, reverse_lengths, _, _ = reverse.as_numpy()
+    reverse_weights = (WEIGHT_COST * reverse_lengths + WEIGHT_HOP).tolist()
+    boundary = np.unique(targets[~inside])
+    for b in boundary.tolist():
+        cell = int(cells[b])
+        dist, _ = dijkstra(reverse, b, reverse_weights)
+        dist = np.asarray(dist)
+        via = weights + dist[targets]
+        with np.errstate(invalid='ignore'):
+            # inf - inf on arcs that cannot reach b gives nan; isfinite(via) drops them
+            tight = np.isfinite(via) & (np.abs(dist[sources] - via) <= TIGHT_TOLERANCE * np.maximum(via, 1.0))
+        flags[tight, cell >> 3] |= np.uint8(1 << (cell & 7))
+
+    return ArcFlags(list(csr.node_ids), offsets.copy(), targets.copy(), cells, flags)
+
+
+def load_arc_flags(city_name, csr, k=16):
+    """
+    Arc-flags for a city, read from setup/maps/<city>.arcflags.pkl when they
+    were built for the current map pickle with the same k and weights,
+    built and stored there otherwise.
+    """
+    params = (k, WEIGHT_COST, WEIGHT_HOP)
+    data = load_map_artifact(city_name, ARTIFACT_KIND)
+    if data is not None and data.get('params') == params:
+        return ArcFlags.from_dict(data)
+    arc_flags = build_arc_flags(csr, k)
+    data = arc_flags.to_dict()
+    data['params'] = params
+    save_map_artifact(city_name, ARTIFACT_KIND, data)
+    return arc_flags
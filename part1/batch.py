@@ -0,0 +1,99 @@
+import heapq
+import math
+from collections import defaultdict
+
+from part1.algorithms import WEIGHT_COST, WEIGHT_HOP
+
+
+def _settle(csr, source, targets, stats=None):
+    """
+    Dijkstra from dense source on WEIGHT_COST * length + WEIGHT_HOP, stopped
+    as soon as every dense id in targets is settled.
+    Returns per-node (cost, hop) labels and the predecessor map.
+    """
+    offsets, out, lengths = csr.offsets, csr.targets, csr.lengths
+    score = {source: 0.0}
+    label = {source: (0.0, 0)}
+    parent = {source: -1}
+    settled = set()
+    remaining = set(targets)
+    heap = [(0.0, source)]
+    while heap and remaining:
+        d, u = heapq.heappop(heap)
+        if u in settled:
+            continue
+        settled.add(u)
+        remaining.discard(u)
+        cost, hop = label[u]
+        for e in range(offsets[u], offsets[u + 1]):
+            v = out[e]
+            nd = d + WEIGHT_COST * lengths[e] + WEIGHT_HOP
+            if nd < score.get(v, math.inf):
+                score[v] = nd
+                label[v] = (cost + lengths[e], hop + 1)
+                parent[v] = u
+                heapq.heappush(heap, (nd, v))
+    if stats is not None:
+        stats['expansions'] = stats.get('expansions', 0) + len(settled)
+        stats['searches'] = stats.get('searches', 0) + 1
+    return label, parent, settled
+
+
+def _path(parent, node):
+    path = []
+    while node != -1:
+        path.append(node)
+        node = parent[node]
+    path.reverse()
+    return path
+
+
+def one_to_many(source, targets, csr, with_paths=True, stats=None):
+    """
+    Answer every target of one source from a single settled search tree.
+    source/targets are OSM ids; returns {target: (path, [cost, hop])} with
+    (None, None) for unreachable targets (path is None if not with_paths).
+    """
+    results = {}
+    if source not in csr.index:
+        return {t: (None, None) for t in targets}
+    wanted = {}
+    for t in targets:
+        if t in csr.index:
+            wanted[csr.index[t]] = t
+        else:
+            results[t] = (None, None)
+
+    label, parent, settled = _settle(csr, csr.index[source], wanted, stats)
+    for dense, t in wanted.items():
+        if dense not in settled:
+            results[t] = (None, None)
+            continue
+        path = csr.to_osm(_path(parent, dense)) if with_paths else None
+        results[t] = (path, list(label[dense]))
+    return results
+
+
+def route_pairs(pairs, csr, with_paths=True, stats=None):
+    """
+    Batch routing for a list of (source, target) OSM id pairs. Pairs are
+    grouped by source so that each distinct source costs one search.
+    Returns results in input order, each (path, [cost, hop]) or (None, None).
+    """
+    by_source = defaultdict(set)
+    for source, target in pairs:
+        by_source[source].add(target)
+    answers = {source: one_to_many(source, targets, csr, with_paths, stats)
+               for source, targets in by_source.items()}
+    return [answers[source][target] for source, target in pairs]
+
+
+def distance_matrix(sources, targets, csr, stats=None):
+    """
+    N x M matrix of [cost, hop] (None where unreachable), one search per
+    distinct source and no path reconstruction.
+    """
+    rows = {}
+    for source in dict.fromkeys(sources):
+        rows[source] = one_to_many(source, targets, csr, with_paths=False, stats=stats)
+    return [[rows[s][t][1] for t in targets] for s in sources]
@@ -1,13 +1,19 @@
 import os
 import time
-import math
 import logging
-import osmnx as ox
 import networkx as nx
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from part1.algorithms import astar_solver  # sửa thành đúng module
+from part1.algorithms import astar_solver, astar_csr, astar_bidirectional, astar_anytime, astar_bounded  # sửa thành đúng module
+from part1.graph_csr import compile_csr
+from part1.landmarks import load_landmarks
+from part1.contraction import load_contraction_hierarchy
+from part1.arc_flags import load_arc_flags
+from part1.batch import route_pairs
+from common.heuristics import HeuristicTable
+from common.snapping import load_spatial_index
+from common.route_cache import RouteCache
 from common.common import (
     load_map,
     load_point_pairs,
@@ -23,28 +29,71 @@ IMG_DIR = os.path.join(OUTPUT_DIR, "images")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger()
 
-def euclidean_h(u, v, g):
-    x1, y1 = g.nodes[u]['x'], g.nodes[u]['y']
-    x2, y2 = g.nodes[v]['x'], g.nodes[v]['y']
-    return math.hypot(x2 - x1, y2 - y1)
+def engine_row(graph, algo, start_name, goal_name, path, fvec, elapsed):
+    """Result row for an alternative engine, same columns as astar_hopper."""
+    return {
+        "algo": algo,
+        "city": CITY,
+        "start": start_name,
+        "goal": goal_name,
+        "distance_m": round(nx.path_weight(graph, path, weight='length'), 2) if path else 0.0,
+        "path_len": len(path) if path else 0,
+        "f_cost": round(fvec[0], 3) if fvec else 0,
+        "hopper": fvec[1] if fvec else 0,
+        "time_s": round(elapsed, 5)
+    }
 
 def run_benchmark():
     graph = load_map(CITY)
     point_pairs = load_point_pairs(POINT_FILE).get(CITY, [])
 
+    t0 = time.time()
+    csr = compile_csr(graph)
+    logger.info(f"CSR snapshot: {csr.num_nodes} nodes, {csr.num_edges} edges in {time.time() - t0:.3f}s")
+    reverse_graph = graph.reverse(copy=False)
+    h_table = HeuristicTable(graph)
+    t0 = time.time()
+    landmarks = load_landmarks(CITY, csr)
+    logger.info(f"ALT landmarks ready in {time.time() - t0:.3f}s")
+    t0 = time.time()
+    hierarchy = load_contraction_hierarchy(CITY, csr)
+    logger.info(f"Contraction hierarchy ready in {time.time() - t0:.3f}s")
+    t0 = time.time()
+    arc_flags = load_arc_flags(CITY, csr)
+    logger.info(f"Arc-flags ready in {time.time() - t0:.3f}s")
+    t0 = time.time()
+    snapped = load_spatial_index(CITY, graph).snap_pairs(point_pairs)
+    logger.info(f"Snapped {2 * len(point_pairs)} points in {time.time() - t0:.3f}s")
+
+    engines = [
+        ("astar_hopper_csr", lambda u, v: astar_csr(u, v, csr)),
+        ("astar_hopper_bidirectional",
+         lambda u, v: astar_bidirectional(u, v, graph, h_table.euclidean, reverse_graph=reverse_graph)),
+        ("astar_hopper_alt", lambda u, v: astar_solver(u, v, graph, landmarks)),
+        ("ch_query", hierarchy.query),
+        ("astar_hopper_arcflags", lambda u, v: astar_csr(u, v, csr, arc_flags=arc_flags)),
+        ("astar_hopper_anytime_20ms",
+         lambda u, v: astar_anytime(u, v, graph, h_table.euclidean, time_limit=0.02)),
+        ("astar_hopper_bounded_50k",
+         lambda u, v: astar_bounded(u, v, graph, h_table.euclidean, max_nodes=50_000,
+                                    max_expansions=2_000_000)),
+    ]
+
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     os.makedirs(IMG_DIR, exist_ok=True)
     results = []
+    node_pairs = []
 
-    for (p1_name, p1_coord), (p2_name, p2_coord) in point_pairs:
+    for ((p1_name, _), (p2_name, _)), (u, v) in zip(point_pairs, snapped):
         logger.info(f"A* Hopper: {p1_name} → {p2_name}")
         try:
-            u = ox.nearest_nodes(graph, p1_coord[1], p1_coord[0])
-            v = ox.nearest_nodes(graph, p2_coord[1], p2_coord[0])
+            node_pairs.append((u, v))
 
+            stats = {}
             t0 = time.time()
-            path, fvec = astar_solver(u, v, graph, euclidean_h)
+            path, fvec = astar_solver(u, v, graph, h_table.euclidean, stats=stats)
             t1 = time.time()
+            logger.info(f"expansions={stats['expansions']} open_left={stats['open_left']}")
 
             if path is None:
                 distance = 0.0
@@ -70,9 +119,29 @@ def run_benchmark():
                 "time_s": round(t1 - t0, 5)
             })
 
+            for algo, solve in engines:
+                t0 = time.time()
+                alt_path, alt_fvec = solve(u, v)
+                t1 = time.time()
+                results.append(engine_row(graph, algo, p1_name, p2_name, alt_path, alt_fvec, t1 - t0))
+
         except Exception as e:
             logger.warning(f"Failed on {p1_name} → {p2_name}: {e}")
 
+    if node_pairs:
+        t0 = time.time()
+        route_pairs(node_pairs, csr)
+        logger.info(f"Batch routing of {len(node_pairs)} pairs in {time.time() - t0:.3f}s")
+
+        route_cache = RouteCache(CITY, disk=True)
+        cached_solver = route_cache.wrap(astar_solver, heuristic="HeuristicTable.euclidean")
+        for rounds in range(2):
+            t0 = time.time()
+            for u, v in node_pairs:
+                cached_solver(u, v, graph, h_table.euclidean)
+            logger.info(f"Cached routing round {rounds + 1} in {time.time() - t0:.3f}s: {route_cache.stats()}")
+        route_cache.flush()
+
     save_results(results, OUTPUT_DIR, "benchmark_astar_hopper")
     logger.info("Benchmark complete.")
 
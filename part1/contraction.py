@@ -0,0 +1,294 @@
+import heapq
+import math
+from array import array
+
+from common.common import load_map_artifact, save_map_artifact
+from part1.algorithms import WEIGHT_COST, WEIGHT_HOP
+
+ARTIFACT_KIND = 'ch'
+NO_MIDDLE = -1
+ESTIMATE_SETTLE_LIMIT = 20
+
+
+def _pack(rows):
+    """
+    Flatten per-node edge lists [(other, weight, length, hops, middle), ...]
+    into CSR arrays (offsets, others, weights, lengths, hops, middles).
+    """
+    offsets = array('q', [0])
+    others = array('i')
+    weights = array('d')
+    lengths = array('d')
+    hops = array('i')
+    middles = array('i')
+    for row in rows:
+        for other, weight, length, hop, middle in row:
+            others.append(other)
+            weights.append(weight)
+            lengths.append(length)
+            hops.append(hop)
+            middles.append(middle)
+        offsets.append(len(others))
+    return offsets, others, weights, lengths, hops, middles
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy over the weighted objective
+    WEIGHT_COST * length + WEIGHT_HOP per edge.
+
+    upward[u]   holds edges u -> w with rank[w] > rank[u],
+    downward[v] holds edges u -> v with rank[u] > rank[v] (stored at v, keyed by u).
+    Shortcuts remember the contracted middle node so queries can be unpacked
+    back to full OSM node paths.
+    """
+
+    def __init__(self, node_ids, rank, upward, downward):
+        self.node_ids = node_ids
+        self.index = {node: i for i, node in enumerate(node_ids)}
+        self.rank = rank
+        self.upward = upward
+        self.downward = downward
+
+    @property
+    def num_shortcuts(self):
+        return (sum(1 for m in self.upward[5] if m != NO_MIDDLE)
+                + sum(1 for m in self.downward[5] if m != NO_MIDDLE))
+
+    def _middle(self, a, b):
+        """Middle node of edge a -> b (NO_MIDDLE for an original edge)."""
+        if self.rank[a] < self.rank[b]:
+            offsets, others, _, _, _, middles = self.upward
+            u, key = a, b
+        else:
+            offsets, others, _, _, _, middles = self.downward
+            u, key = b, a
+        for e in range(offsets[u], offsets[u + 1]):
+            if others[e] == key:
+                return middles[e]
+        raise KeyError((a, b))
+
+    def _unpack(self, a, b, out):
+        """Append the original nodes of a -> b (excluding a) to out."""
+        stack = [(a, b)]
+        while stack:
+            x, y = stack.pop()
+            m = self._middle(x, y)
+            if m == NO_MIDDLE:
+                out.append(y)
+            else:
+                stack.append((m, y))
+                stack.append((x, m))
+
+    def query(self, start_node, goal, stats=None):
+        """
+        Bidirectional upward Dijkstra.
+        Returns: (path, [cost, hop]) like astar_solver, or (None, None)
+        """
+        if start_node not in self.index or goal not in self.index:
+            return None, None
+        s = self.index[start_node]
+        t = self.index[goal]
+
+        graphs = (self.upward, self.downward)
+        score = ({s: 0.0}, {t: 0.0})
+        cost = ({s: 0.0}, {t: 0.0})
+        hops = ({s: 0}, {t: 0})
+        parent = ({s: -1}, {t: -1})
+        settled = (set(), set())
+        heaps = ([(0.0, s)], [(0.0, t)])
+
+        best = 0.0 if s == t else math.inf
+        meet = s if s == t else None
+        expansions = 0
+
+        while heaps[0] or heaps[1]:
+            for side in (0, 1):
+                if heaps[side] and heaps[side][0][0] >= best:
+                    heaps[side].clear()
+            if not heaps[0] and not heaps[1]:
+                break
+            if not heaps[1] or (heaps[0] and heaps[0][0][0] <= heaps[1][0][0]):
+                side = 0
+            else:
+                side = 1
+            other = 1 - side
+            d, u = heapq.heappop(heaps[side])
+            if u in settled[side]:
+                continue
+            settled[side].add(u)
+            expansions += 1
+
+            offsets, others, weights, lengths, hop_counts, _ = graphs[side]
+            for e in range(offsets[u], offsets[u + 1]):
+                v = others[e]
+                nd = d + weights[e]
+                if nd >= score[side].get(v, math.inf):
+                    continue
+                score[side][v] = nd
+                cost[side][v] = cost[side][u] + lengths[e]
+                hops[side][v] = hops[side][u] + hop_counts[e]
+                parent[side][v] = u
+                heapq.heappush(heaps[side], (nd, v))
+                if v in score[other] and nd + score[other][v] < best:
+                    best = nd + score[other][v]
+                    meet = v
+
+        if stats is not None:
+            stats['expansions'] = expansions
+        if meet is None:
+            return None, None
+
+        up_chain = [meet]
+        while parent[0][up_chain[-1]] != -1:
+            up_chain.append(parent[0][up_chain[-1]])
+        up_chain.reverse()
+        down_chain = [meet]
+        while parent[1][down_chain[-1]] != -1:
+            down_chain.append(parent[1][down_chain[-1]])
+
+        chain = up_chain + down_chain[1:]
+        dense_path = [chain[0]]
+        for a, b in zip(chain, chain[1:]):
+            self._unpack(a, b, dense_path)
+
+        path = [self.node_ids[i] for i in dense_path]
+        return path, [cost[0][meet] + cost[1][meet], hops[0][meet] + hops[1][meet]]
+
+    def to_dict(self):
+        return {
+            'node_ids': self.node_ids,
+            'rank': self.rank,
+            'upward': self.upward,
+            'downward': self.downward,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['node_ids'], data['rank'], data['upward'], data['downward'])
+
+
+def build_contraction_hierarchy(csr, witness_settle_limit=300):
+    """
+    Contract every node of a CSRGraph in edge-difference order (lazy updates,
+    plus contracted-neighbour count and hierarchy depth to keep the order
+    spread out). Before adding a shortcut u -> w around v, a witness search
+    from u that skips v looks for a path that is no longer; it gives up
+    after witness_settle_limit settled nodes, which can only add redundant
+    shortcuts.
+    """
+    n = csr.num_nodes
+    out_edges = [dict() for _ in range(n)]   # u -> {w: (weight, length, hops, middle)}
+    in_edges = [dict() for _ in range(n)]    # w -> {u: (weight, length, hops, middle)}
+    for u in range(n):
+        for v, length in csr.edges(u):
+            if v == u:
+                continue
+            edge = (WEIGHT_COST * length + WEIGHT_HOP, length, 1, NO_MIDDLE)
+            if v not in out_edges[u] or edge[0] < out_edges[u][v][0]:
+                out_edges[u][v] = edge
+                in_edges[v][u] = edge
+
+    contracted = [False] * n
+    contracted_neighbors = [0] * n
+    depth = [0] * n
+    rank = [0] * n
+
+    def witness_distances(source, skip, limit, targets, settle_limit):
+        dist = {source: 0.0}
+        heap = [(0.0, source)]
+        remaining = set(targets)
+        settled = 0
+        while heap and remaining and settled < settle_limit:
+            d, x = heapq.heappop(heap)
+            if d > dist[x]:
+                continue
+            if d > limit:
+                break
+            remaining.discard(x)
+            settled += 1
+            for y, (w, _, _, _) in out_edges[x].items():
+                if y == skip or contracted[y]:
+                    continue
+                nd = d + w
+                if nd < dist.get(y, math.inf):
+                    dist[y] = nd
+                    heapq.heappush(heap, (nd, y))
+        return dist
+
+    def needed_shortcuts(v, settle_limit):
+        shortcuts = []
+        outgoing = out_edges[v]
+        for u, (w_in, len_in, hop_in, _) in in_edges[v].items():
+            targets = {w: w_in + edge[0] for w, edge in outgoing.items() if w != u}
+            if not targets:
+                continue
+            dist = witness_distances(u, v, max(targets.values()), targets, settle_limit)
+            for w, via in targets.items():
+                if dist.get(w, math.inf) > via:
+                    _, len_out, hop_out, _ = outgoing[w]
+                    shortcuts.append((u, w, (via, len_in + len_out, hop_in + hop_out, v)))
+        return shortcuts
+
+    def priority(v):
+        # cheap estimate: a short witness search only over-counts shortcuts
+        shortcuts = needed_shortcuts(v, ESTIMATE_SETTLE_LIMIT)
+        edge_difference = len(shortcuts) - len(in_edges[v]) - len(out_edges[v])
+        return edge_difference + contracted_neighbors[v] + depth[v]
+
+    upward_rows = [None] * n
+    downward_rows = [None] * n
+    heap = [(priority(v), v) for v in range(n)]
+    heapq.heapify(heap)
+    level = 0
+
+    while heap:
+        _, v = heapq.heappop(heap)
+        if contracted[v]:
+            continue
+        current = priority(v)
+        if heap and current > heap[0][0]:
+            heapq.heappush(heap, (current, v))
+            continue
+
+        shortcuts = needed_shortcuts(v, witness_settle_limit)
+        rank[v] = level
+        level += 1
+        contracted[v] = True
+        upward_rows[v] = [(w, *edge) for w, edge in out_edges[v].items()]
+        downward_rows[v] = [(u, *edge) for u, edge in in_edges[v].items()]
+
+        for u in in_edges[v]:
+            del out_edges[u][v]
+            contracted_neighbors[u] += 1
+            depth[u] = max(depth[u], depth[v] + 1)
+        for w in out_edges[v]:
+            del in_edges[w][v]
+            contracted_neighbors[w] += 1
+            depth[w] = max(depth[w], depth[v] + 1)
+        out_edges[v] = {}
+        in_edges[v] = {}
+
+        for u, w, edge in shortcuts:
+            existing = out_edges[u].get(w)
+            if existing is None or edge[0] < existing[0]:
+                out_edges[u][w] = edge
+                in_edges[w][u] = edge
+
+    return ContractionHierarchy(list(csr.node_ids), rank, _pack(upward_rows), _pack(downward_rows))
+
+
+def load_contraction_hierarchy(city_name, csr, witness_settle_limit=300):
+    """
+    Hierarchy for a city, read from setup/maps/<city>.ch.pkl when it was built
+    for the current map pickle and weights, built and stored there otherwise.
+    """
+    params = (WEIGHT_COST, WEIGHT_HOP)
+    data = load_map_artifact(city_name, ARTIFACT_KIND)
+    if data is not None and data.get('params') == params:
+        return ContractionHierarchy.from_dict(data)
+    hierarchy = build_contraction_hierarchy(csr, witness_settle_limit)
+    data = hierarchy.to_dict()
+    data['params'] = params
+    save_map_artifact(city_name, ARTIFACT_KIND, data)
+    return hierarchy
@@ -0,0 +1,185 @@
+import heapq
+import math
+from array import array
+
+
+def _edge_length(graph, u, v):
+    """
+    Shortest 'length' among the parallel edges u -> v (1.0 if missing).
+    Works with networkx MultiDiGraph ({key: attrs}) and with plain
+    adjacency wrappers that return a list of attribute dicts.
+    """
+    try:
+        data = graph[u][v]
+    except Exception:
+        return 1.0
+    edges = data.values() if hasattr(data, 'values') else data
+    best = None
+    for edge in edges:
+        if isinstance(edge, tuple):
+            edge = edge[2]
+        length = edge.get('length', 1.0)
+        if best is None or length < best:
+            best = length
+    return 1.0 if best is None else best
+
+
+class CSRGraph:
+    """
+    Read-only compressed sparse row (CSR) snapshot of a directed road graph.
+
+    Nodes are renumbered to dense ids 0..n-1. The out-edges of node i are
+    targets[offsets[i]:offsets[i + 1]] with the matching lengths. Buffers
+    are flat typed arrays, so numpy views can be taken without copying
+    (see as_numpy()).
+    """
+
+    def __init__(self, node_ids, offsets, targets, lengths, xs, ys):
+        self.node_ids = node_ids          # dense id -> OSM node id
+        self.index = {node: i for i, node in enumerate(node_ids)}
+        self.offsets = offsets            # array('q'), len n + 1
+        self.targets = targets            # array('i'), len m
+        self.lengths = lengths            # array('d'), len m
+        self.xs = xs                      # array('d'), len n
+        self.ys = ys                      # array('d'), len n
+        self._reverse = None
+
+    @property
+    def num_nodes(self):
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    def neighbors(self, i):
+        """Dense ids of the out-neighbours of dense node i."""
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def edges(self, i):
+        """Yield (target, length) for every out-edge of dense node i."""
+        for e in range(self.offsets[i], self.offsets[i + 1]):
+            yield self.targets[e], self.lengths[e]
+
+    def edge_index(self, i, j):
+        """Position of edge i -> j in targets/lengths, or -1 if absent."""
+        for e in range(self.offsets[i], self.offsets[i + 1]):
+            if self.targets[e] == j:
+                return e
+        return -1
+
+    def to_dense(self, nodes):
+        return [self.index[node] for node in nodes]
+
+    def to_osm(self, dense_path):
+        return [self.node_ids[i] for i in dense_path]
+
+    def reverse(self):
+        """CSR graph with every edge flipped (cached after the first call)."""
+        if self._reverse is None:
+            n = self.num_nodes
+            counts = [0] * (n + 1)
+            for t in self.targets:
+                counts[t + 1] += 1
+            for i in range(n):
+                counts[i + 1] += counts[i]
+            offsets = array('q', counts)
+            fill = counts[:-1]
+            targets = array('i', bytes(4 * self.num_edges))
+            lengths = array('d', bytes(8 * self.num_edges))
+            for u in range(n):
+                for e in range(self.offsets[u], self.offsets[u + 1]):
+                    v = self.targets[e]
+                    pos = fill[v]
+                    targets[pos] = u
+                    lengths[pos] = self.lengths[e]
+                    fill[v] = pos + 1
+            rev = CSRGraph(self.node_ids, offsets, targets, lengths, self.xs, self.ys)
+            rev.index = self.index
+            rev._reverse = self
+            self._reverse = rev
+        return self._reverse
+
+    def as_numpy(self):
+        """Zero-copy numpy views: (offsets, targets, lengths, xs, ys)."""
+        import numpy as np
+        return (np.frombuffer(self.offsets, dtype=np.int64),
+                np.frombuffer(self.targets, dtype=np.int32),
+                np.frombuffer(self.lengths, dtype=np.float64),
+                np.frombuffer(self.xs, dtype=np.float64),
+                np.frombuffer(self.ys, dtype=np.float64))
+
+
+def compile_csr(graph):
+    """
+    One-time compilation of a graph (e.g. the MultiDiGraph returned by
+    common.load_map) into a CSRGraph. Parallel edges collapse to the
+    shortest one; nodes without 'x'/'y' attributes get coordinates 0.0.
+    """
+    node_ids = list(graph.nodes)
+    index = {node: i for i, node in enumerate(node_ids)}
+
+    rows = []
+    for node in node_ids:
+        row = []
+        for nbr in graph.neighbors(node):
+            if nbr not in index:
+                index[nbr] = len(node_ids)
+                node_ids.append(nbr)
+            row.append((index[nbr], _edge_length(graph, node, nbr)))
+        rows.append(row)
+    rows.extend([] for _ in range(len(node_ids) - len(rows)))
+
+    offsets = array('q', [0])
+    targets = array('i')
+    lengths = array('d')
+    for row in rows:
+        for v, length in row:
+            targets.append(v)
+            lengths.append(length)
+        offsets.append(len(targets))
+
+    xs = array('d')
+    ys = array('d')
+    nodes = getattr(graph, 'nodes', {})
+    for node in node_ids:
+        try:
+            attrs = nodes[node]
+        except (KeyError, TypeError):
+            attrs = {}
+        xs.append(attrs.get('x', 0.0))
+        ys.append(attrs.get('y', 0.0))
+
+    return CSRGraph(node_ids, offsets, targets, lengths, xs, ys)
+
+
+def csr_euclidean_h(u, v, csr):
+    """Euclidean distance between dense nodes u and v of a CSRGraph."""
+    return math.hypot(csr.xs[v] - csr.xs[u], csr.ys[v] - csr.ys[u])
+
+
+def dijkstra(csr, source, weights=None):
+    """
+    Single-source shortest paths over dense ids of a CSRGraph.
+    weights defaults to csr.lengths (one value per edge).
+    Returns (dist, parent) lists; unreachable nodes have dist inf, parent -1.
+    """
+    if weights is None:
+        weights = csr.lengths
+    offsets, targets = csr.offsets, csr.targets
+    dist = [math.inf] * csr.num_nodes
+    parent = [-1] * csr.num_nodes
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            nd = d + weights[e]
+            if nd < dist[v]:
+                dist[v] = nd
+                parent[v] = u
+                heapq.heappush(heap, (nd, v))
+    return dist, parent
@@ -0,0 +1,137 @@
+import heapq
+import math
+
+from part1.algorithms import WEIGHT_COST, WEIGHT_HOP, get_edge_cost
+
+
+class IncrementalPlanner:
+    """
+    Lifelong Planning A* (LPA*) between a fixed start and goal on the
+    weighted objective WEIGHT_COST * length + WEIGHT_HOP per edge.
+
+    g/rhs values and the open list survive between replan() calls, so after
+    update_edges() only nodes whose shortest-path value actually changed
+    are expanded again. Edge lengths come from graph (get_edge_cost) unless
+    overridden through update_edges(); the graph itself is never modified.
+    predecessors are read from reverse_graph (default:
+    graph.reverse(copy=False)). h_func must be consistent for the current
+    lengths, e.g. Euclidean distance when lengths only ever grow.
+    """
+
+    def __init__(self, start_node, goal, graph, h_func, reverse_graph=None):
+        self.start = start_node
+        self.goal = goal
+        self.graph = graph
+        self.reverse_graph = reverse_graph if reverse_graph is not None else graph.reverse(copy=False)
+        self.h_func = h_func
+        self.overrides = {}       # (u, v) -> length, math.inf for a closed edge
+        self.g = {}
+        self.rhs = {start_node: 0.0}
+        self._h = {}
+        self._open = {}           # node -> current key; heap entries with another key are stale
+        self._heap = []
+        self.expansions = 0
+        self._push(start_node)
+
+    def length(self, u, v):
+        value = self.overrides.get((u, v))
+        return get_edge_cost(self.graph, u, v) if value is None else value
+
+    def _weight(self, u, v):
+        return WEIGHT_COST * self.length(u, v) + WEIGHT_HOP
+
+    def _heuristic(self, node):
+        value = self._h.get(node)
+        if value is None:
+            value = WEIGHT_COST * self.h_func(node, self.goal, self.graph)
+            self._h[node] = value
+        return value
+
+    def _key(self, node):
+        best = min(self.g.get(node, math.inf), self.rhs.get(node, math.inf))
+        return (best + self._heuristic(node), best)
+
+    def _push(self, node):
+        key = self._key(node)
+        self._open[node] = key
+        heapq.heappush(self._heap, (key, node))
+
+    def _top_key(self):
+        heap = self._heap
+        while heap and self._open.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else (math.inf, math.inf)
+
+    def _update_vertex(self, node):
+        if node != self.start:
+            best = math.inf
+            for pred in self.reverse_graph.neighbors(node):
+                d = self.g.get(pred, math.inf) + self._weight(pred, node)
+                if d < best:
+                    best = d
+            self.rhs[node] = best
+        if self.g.get(node, math.inf) != self.rhs.get(node, math.inf):
+            self._push(node)
+        else:
+            self._open.pop(node, None)
+
+    def _compute_shortest_path(self):
+        goal = self.goal
+        while (self._top_key() < self._key(goal)
+               or self.rhs.get(goal, math.inf) != self.g.get(goal, math.inf)):
+            if not self._heap:
+                break
+            _, node = heapq.heappop(self._heap)
+            del self._open[node]
+            self.expansions += 1
+            g_node = self.g.get(node, math.inf)
+            rhs_node = self.rhs.get(node, math.inf)
+            if g_node > rhs_node:
+                self.g[node] = rhs_node
+            else:
+                self.g[node] = math.inf
+                self._update_vertex(node)
+            for succ in self.graph.neighbors(node):
+                self._update_vertex(succ)
+
+    def update_edges(self, changes):
+        """
+        Register new lengths, as {(u, v): length} or [(u, v, length), ...].
+        math.inf closes an edge, None drops the override and re-reads the
+        length from graph. Takes effect on the next replan().
+        """
+        items = changes.items() if hasattr(changes, 'items') else (((u, v), w) for u, v, w in changes)
+        for (u, v), length in items:
+            if length is None:
+                self.overrides.pop((u, v), None)
+            else:
+                self.overrides[(u, v)] = length
+            self._update_vertex(v)
+
+    def replan(self, stats=None):
+        """
+        Repair the search after update_edges() (or run it the first time).
+        If a dict is passed as stats it receives 'expansions' for this call.
+        Returns: (path, [cost, hop]) or (None, None)
+        """
+        before = self.expansions
+        self._compute_shortest_path()
+        if stats is not None:
+            stats['expansions'] = self.expansions - before
+        if self.g.get(self.goal, math.inf) == math.inf:
+            return None, None
+
+        path = [self.goal]
+        cost = 0.0
+        node = self.goal
+        while node != self.start:
+            best, best_pred = math.inf, None
+            for pred in self.reverse_graph.neighbors(node):
+                d = self.g.get(pred, math.inf) + self._weight(pred, node)
+                if d < best:
+                    best, best_pred = d, pred
+            cost += self.length(best_pred, node)
+            node = best_pred
+            path.append(node)
+        path.reverse()
+        return path, [cost, len(path) - 1]
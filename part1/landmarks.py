@@ -0,0 +1,192 @@
+import math
+import random
+
+import numpy as np
+
+from common.common import load_map_artifact, save_map_artifact
+from common.heuristics import GoalCache
+from part1.graph_csr import dijkstra
+
+ARTIFACT_KIND = 'alt'
+
+
+class Landmarks:
+    """
+    ALT (A*, landmarks, triangle inequality) lower bounds.
+
+    forward[i, v] = d(L_i, v) and backward[i, v] = d(v, L_i) over edge
+    lengths. For a goal t the bound on d(u, t) is
+        max_i max(d(L_i, t) - d(L_i, u), d(u, L_i) - d(t, L_i)),
+    computed for all u in one numpy pass and kept for the last few goals.
+
+    An instance is an h_func: landmarks(u, goal, graph) with OSM ids works
+    with astar_solver and astar_parallel, dense_h(u, goal, csr) with astar_csr.
+    """
+
+    def __init__(self, node_ids, landmarks, forward, backward, cache_size=8):
+        self.node_ids = node_ids
+        self.index = {node: i for i, node in enumerate(node_ids)}
+        self.landmarks = landmarks          # dense ids
+        self.forward = forward              # float64 (k, n)
+        self.backward = backward            # float64 (k, n)
+        self._rows = GoalCache(self._compute_row, cache_size)
+
+    def goal_row(self, t):
+        """Lower bounds d(u, t) for every dense u, as a list."""
+        return self._rows.get(t)
+
+    def _compute_row(self, t):
+        with np.errstate(invalid='ignore'):
+            via_from = self.forward[:, t:t + 1] - self.forward
+            via_to = self.backward - self.backward[:, t:t + 1]
+            bound = np.fmax.reduce(np.fmax(via_from, via_to), axis=0)
+        # nan only where no landmark says anything (both sides unreachable)
+        bound = np.nan_to_num(bound, nan=0.0, posinf=math.inf, neginf=0.0)
+        return np.maximum(bound, 0.0).tolist()
+
+    def __call__(self, u, v, graph=None):
+        iu = self.index.get(u)
+        iv = self.index.get(v)
+        if iu is None or iv is None:
+            return 0.0
+        return self.goal_row(iv)[iu]
+
+    def dense_h(self, u, v, csr=None):
+        return self.goal_row(v)[u]
+
+    def to_dict(self):
+        return {
+            'node_ids': self.node_ids,
+            'landmarks': self.landmarks,
+            'forward': self.forward,
+            'backward': self.backward,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['node_ids'], data['landmarks'], data['forward'], data['backward'])
+
+
+def _distance_rows(csr, landmark):
+    forward, _ = dijkstra(csr, landmark)
+    backward, _ = dijkstra(csr.reverse(), landmark)
+    return np.asarray(forward), np.asarray(backward)
+
+
+def _farthest(dist, exclude):
+    """Dense id with the largest finite value in dist, skipping exclude."""
+    score = np.where(np.isfinite(dist), dist, -1.0)
+    score[list(exclude)] = -1.0
+    best = int(np.argmax(score))
+    return best if score[best] > 0 else None
+
+
+def _first_landmark(csr, rnd):
+    root = rnd.randrange(csr.num_nodes)
+    dist, _ = dijkstra(csr, root)
+    first = _farthest(np.asarray(dist), {root})
+    return root if first is None else first
+
+
+def _avoid_pick(csr, rnd, chosen, forward, backward):
+    """
+    Goldberg-Werneck 'avoid': grow a shortest-path tree from a random root,
+    weight every node by how badly the current landmarks bound d(root, v),
+    and descend the heaviest landmark-free subtree down to a leaf.
+    """
+    n = csr.num_nodes
+    root = rnd.randrange(n)
+    dist, parent = dijkstra(csr, root)
+    dist = np.asarray(dist)
+    reached = np.isfinite(dist)
+
+    F = np.asarray(forward)
+    B = np.asarray(backward)
+    with np.errstate(invalid='ignore'):
+        bound = np.fmax.reduce(np.fmax(F - F[:, root:root + 1], B[:, root:root + 1] - B), axis=0)
+    bound = np.nan_to_num(bound, nan=0.0, posinf=0.0, neginf=0.0)
+    size = np.where(reached, dist - np.maximum(bound, 0.0), 0.0).tolist()
+
+    children = [[] for _ in range(n)]
+    for v in range(n):
+        if parent[v] >= 0:
+            children[parent[v]].append(v)
+    order = [root]
+    for v in order:
+        order.extend(children[v])
+
+    covered = [False] * n
+    for v in chosen:
+        covered[v] = True
+    for v in reversed(order):
+        p = parent[v]
+        if covered[v]:
+            size[v] = 0.0
+            if p >= 0:
+                covered[p] = True
+        elif p >= 0:
+            size[p] += size[v]
+
+    best = max(order, key=lambda v: size[v])
+    if size[best] <= 0.0:
+        return None
+    while children[best]:
+        nxt = max(children[best], key=lambda v: size[v])
+        if size[nxt] <= 0.0:
+            break
+        best = nxt
+    return best
+
+
+def build_landmarks(csr, k=16, method='avoid', seed=0):
+    """
+    Select k landmarks on a CSRGraph and compute their distance tables.
+    method: 'farthest' (maximise the distance to the landmarks chosen so far)
+    or 'avoid' (Goldberg-Werneck). Falls back to farthest when avoid finds
+    no uncovered region.
+    """
+    if method not in ('farthest', 'avoid'):
+        raise ValueError(f"Unknown landmark selection method: {method}")
+    rnd = random.Random(seed)
+    k = min(k, csr.num_nodes)
+
+    chosen = []
+    forward = []
+    backward = []
+    closest = np.full(csr.num_nodes, math.inf)
+
+    landmark = _first_landmark(csr, rnd)
+    while landmark is not None and len(chosen) < k:
+        chosen.append(landmark)
+        f_row, b_row = _distance_rows(csr, landmark)
+        forward.append(f_row)
+        backward.append(b_row)
+        closest = np.minimum(closest, np.where(np.isfinite(f_row), f_row, math.inf))
+        if len(chosen) == k:
+            break
+        landmark = None
+        if method == 'avoid':
+            landmark = _avoid_pick(csr, rnd, chosen, forward, backward)
+            if landmark in chosen:
+                landmark = None
+        if landmark is None:
+            landmark = _farthest(closest, chosen)
+
+    return Landmarks(list(csr.node_ids), chosen, np.vstack(forward), np.vstack(backward))
+
+
+def load_landmarks(city_name, csr, k=16, method='avoid', seed=0):
+    """
+    Landmark tables for a city, read from setup/maps/<city>.alt.pkl when they
+    were built for the current map pickle with the same parameters, built and
+    stored there otherwise.
+    """
+    params = (k, method, seed)
+    data = load_map_artifact(city_name, ARTIFACT_KIND)
+    if data is not None and data.get('params') == params:
+        return Landmarks.from_dict(data)
+    landmarks = build_landmarks(csr, k, method, seed)
+    data = landmarks.to_dict()
+    data['params'] = params
+    save_map_artifact(city_name, ARTIFACT_KIND, data)
+    return landmarks
@@ -0,0 +1,232 @@
+import heapq
+import math
+
+# scaled key used for infinite keys in RadixQueue (fits the 65 buckets)
+RADIX_INFINITY = (1 << 63) - 1
+
+
+class HeapQueue:
+    """
+    Plain heapq open list. Every push adds an entry, so a node can sit in the
+    heap several times; stale entries are filtered by the caller on pop.
+    Entries compare as (key, item, payload), the ordering astar_solver has
+    always used.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self.pushes = 0
+        self.pops = 0
+        self.decrease_keys = 0
+        self.max_size = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, key, item, payload=None):
+        heapq.heappush(self._heap, (key, item, payload))
+        self.pushes += 1
+        if len(self._heap) > self.max_size:
+            self.max_size = len(self._heap)
+        return True
+
+    def pop(self):
+        """Remove and return (key, item, payload) with the smallest key."""
+        self.pops += 1
+        return heapq.heappop(self._heap)
+
+    def peek_key(self):
+        return self._heap[0][0]
+
+    def stats(self):
+        return {
+            'pushes': self.pushes,
+            'pops': self.pops,
+            'decrease_keys': self.decrease_keys,
+            'max_size': self.max_size,
+        }
+
+
+class IndexedHeap(HeapQueue):
+    """
+    d-ary heap with at most one entry per item and decrease-key.
+
+    push() on an item that is already queued keeps the smaller key (and its
+    payload) and sifts it up in place; a larger or equal key is dropped and
+    push() returns False. Once popped, an item may be pushed again.
+    """
+
+    def __init__(self, arity=2):
+        super().__init__()
+        if arity < 2:
+            raise ValueError("arity must be at least 2")
+        self.arity = arity
+        self._keys = []
+        self._items = []
+        self._payloads = []
+        self._pos = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def push(self, key, item, payload=None):
+        i = self._pos.get(item)
+        if i is not None:
+            if key >= self._keys[i]:
+                return False
+            self._keys[i] = key
+            self._payloads[i] = payload
+            self.decrease_keys += 1
+            self._sift_up(i)
+            return True
+        self._keys.append(key)
+        self._items.append(item)
+        self._payloads.append(payload)
+        self._pos[item] = len(self._keys) - 1
+        self._sift_up(len(self._keys) - 1)
+        self.pushes += 1
+        if len(self._keys) > self.max_size:
+            self.max_size = len(self._keys)
+        return True
+
+    def pop(self):
+        keys, items, payloads = self._keys, self._items, self._payloads
+        top = (keys[0], items[0], payloads[0])
+        del self._pos[items[0]]
+        last_key, last_item, last_payload = keys.pop(), items.pop(), payloads.pop()
+        if keys:
+            keys[0], items[0], payloads[0] = last_key, last_item, last_payload
+            self._pos[last_item] = 0
+            self._sift_down(0)
+        self.pops += 1
+        return top
+
+    def peek_key(self):
+        return self._keys[0]
+
+    def __contains__(self, item):
+        return item in self._pos
+
+    def _move(self, src, dst):
+        self._keys[dst] = self._keys[src]
+        self._items[dst] = self._items[src]
+        self._payloads[dst] = self._payloads[src]
+        self._pos[self._items[dst]] = dst
+
+    def _sift_up(self, i):
+        keys, items, payloads = self._keys, self._items, self._payloads
+        key, item, payload = keys[i], items[i], payloads[i]
+        while i > 0:
+            parent = (i - 1) // self.arity
+            if keys[parent] <= key:
+                break
+            self._move(parent, i)
+            i = parent
+        keys[i], items[i], payloads[i] = key, item, payload
+        self._pos[item] = i
+
+    def _sift_down(self, i):
+        keys, items, payloads = self._keys, self._items, self._payloads
+        n = len(keys)
+        key, item, payload = keys[i], items[i], payloads[i]
+        while True:
+            first = self.arity * i + 1
+            if first >= n:
+                break
+            best = first
+            for c in range(first + 1, min(first + self.arity, n)):
+                if keys[c] < keys[best]:
+                    best = c
+            if keys[best] >= key:
+                break
+            self._move(best, i)
+            i = best
+        keys[i], items[i], payloads[i] = key, item, payload
+        self._pos[item] = i
+
+
+class RadixQueue(HeapQueue):
+    """
+    Monotone radix heap over integer-scaled keys (int(key * scale)).
+
+    Valid when popped keys never decrease, which holds for A* with a
+    consistent heuristic. Entries whose keys fall in the same 1/scale step
+    come out in arbitrary order, so results are exact up to 1/scale. A key
+    below the last popped one is clamped to it and counted in
+    monotone_violations.
+    """
+
+    def __init__(self, scale=100):
+        super().__init__()
+        self.scale = scale
+        self.monotone_violations = 0
+        self._last = 0
+        self._size = 0
+        self._buckets = [[] for _ in range(65)]
+
+    def __len__(self):
+        return self._size
+
+    def _bucket(self, scaled):
+        return (scaled ^ self._last).bit_length()
+
+    def push(self, key, item, payload=None):
+        scaled = RADIX_INFINITY if math.isinf(key) else int(key * self.scale)
+        if scaled < self._last:
+            self.monotone_violations += 1
+            scaled = self._last
+        self._buckets[self._bucket(scaled)].append((scaled, key, item, payload))
+        self._size += 1
+        self.pushes += 1
+        if self._size > self.max_size:
+            self.max_size = self._size
+        return True
+
+    def _refill(self):
+        buckets = self._buckets
+        if buckets[0]:
+            return
+        i = 1
+        while not buckets[i]:
+            i += 1
+        entries = buckets[i]
+        buckets[i] = []
+        self._last = min(entry[0] for entry in entries)
+        for entry in entries:
+            buckets[self._bucket(entry[0])].append(entry)
+
+    def pop(self):
+        if not self._size:
+            raise IndexError("pop from empty RadixQueue")
+        self._refill()
+        _, key, item, payload = self._buckets[0].pop()
+        self._size -= 1
+        self.pops += 1
+        return key, item, payload
+
+    def peek_key(self):
+        self._refill()
+        return min(entry[1] for entry in self._buckets[0])
+
+    def stats(self):
+        stats = super().stats()
+        stats['monotone_violations'] = self.monotone_violations
+        return stats
+
+
+OPEN_LISTS = {
+    'heap': HeapQueue,
+    'indexed': IndexedHeap,
+    'dary': lambda: IndexedHeap(arity=4),
+    'radix': RadixQueue,
+}
+
+
+def make_open_list(kind='heap'):
+    """Open list by name ('heap', 'indexed', 'dary', 'radix') or factory."""
+    if callable(kind):
+        return kind()
+    try:
+        return OPEN_LISTS[kind]()
+    except KeyError:
+        raise ValueError(f"Unknown open list: {kind}")
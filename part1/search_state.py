@@ -0,0 +1,48 @@
+import threading
+from array import array
+
+NO_PARENT = -1
+
+
+class SearchTree:
+    """
+    Parent-pointer store for best-first search.
+
+    Every expanded node gets a record id. Open-list entries carry the id
+    of their parent record (a fixed-size int) instead of a copy of the
+    path, and the path is rebuilt once, when the goal is reached. Records
+    are never overwritten, so a rebuilt path is exactly the one that
+    produced the entry even if the node was re-expanded later.
+    """
+
+    def __init__(self, thread_safe=False):
+        self.nodes = []                 # record id -> node
+        self.parents = array('q')       # record id -> parent record id
+        self._lock = threading.Lock() if thread_safe else None
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def add(self, node, parent=NO_PARENT):
+        """Store an expansion of node reached from record parent; return its id."""
+        if self._lock is None:
+            self.nodes.append(node)
+            self.parents.append(parent)
+            return len(self.nodes) - 1
+        with self._lock:
+            self.nodes.append(node)
+            self.parents.append(parent)
+            return len(self.nodes) - 1
+
+    def path(self, record, last=None):
+        """
+        Walk parent pointers from record back to the root.
+        If last is given it is appended (e.g. a goal that was never expanded).
+        """
+        path = [] if last is None else [last]
+        nodes, parents = self.nodes, self.parents
+        while record != NO_PARENT:
+            path.append(nodes[record])
+            record = parents[record]
+        path.reverse()
+        return path
@@ -0,0 +1,101 @@
+import itertools
+import types
+import unittest
+from unittest import mock
+from part1 import algorithms
+from part1.algorithms import astar_anytime, WEIGHT_COST, WEIGHT_HOP
+from common.graph_fixtures import random_grid, weighted_dijkstra, score
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+    def _adj_cost(self, u, v):
+        return dict(self._adj[u])[v]
+
+GRID = dict(costs=(1, 1, 2, 5), keep=0.9)
+
+def manhattan_h(u, v, _):
+    return abs(u[0] - v[0]) + abs(u[1] - v[1])
+
+class TestAnytime(unittest.TestCase):
+    def test_0001_converges_to_optimum(self):
+        """Without a deadline the search ends at epsilon 1 with the optimal route."""
+        for seed in range(4):
+            g = SimpleGraph(random_grid(15, seed, **GRID))
+            optimum = weighted_dijkstra(g._adj, (0, 0), (14, 14))
+            stats = {}
+            path, fvec = astar_anytime((0, 0), (14, 14), g, manhattan_h, stats=stats)
+            if optimum is None:
+                self.assertIsNone(path)
+                continue
+            self.assertAlmostEqual(score(fvec), optimum)
+            self.assertEqual(stats['bound'], 1.0)
+            self.assertEqual(stats['epsilon'], 1.0)
+            self.assertEqual((path[0], path[-1]), ((0, 0), (14, 14)))
+
+    def test_0002_reported_bounds_hold(self):
+        """Every intermediate solution is within its reported bound and costs only drop."""
+        g = SimpleGraph(random_grid(25, 7, **GRID))
+        optimum = weighted_dijkstra(g._adj, (0, 0), (24, 24))
+        stats = {}
+        astar_anytime((0, 0), (24, 24), g, manhattan_h, epsilon=5.0, epsilon_step=1.0, stats=stats)
+        previous = float('inf')
+        for _, bound, cost, hop in stats['solutions']:
+            value = WEIGHT_COST * cost + WEIGHT_HOP * hop
+            self.assertLessEqual(value, bound * optimum + 1e-9)
+            self.assertLessEqual(value, previous)
+            previous = value
+
+    def test_0003_deadline_returns_first_solution(self):
+        g = SimpleGraph(random_grid(25, 7, **GRID))
+        optimum = weighted_dijkstra(g._adj, (0, 0), (24, 24))
+        stats = {}
+        path, fvec = astar_anytime((0, 0), (24, 24), g, manhattan_h, epsilon=5.0, time_limit=0.0, stats=stats)
+        self.assertEqual(path[-1], (24, 24))
+        self.assertEqual(stats['iterations'], 1)
+        self.assertGreaterEqual(stats['bound'], 1.0)
+        self.assertLessEqual(score(fvec), stats['bound'] * optimum + 1e-9)
+
+    def test_0004_unreachable(self):
+        g = SimpleGraph({(0, 0): [((0, 1), 1)], (0, 1): [], (3, 3): []})
+        self.assertEqual(astar_anytime((0, 0), (3, 3), g, manhattan_h), (None, None))
+
+    def test_0005_objective_matches_returned_path(self):
+        """Under short deadlines the reported [cost, hop] is that of the returned path."""
+        for size, seed, time_limit in [(15, 7, 0.0), (20, 3, 0.0), (20, 17, 0.0), (40, 3, 0.005), (15, 7, None)]:
+            g = SimpleGraph(random_grid(size, seed, **GRID))
+            stats = {}
+            path, fvec = astar_anytime((0, 0), (size - 1, size - 1), g, manhattan_h, epsilon=3.0,
+                                       epsilon_step=0.5, time_limit=time_limit, stats=stats)
+            walked = sum(g._adj_cost(u, v) for u, v in zip(path, path[1:]))
+            self.assertEqual(fvec, [walked, len(path) - 1])
+            _, _, cost, hop = stats['solutions'][-1]
+            self.assertEqual([cost, hop], fvec)
+
+
+    def test_0006_interrupted_iteration_not_reported(self):
+        """A deadline hit inside the second iteration leaves epsilon at the first one's value."""
+        g = SimpleGraph(random_grid(120, 0, **GRID))
+        # each clock read advances one second: the first iteration never checks the
+        # deadline, the second one reads the clock every 64 expansions and stops
+        clock = types.SimpleNamespace(perf_counter=itertools.count().__next__)
+        stats = {}
+        with mock.patch.object(algorithms, 'time', clock):
+            path, fvec = astar_anytime((0, 0), (119, 119), g, manhattan_h, epsilon=3.0, epsilon_step=0.5,
+                                       time_limit=5, stats=stats)
+        self.assertEqual(stats['iterations'], 1)
+        self.assertEqual(stats['epsilon'], 3.0)
+        self.assertGreaterEqual(stats['bound'], 1.0)
+        self.assertEqual(path[-1], (119, 119))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
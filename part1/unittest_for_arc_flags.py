@@ -0,0 +1,100 @@
+import os
+import pickle
+import random
+import tempfile
+import unittest
+import warnings
+from unittest import mock
+
+import numpy as np
+
+import common.common as common
+from part1.algorithms import astar_solver, astar_csr
+from part1.arc_flags import build_arc_flags, load_arc_flags, partition_cells
+from part1.graph_csr import compile_csr
+from common.graph_fixtures import random_grid
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+        self.nodes = {u: {'x': u[0], 'y': u[1]} for u in edges}
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+def manhattan_h(u, v, graph):
+    ux, uy = u; vx, vy = v
+    return abs(ux - vx) + abs(uy - vy)
+
+class TestArcFlags(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.graph = SimpleGraph(random_grid(14, 5))
+        cls.csr = compile_csr(cls.graph)
+        cls.flags = build_arc_flags(cls.csr, k=6)
+
+    def test_0001_partition(self):
+        """k cells of near-equal size, each a coordinate box."""
+        cells = partition_cells(self.csr.xs, self.csr.ys, 6)
+        sizes = np.bincount(cells)
+        self.assertEqual(len(sizes), 6)
+        self.assertLessEqual(sizes.max() - sizes.min(), 2)
+        self.assertEqual(self.flags.flags.shape, (self.csr.num_edges, 1))
+
+    def test_0002_same_cost_fewer_expansions(self):
+        """Skipping unflagged edges keeps astar_csr optimal and prunes work."""
+        rnd = random.Random(1)
+        plain_total = flagged_total = 0
+        for _ in range(25):
+            s, t = rnd.sample(list(self.graph.nodes), 2)
+            plain_stats, flagged_stats = {}, {}
+            plain = astar_csr(s, t, self.csr, stats=plain_stats)
+            flagged = astar_csr(s, t, self.csr, stats=flagged_stats, arc_flags=self.flags)
+            self.assertEqual(flagged[1] is None, plain[1] is None)
+            if plain[1] is not None:
+                self.assertAlmostEqual(0.6 * flagged[1][0] + 0.4 * flagged[1][1],
+                                       0.6 * plain[1][0] + 0.4 * plain[1][1])
+                self.assertEqual((flagged[0][0], flagged[0][-1]), (s, t))
+            plain_total += plain_stats['expansions']
+            flagged_total += flagged_stats['expansions']
+        self.assertLess(flagged_total, plain_total)
+
+    def test_0003_astar_solver_with_flags(self):
+        expected = astar_solver((0, 0), (13, 12), self.graph, manhattan_h)
+        path, fvec = astar_solver((0, 0), (13, 12), self.graph, manhattan_h, arc_flags=self.flags)
+        self.assertEqual(path[-1], (13, 12))
+        self.assertAlmostEqual(0.6 * fvec[0] + 0.4 * fvec[1], 0.6 * expected[1][0] + 0.4 * expected[1][1])
+
+    def test_0004_persisted_next_to_map(self):
+        with tempfile.TemporaryDirectory() as maps_dir, \
+                mock.patch.object(common, 'MAPS_DIR', maps_dir):
+            with open(common.map_pickle_path('Test City'), 'wb') as f:
+                pickle.dump(self.graph._adj, f)
+            first = load_arc_flags('Test City', self.csr, k=4)
+            self.assertTrue(os.path.isfile(common.map_artifact_path('Test City', 'arcflags')))
+            with mock.patch('part1.arc_flags.build_arc_flags') as build:
+                again = load_arc_flags('Test City', self.csr, k=4)
+                build.assert_not_called()
+            self.assertTrue(np.array_equal(again.flags, first.flags))
+            with mock.patch('part1.arc_flags.build_arc_flags', return_value=first) as build:
+                load_arc_flags('Test City', self.csr, k=6)
+                build.assert_called_once()
+
+    def test_0005_unreachable_arcs_raise_no_warning(self):
+        """Arcs that cannot reach a boundary node are left unflagged without inf - inf warnings."""
+        edges = dict(self.graph._adj)
+        edges[(20, 20)] = [((21, 20), 1)]
+        edges[(21, 20)] = [((20, 20), 1)]
+        csr = compile_csr(SimpleGraph(edges))
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            flags = build_arc_flags(csr, k=6)
+        self.assertEqual(flags.flags.shape, (csr.num_edges, 1))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
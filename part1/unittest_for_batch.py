@@ -0,0 +1,74 @@
+import unittest
+from part1.algorithms import astar_bidirectional
+from part1.batch import one_to_many, route_pairs, distance_matrix
+from part1.graph_csr import compile_csr
+from common.graph_fixtures import random_grid, score
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+        self.nodes = {u: {} for u in edges}
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+    def reverse(self, copy=True):
+        rev = {u: [] for u in self._adj}
+        for u, nbrs in self._adj.items():
+            for v, cost in nbrs:
+                rev[v].append((u, cost))
+        return SimpleGraph(rev)
+
+def zero_h(u, v, _):
+    return 0
+
+class TestBatchRouting(unittest.TestCase):
+    def setUp(self):
+        self.graph = SimpleGraph(random_grid(10, 4))
+        self.csr = compile_csr(self.graph)
+
+    def test_0001_one_to_many_matches_single_queries(self):
+        targets = [(9, 9), (0, 9), (5, 5), (0, 0)]
+        results = one_to_many((0, 0), targets, self.csr)
+        for t in targets:
+            path, fvec = results[t]
+            expected = astar_bidirectional((0, 0), t, self.graph, zero_h)
+            self.assertEqual((path[0], path[-1]), ((0, 0), t))
+            self.assertAlmostEqual(score(fvec), score(expected[1]))
+
+    def test_0002_route_pairs_shares_searches(self):
+        """Pairs with the same source are answered from one search, in input order."""
+        pairs = [((0, 0), (9, 9)), ((3, 3), (0, 0)), ((0, 0), (2, 7)), ((0, 0), (9, 9))]
+        stats = {}
+        results = route_pairs(pairs, self.csr, stats=stats)
+        self.assertEqual(stats['searches'], 2)
+        self.assertEqual(len(results), 4)
+        for (s, t), (path, fvec) in zip(pairs, results):
+            self.assertEqual((path[0], path[-1]), (s, t))
+        self.assertEqual(results[0], results[3])
+
+    def test_0003_unreachable_and_unknown(self):
+        g = SimpleGraph({'A':[('B',1)], 'B':[], 'G':[]})
+        results = route_pairs([('A', 'B'), ('A', 'G'), ('A', 'nowhere')], compile_csr(g))
+        self.assertEqual(results[0], (['A', 'B'], [1.0, 1]))
+        self.assertEqual(results[1], (None, None))
+        self.assertEqual(results[2], (None, None))
+
+    def test_0004_distance_matrix(self):
+        sources = [(0, 0), (9, 9), (0, 0)]
+        targets = [(4, 4), (9, 0)]
+        matrix = distance_matrix(sources, targets, self.csr)
+        self.assertEqual(len(matrix), 3)
+        self.assertEqual(matrix[0], matrix[2])
+        for i, s in enumerate(sources):
+            for j, t in enumerate(targets):
+                expected = astar_bidirectional(s, t, self.graph, zero_h)[1]
+                self.assertAlmostEqual(score(matrix[i][j]), score(expected))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
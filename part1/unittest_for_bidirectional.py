@@ -0,0 +1,82 @@
+import math
+import unittest
+from part1.algorithms import astar_bidirectional, WEIGHT_COST, WEIGHT_HOP
+from common.graph_fixtures import GRID_MOVES, random_grid, weighted_dijkstra
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+    def reverse(self, copy=True):
+        rev = {u: [] for u in self._adj}
+        for u, nbrs in self._adj.items():
+            for v, cost in nbrs:
+                rev.setdefault(v, []).append((u, cost))
+        return SimpleGraph(rev)
+
+def zero_h(u, v, _):
+    return 0
+
+def euclid_h(u, v, _):
+    return math.hypot(u[0] - v[0], u[1] - v[1])
+
+def path_score(graph, path):
+    cost = sum(dict(graph._adj[u])[v] for u, v in zip(path, path[1:]))
+    return cost, len(path) - 1
+
+
+class TestBidirectional(unittest.TestCase):
+    def test_0001_chain(self):
+        """Straight line A→B→C"""
+        g = SimpleGraph({'A':[('B',1)], 'B':[('C',1)], 'C':[]})
+        path, fvec = astar_bidirectional('A', 'C', g, zero_h)
+        self.assertEqual(path, ['A', 'B', 'C'])
+        self.assertEqual(fvec, [2, 2])
+
+    def test_0002_fewer_hops(self):
+        """Same cost, A->X->D has fewer hops."""
+        g = SimpleGraph({
+            'A': [('X',1), ('B',1)],
+            'X': [('D',2)],
+            'B': [('C',1)],
+            'C': [('D',1)],
+            'D': []
+        })
+        path, fvec = astar_bidirectional('A', 'D', g, zero_h)
+        self.assertEqual(path, ['A', 'X', 'D'])
+        self.assertEqual(fvec, [3, 2])
+
+    def test_0003_no_path(self):
+        """No path available => (None,None)"""
+        g = SimpleGraph({'A':[('B',1)], 'B':[], 'G':[]})
+        self.assertEqual(astar_bidirectional('A', 'G', g, zero_h), (None, None))
+
+    def test_0004_start_is_goal(self):
+        g = SimpleGraph({'A':[('B',1)], 'B':[]})
+        self.assertEqual(astar_bidirectional('A', 'A', g, zero_h), (['A'], [0.0, 0]))
+
+    def test_0005_optimal_on_random_grids(self):
+        """Weighted score matches a reference Dijkstra, with and without heuristic."""
+        for seed in range(8):
+            g = SimpleGraph(random_grid(15, seed, costs=(1, 1.5, 2), keep=0.9, moves=GRID_MOVES + ((1, 1),)))
+            rev = g.reverse()
+            expected = weighted_dijkstra(g._adj, (0, 0), (14, 9))
+            for h in (zero_h, euclid_h):
+                path, fvec = astar_bidirectional((0, 0), (14, 9), g, h, reverse_graph=rev)
+                self.assertEqual(path[0], (0, 0))
+                self.assertEqual(path[-1], (14, 9))
+                self.assertAlmostEqual(WEIGHT_COST * fvec[0] + WEIGHT_HOP * fvec[1], expected)
+                cost, hop = path_score(g, path)
+                self.assertAlmostEqual(cost, fvec[0])
+                self.assertEqual(hop, fvec[1])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,94 @@
+import os
+import pickle
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import common.common as common
+from part1.algorithms import WEIGHT_COST, WEIGHT_HOP
+from part1.contraction import (
+    ContractionHierarchy,
+    build_contraction_hierarchy,
+    load_contraction_hierarchy,
+)
+from part1.graph_csr import compile_csr
+from common.graph_fixtures import random_grid, weighted_dijkstra
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+        self.nodes = {u: {} for u in edges}
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+GRID = dict(costs=(1, 2, 3, 5))
+
+def check_path(test, graph, path, fvec):
+    cost = 0
+    for u, v in zip(path, path[1:]):
+        lengths = [c for w, c in graph._adj[u] if w == v]
+        test.assertTrue(lengths, f"{u} -> {v} is not an edge")
+        cost += min(lengths)
+    test.assertAlmostEqual(cost, fvec[0])
+    test.assertEqual(len(path) - 1, fvec[1])
+
+
+class TestContractionHierarchy(unittest.TestCase):
+    def test_0001_chain_and_hops(self):
+        """Same cost, A->X->D has fewer hops; unreachable => (None, None)."""
+        g = SimpleGraph({
+            'A': [('X',1), ('B',1)],
+            'X': [('D',2)],
+            'B': [('C',1)],
+            'C': [('D',1)],
+            'D': [],
+            'G': []
+        })
+        ch = build_contraction_hierarchy(compile_csr(g))
+        self.assertEqual(ch.query('A', 'D'), (['A', 'X', 'D'], [3.0, 2]))
+        self.assertEqual(ch.query('A', 'G'), (None, None))
+        self.assertEqual(ch.query('A', 'A'), (['A'], [0.0, 0]))
+
+    def test_0002_matches_dijkstra(self):
+        """Unpacked paths are real edge sequences with the optimal weighted score."""
+        rnd = random.Random(11)
+        for seed in range(4):
+            g = SimpleGraph(random_grid(9, seed, **GRID))
+            ch = build_contraction_hierarchy(compile_csr(g))
+            for _ in range(15):
+                s = (rnd.randrange(9), rnd.randrange(9))
+                t = (rnd.randrange(9), rnd.randrange(9))
+                expected = weighted_dijkstra(g._adj, s, t)
+                path, fvec = ch.query(s, t)
+                if expected is None:
+                    self.assertIsNone(path)
+                    continue
+                self.assertEqual((path[0], path[-1]), (s, t))
+                check_path(self, g, path, fvec)
+                self.assertAlmostEqual(WEIGHT_COST * fvec[0] + WEIGHT_HOP * fvec[1], expected)
+
+    def test_0003_persistence(self):
+        """The hierarchy is stored next to the map and reloaded without rebuilding."""
+        g = SimpleGraph(random_grid(6, 5, **GRID))
+        csr = compile_csr(g)
+        with tempfile.TemporaryDirectory() as maps_dir, \
+                mock.patch.object(common, 'MAPS_DIR', maps_dir):
+            with open(common.map_pickle_path('Test City'), 'wb') as f:
+                pickle.dump(g._adj, f)
+            built = load_contraction_hierarchy('Test City', csr)
+            self.assertTrue(os.path.isfile(common.map_artifact_path('Test City', 'ch')))
+            with mock.patch('part1.contraction.build_contraction_hierarchy') as build:
+                loaded = load_contraction_hierarchy('Test City', csr)
+                build.assert_not_called()
+            self.assertIsInstance(loaded, ContractionHierarchy)
+            self.assertEqual(loaded.query((0, 0), (5, 5)), built.query((0, 0), (5, 5)))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,90 @@
+import unittest
+from part1.algorithms import astar_solver, astar_csr
+from part1.graph_csr import compile_csr
+from common.graph_fixtures import blocked_grid
+
+class SimpleGraph:
+    """
+    Adjacency-based graph for unit testing, with a networkx-like `nodes`
+    mapping so it can be compiled to CSR. Tuple nodes get x/y coordinates.
+    """
+    def __init__(self, edges):
+        self._adj = edges
+        self.nodes = {u: ({'x': u[0], 'y': u[1]} if isinstance(u, tuple) else {})
+                      for u in edges}
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+
+def zero_h(u, v, _):
+    return 0
+
+def manhattan_h(u, v, graph):
+    ux, uy = u; vx, vy = v
+    return abs(ux - vx) + abs(uy - vy)
+
+def csr_manhattan_h(u, v, csr):
+    return abs(csr.xs[u] - csr.xs[v]) + abs(csr.ys[u] - csr.ys[v])
+
+class TestCSRGraph(unittest.TestCase):
+    def test_0001_compile_layout(self):
+        """Dense ids, offsets and lengths mirror the adjacency."""
+        g = SimpleGraph({'A':[('B',1),('C',4)], 'B':[('C',2)], 'C':[]})
+        csr = compile_csr(g)
+        self.assertEqual(csr.num_nodes, 3)
+        self.assertEqual(csr.num_edges, 3)
+        a, b, c = csr.to_dense(['A', 'B', 'C'])
+        self.assertEqual(sorted(csr.edges(a)), sorted([(b, 1.0), (c, 4.0)]))
+        self.assertEqual(list(csr.neighbors(c)), [])
+        self.assertEqual(csr.to_osm([a, b, c]), ['A', 'B', 'C'])
+
+    def test_0002_reverse(self):
+        """reverse() flips every edge and keeps the lengths."""
+        g = SimpleGraph({'A':[('B',1),('C',4)], 'B':[('C',2)], 'C':[]})
+        csr = compile_csr(g)
+        rev = csr.reverse()
+        a, b, c = csr.to_dense(['A', 'B', 'C'])
+        self.assertEqual(sorted(rev.edges(c)), sorted([(a, 4.0), (b, 2.0)]))
+        self.assertEqual(list(rev.neighbors(a)), [])
+        self.assertIs(rev.reverse(), csr)
+
+    def test_0003_matches_astar_solver(self):
+        """astar_csr returns the same result as astar_solver on a walled grid."""
+        blocked = {(5, y) for y in range(10) if y != 5} | {(7, y) for y in range(10) if y != 3}
+        g = SimpleGraph(blocked_grid(10, blocked))
+        csr = compile_csr(g)
+        expected = astar_solver((0, 0), (9, 9), g, manhattan_h)
+        path, fvec = astar_csr((0, 0), (9, 9), csr, csr_manhattan_h)
+        self.assertEqual(fvec, expected[1])
+        self.assertEqual(path[0], (0, 0))
+        self.assertEqual(path[-1], (9, 9))
+        self.assertIn((5, 5), path)
+        self.assertIn((7, 3), path)
+
+    def test_0004_hop_preference(self):
+        """Same cost, fewer hops wins (A->X->D)."""
+        g = SimpleGraph({
+            'A': [('X',1), ('B',1)],
+            'X': [('D',2)],
+            'B': [('C',1)],
+            'C': [('D',1)],
+            'D': []
+        })
+        path, fvec = astar_csr('A', 'D', compile_csr(g), zero_h)
+        self.assertEqual(path, ['A', 'X', 'D'])
+        self.assertEqual(fvec, [3, 2])
+
+    def test_0005_no_path(self):
+        """No path available => (None,None)"""
+        g = SimpleGraph({'A':[('B',1)], 'B':[], 'G':[]})
+        path, fvec = astar_csr('A', 'G', compile_csr(g), zero_h)
+        self.assertIsNone(path)
+        self.assertIsNone(fvec)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,56 @@
+import unittest
+from part1.algorithms import astar_solver, astar_csr
+from part1.graph_csr import compile_csr
+from common.graph_fixtures import random_grid
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+        self.nodes = {u: {'x': u[0], 'y': u[1]} for u in edges}
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+GRID = dict(costs=(1, 1, 2, 3), keep=1)
+
+def manhattan_h(u, v, graph):
+    ux, uy = u; vx, vy = v
+    return abs(ux - vx) + abs(uy - vy)
+
+class TestEarlyExit(unittest.TestCase):
+    def test_0001_same_result_as_full_drain(self):
+        """Bound-based termination returns the exhaustive search result."""
+        for seed in range(5):
+            g = SimpleGraph(random_grid(12, seed, **GRID))
+            full = astar_solver((0, 0), (11, 11), g, manhattan_h, early_exit=False)
+            fast = astar_solver((0, 0), (11, 11), g, manhattan_h)
+            self.assertEqual(fast[1], full[1])
+
+    def test_0002_short_pair_saves_expansions(self):
+        """A short query stops long before the reachable graph is exhausted."""
+        g = SimpleGraph(random_grid(20, 7, **GRID))
+        full_stats, fast_stats = {}, {}
+        astar_solver((5, 5), (6, 6), g, manhattan_h, early_exit=False, stats=full_stats)
+        astar_solver((5, 5), (6, 6), g, manhattan_h, stats=fast_stats)
+        self.assertEqual(full_stats['open_left'], 0)
+        self.assertGreater(fast_stats['open_left'], 0)
+        self.assertLess(fast_stats['expansions'] * 10, full_stats['expansions'])
+
+    def test_0003_csr_same_result(self):
+        """astar_csr terminates on the same bound."""
+        g = SimpleGraph(random_grid(12, 3, **GRID))
+        csr = compile_csr(g)
+        h = lambda u, v, c: abs(c.xs[u] - c.xs[v]) + abs(c.ys[u] - c.ys[v])
+        full = astar_csr((0, 0), (11, 11), csr, h, early_exit=False)
+        stats = {}
+        fast = astar_csr((0, 0), (11, 11), csr, h, stats=stats)
+        self.assertEqual(fast[1], full[1])
+        self.assertIn('expansions', stats)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,79 @@
+import math
+import random
+import unittest
+from part1.incremental import IncrementalPlanner
+from common.graph_fixtures import random_grid, weighted_dijkstra, score
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+    def reverse(self, copy=True):
+        rev = {u: [] for u in self._adj}
+        for u, nbrs in self._adj.items():
+            for v, cost in nbrs:
+                rev.setdefault(v, []).append((u, cost))
+        return SimpleGraph(rev)
+
+GRID = dict(costs=(1, 1, 2, 3), keep=1)
+
+def manhattan_h(u, v, _):
+    return abs(u[0] - v[0]) + abs(u[1] - v[1])
+
+class TestIncrementalPlanner(unittest.TestCase):
+    def test_0001_replan_matches_fresh_search(self):
+        """After every batch of updates the repaired route is optimal."""
+        rnd = random.Random(3)
+        graph = SimpleGraph(random_grid(12, 1, **GRID))
+        current = {u: dict(nbrs) for u, nbrs in graph._adj.items()}
+        planner = IncrementalPlanner((0, 0), (11, 11), graph, manhattan_h)
+        for _ in range(8):
+            path, fvec = planner.replan()
+            adj = {u: [(v, c) for v, c in nbrs.items() if c != math.inf] for u, nbrs in current.items()}
+            expected = weighted_dijkstra(adj, (0, 0), (11, 11))
+            if expected is None:
+                self.assertIsNone(path)
+            else:
+                self.assertAlmostEqual(score(fvec), expected)
+                self.assertEqual((path[0], path[-1]), ((0, 0), (11, 11)))
+                self.assertEqual(sum(current[u][v] for u, v in zip(path, path[1:])), fvec[0])
+            changes = {}
+            for _ in range(10):
+                u = (rnd.randrange(12), rnd.randrange(12))
+                v = rnd.choice(list(current[u]))
+                changes[(u, v)] = rnd.choice([1, 2, 5, 9, math.inf])
+            for (u, v), length in changes.items():
+                current[u][v] = length
+            planner.update_edges(changes)
+
+    def test_0002_local_change_is_cheap(self):
+        """Closing one edge on the route re-expands far fewer nodes than the first search."""
+        graph = SimpleGraph(random_grid(20, 2, **GRID))
+        planner = IncrementalPlanner((0, 0), (19, 19), graph, manhattan_h)
+        first_stats, repair_stats = {}, {}
+        path, _ = planner.replan(stats=first_stats)
+        u, v = path[-3], path[-2]
+        planner.update_edges([(u, v, math.inf)])
+        new_path, _ = planner.replan(stats=repair_stats)
+        self.assertNotIn((u, v), list(zip(new_path, new_path[1:])))
+        self.assertLess(repair_stats['expansions'], first_stats['expansions'])
+
+    def test_0003_closure_and_reopen(self):
+        graph = SimpleGraph({'A': [('B', 1)], 'B': [('C', 1)], 'C': []})
+        planner = IncrementalPlanner('A', 'C', graph, lambda u, v, g: 0)
+        self.assertEqual(planner.replan(), (['A', 'B', 'C'], [2, 2]))
+        planner.update_edges({('B', 'C'): math.inf})
+        self.assertEqual(planner.replan(), (None, None))
+        planner.update_edges({('B', 'C'): None})
+        self.assertEqual(planner.replan(), (['A', 'B', 'C'], [2, 2]))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,84 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+import common.common as common
+from part1.algorithms import astar_solver, astar_csr
+from part1.graph_csr import compile_csr, dijkstra
+from part1.landmarks import build_landmarks, load_landmarks
+from part3.algorithms import astar_parallel
+from common.graph_fixtures import random_grid
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+        self.nodes = {u: {'x': u[0], 'y': u[1]} for u in edges}
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+def zero_h(u, v, _):
+    return 0
+
+class TestLandmarks(unittest.TestCase):
+    def setUp(self):
+        self.graph = SimpleGraph(random_grid(14, 3))
+        self.csr = compile_csr(self.graph)
+
+    def test_0001_bounds_are_admissible(self):
+        """h(u, t) never exceeds the true distance, for both selection methods."""
+        for method in ('farthest', 'avoid'):
+            lm = build_landmarks(self.csr, k=4, method=method)
+            self.assertEqual(len(set(lm.landmarks)), 4)
+            for t in (0, 57, 150):
+                true_dist, _ = dijkstra(self.csr.reverse(), t)
+                row = lm.goal_row(t)
+                for u in range(self.csr.num_nodes):
+                    self.assertLessEqual(row[u], true_dist[u] + 1e-9)
+
+    def test_0002_same_cost_fewer_expansions(self):
+        """ALT keeps astar_solver optimal and expands fewer nodes than h=0."""
+        lm = build_landmarks(self.csr, k=6)
+        base, alt = {}, {}
+        expected = astar_solver((0, 0), (13, 12), self.graph, zero_h, stats=base)
+        result = astar_solver((0, 0), (13, 12), self.graph, lm, stats=alt)
+        self.assertEqual(result[1], expected[1])
+        self.assertLess(alt['expansions'], base['expansions'])
+        dense = astar_csr((0, 0), (13, 12), self.csr, lm.dense_h)
+        self.assertEqual(dense[1], expected[1])
+
+    def test_0003_usable_by_astar_parallel(self):
+        lm = build_landmarks(self.csr, k=4)
+        expected = astar_solver((0, 0), (13, 12), self.graph, zero_h)
+        path, fvec = astar_parallel((0, 0), (13, 12), self.graph, lm, None, "FineGrain", 1)
+        self.assertEqual(path[0], (0, 0))
+        self.assertEqual(path[-1], (13, 12))
+        self.assertEqual(fvec[0], expected[1][0])
+
+    def test_0004_persisted_next_to_map(self):
+        """Tables are stored once per map version and rebuilt when the map changes."""
+        with tempfile.TemporaryDirectory() as maps_dir, \
+                mock.patch.object(common, 'MAPS_DIR', maps_dir):
+            with open(common.map_pickle_path('Test City'), 'wb') as f:
+                pickle.dump(self.graph._adj, f)
+            first = load_landmarks('Test City', self.csr, k=3)
+            self.assertTrue(os.path.isfile(common.map_artifact_path('Test City', 'alt')))
+            with mock.patch('part1.landmarks.build_landmarks') as build:
+                again = load_landmarks('Test City', self.csr, k=3)
+                build.assert_not_called()
+            self.assertEqual(again.landmarks, first.landmarks)
+            with open(common.map_pickle_path('Test City'), 'ab') as f:
+                f.write(b'changed')
+            with mock.patch('part1.landmarks.build_landmarks', return_value=first) as build:
+                load_landmarks('Test City', self.csr, k=3)
+                build.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
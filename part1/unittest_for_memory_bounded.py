@@ -0,0 +1,113 @@
+import math
+import time
+import unittest
+from part1.algorithms import astar_bounded
+from common.graph_fixtures import random_grid, random_digraph, weighted_dijkstra, score
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+GRID = dict(costs=(1, 1, 2, 5), keep=0.9)
+
+def manhattan_h(u, v, _):
+    return abs(u[0] - v[0]) + abs(u[1] - v[1])
+
+def euclid_h(u, v, graph):
+    return math.dist(graph.coords[u], graph.coords[v])
+
+class TestMemoryBounded(unittest.TestCase):
+    def test_0001_large_budget_is_plain_astar(self):
+        g = SimpleGraph(random_grid(15, 1, **GRID))
+        stats = {}
+        path, fvec = astar_bounded((0, 0), (14, 14), g, manhattan_h, stats=stats)
+        self.assertAlmostEqual(score(fvec), weighted_dijkstra(g._adj, (0, 0), (14, 14)))
+        self.assertEqual(stats['forgotten'], 0)
+        self.assertEqual(stats['regenerations'], 0)
+
+    def test_0002_small_budget_stays_optimal(self):
+        """Forgetting and regenerating nodes keeps the route optimal within the budget."""
+        for seed in range(4):
+            g = SimpleGraph(random_grid(20, seed, **GRID))
+            optimum = weighted_dijkstra(g._adj, (0, 0), (19, 19))
+            if optimum is None:
+                continue
+            stats = {}
+            path, fvec = astar_bounded((0, 0), (19, 19), g, manhattan_h, max_nodes=250, stats=stats)
+            self.assertAlmostEqual(score(fvec), optimum)
+            self.assertEqual((path[0], path[-1]), ((0, 0), (19, 19)))
+            self.assertGreater(stats['forgotten'], 0)
+            self.assertLessEqual(stats['peak_nodes'], 250)
+
+    def test_0003_peak_memory_reported(self):
+        g = SimpleGraph(random_grid(30, 5, **GRID))
+        small, large = {}, {}
+        astar_bounded((0, 0), (29, 29), g, manhattan_h, max_nodes=600, stats=small, trace_memory=True)
+        astar_bounded((0, 0), (29, 29), g, manhattan_h, stats=large, trace_memory=True)
+        self.assertLess(small['peak_nodes'], large['peak_nodes'])
+        self.assertGreater(small['peak_bytes'], 0)
+
+    def test_0004_unreachable(self):
+        g = SimpleGraph({(0, 0): [((0, 1), 1)], (0, 1): [], (3, 3): []})
+        self.assertEqual(astar_bounded((0, 0), (3, 3), g, manhattan_h, max_nodes=2), (None, None))
+
+    def test_0005_tight_budget_terminates_optimal(self):
+        """Budgets a little above the 27-node solution path still finish, optimally."""
+        g = SimpleGraph(random_grid(14, 1, **GRID))
+        optimum = weighted_dijkstra(g._adj, (0, 0), (13, 13))
+        started = time.perf_counter()
+        path, fvec = astar_bounded((0, 0), (13, 13), g, manhattan_h, max_nodes=40)
+        self.assertLess(time.perf_counter() - started, 20.0)
+        self.assertEqual(len(path), 27)
+        self.assertAlmostEqual(score(fvec), optimum)
+        for seed in (3, 8):
+            g = SimpleGraph(random_grid(14, seed, **GRID))
+            optimum = weighted_dijkstra(g._adj, (0, 0), (13, 13))
+            stats = {}
+            started = time.perf_counter()
+            path, fvec = astar_bounded((0, 0), (13, 13), g, manhattan_h, max_nodes=60, stats=stats)
+            self.assertLess(time.perf_counter() - started, 20.0)
+            self.assertAlmostEqual(score(fvec), optimum)
+            self.assertFalse(stats['truncated'])
+            self.assertLessEqual(stats['peak_nodes'], 60)
+
+    def test_0006_expansion_cap(self):
+        """A budget far below what A* needs gives up at max_expansions instead of running on."""
+        g = SimpleGraph(random_grid(30, 0, **GRID))
+        stats = {}
+        started = time.perf_counter()
+        result = astar_bounded((0, 0), (29, 29), g, manhattan_h, max_nodes=150, stats=stats,
+                               max_expansions=5000)
+        self.assertLess(time.perf_counter() - started, 20.0)
+        self.assertEqual(result, (None, None))
+        self.assertTrue(stats['truncated'])
+        self.assertEqual(stats['expansions'], 5000)
+
+    def test_0007_budget_far_below_astar_memory(self):
+        """Budgets well above the route length but far below what A* stores never livelock."""
+        edges, coords = random_digraph(60, 194, 16)
+        g = SimpleGraph(edges)
+        g.coords = coords
+        for source in range(0, 60, 4):
+            for target in range(60):
+                optimum = weighted_dijkstra(g._adj, source, target)
+                if source == target or optimum is None:
+                    continue
+                stats = {}
+                path, fvec = astar_bounded(source, target, g, euclid_h, max_nodes=15, stats=stats,
+                                           max_expansions=200_000)
+                self.assertFalse(stats['truncated'], (source, target))
+                self.assertAlmostEqual(score(fvec), optimum)
+                self.assertEqual((path[0], path[-1]), (source, target))
+                self.assertLessEqual(stats['peak_nodes'], 15)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,84 @@
+import random
+import unittest
+from part1.algorithms import astar_solver, astar_csr
+from part1.graph_csr import compile_csr
+from part1.open_list import HeapQueue, IndexedHeap, RadixQueue, make_open_list
+from common.graph_fixtures import random_grid
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+        self.nodes = {u: {'x': u[0], 'y': u[1]} for u in edges}
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+def manhattan_h(u, v, graph):
+    ux, uy = u; vx, vy = v
+    return abs(ux - vx) + abs(uy - vy)
+
+class TestOpenLists(unittest.TestCase):
+    def test_0001_pop_order(self):
+        """Every queue pops keys in non-decreasing order."""
+        rnd = random.Random(0)
+        keys = [rnd.random() * 100 for _ in range(300)]
+        for queue in (HeapQueue(), IndexedHeap(), IndexedHeap(arity=4), RadixQueue(scale=1000)):
+            for i, key in enumerate(keys):
+                queue.push(key, i, None)
+            popped = [queue.pop()[0] for _ in range(len(keys))]
+            self.assertEqual(popped, sorted(keys))
+            self.assertEqual(len(queue), 0)
+            self.assertEqual(queue.stats()['max_size'], 300)
+
+    def test_0002_decrease_key(self):
+        q = IndexedHeap()
+        self.assertTrue(q.push(5.0, 'A', 'first'))
+        self.assertTrue(q.push(7.0, 'B', None))
+        self.assertFalse(q.push(6.0, 'A', 'worse'))
+        self.assertTrue(q.push(1.0, 'B', 'better'))
+        self.assertEqual(len(q), 2)
+        self.assertEqual(q.pop(), (1.0, 'B', 'better'))
+        self.assertEqual(q.pop(), (5.0, 'A', 'first'))
+        self.assertEqual(q.stats()['decrease_keys'], 1)
+        self.assertTrue(q.push(9.0, 'A', None))
+
+    def test_0003_radix_monotone(self):
+        q = RadixQueue(scale=10)
+        q.push(3.0, 'a')
+        q.push(float('inf'), 'z')
+        self.assertEqual(q.pop()[1], 'a')
+        q.push(1.0, 'late')
+        self.assertEqual(q.monotone_violations, 1)
+        self.assertEqual(q.pop()[1], 'late')
+        self.assertEqual(q.pop()[1], 'z')
+        with self.assertRaises(IndexError):
+            q.pop()
+
+    def test_0004_solvers_accept_every_queue(self):
+        """Same answer with every open list; indexed heaps keep the list smaller."""
+        g = SimpleGraph(random_grid(12, 2, costs=(1, 1, 2, 3), keep=1))
+        csr = compile_csr(g)
+        base_stats = {}
+        expected = astar_solver((0, 0), (11, 11), g, manhattan_h, stats=base_stats)
+        for kind in ('heap', 'indexed', 'dary', 'radix'):
+            stats = {}
+            path, fvec = astar_solver((0, 0), (11, 11), g, manhattan_h, stats=stats, open_list=kind)
+            self.assertAlmostEqual(fvec[0], expected[1][0])
+            self.assertEqual((path[0], path[-1]), ((0, 0), (11, 11)))
+            self.assertIn('pushes', stats)
+            if kind in ('indexed', 'dary'):
+                self.assertLessEqual(stats['max_size'], base_stats['max_size'])
+            path, fvec = astar_csr((0, 0), (11, 11), csr, open_list=kind)
+            self.assertEqual((path[0], path[-1]), ((0, 0), (11, 11)))
+
+    def test_0005_unknown_queue(self):
+        with self.assertRaises(ValueError):
+            make_open_list('fibonacci')
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,60 @@
+import unittest
+from part1.algorithms import astar_solver, astar_pareto
+from common.graph_fixtures import random_jump_grid, weighted_dijkstra
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+        self.nodes = {u: {'x': u[0], 'y': u[1]} for u in edges}
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+def manhattan_h(u, v, graph):
+    ux, uy = u; vx, vy = v
+    return abs(ux - vx) + abs(uy - vy)
+
+class TestPareto(unittest.TestCase):
+    def test_0001_front_is_non_dominated(self):
+        g = SimpleGraph(random_jump_grid(10, 1))
+        front = astar_pareto((0, 0), (9, 9), g, manhattan_h)
+        self.assertGreater(len(front), 1)
+        points = list(zip(front.costs, front.hops))
+        for a, b in zip(points, points[1:]):
+            self.assertLess(a[0], b[0])
+            self.assertGreater(a[1], b[1])
+        for path, (cost, hop) in front:
+            self.assertEqual((path[0], path[-1]), ((0, 0), (9, 9)))
+            self.assertEqual(len(path) - 1, hop)
+            self.assertEqual(sum(dict(g._adj[u])[v] for u, v in zip(path, path[1:])), cost)
+
+    def test_0002_any_weights_from_one_front(self):
+        """best(wc, wh) matches a fresh search on that weighted objective."""
+        for seed in range(3):
+            g = SimpleGraph(random_jump_grid(9, seed))
+            front = astar_pareto((0, 0), (8, 8), g, manhattan_h)
+            for wc, wh in [(0.6, 0.4), (1.0, 0.0), (0.0, 1.0), (0.2, 0.8), (0.9, 2.5)]:
+                _, (cost, hop) = front.best(wc, wh)
+                self.assertAlmostEqual(wc * cost + wh * hop, weighted_dijkstra(g._adj, (0, 0), (8, 8), wc, wh))
+
+    def test_0003_default_weights_match_astar_solver(self):
+        g = SimpleGraph(random_jump_grid(10, 4))
+        _, fvec = astar_solver((0, 0), (9, 9), g, manhattan_h)
+        _, best = astar_pareto((0, 0), (9, 9), g, manhattan_h).best()
+        self.assertAlmostEqual(0.6 * best[0] + 0.4 * best[1], 0.6 * fvec[0] + 0.4 * fvec[1])
+
+    def test_0004_unreachable(self):
+        g = SimpleGraph({(0, 0): [((0, 1), 1)], (0, 1): [], (5, 5): []})
+        stats = {}
+        front = astar_pareto((0, 0), (5, 5), g, manhattan_h, stats=stats)
+        self.assertEqual(len(front), 0)
+        self.assertEqual(front.best(), (None, None))
+        self.assertEqual(stats['front'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,52 @@
+import unittest
+from part1.algorithms import astar_solver
+from part1.search_state import SearchTree, NO_PARENT
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return {v: [{'length': cost}] for v, cost in self._adj.get(u, [])}
+
+def zero_h(u, v, _):
+    return 0
+
+
+class TestSearchTree(unittest.TestCase):
+    def test_0001_rebuild_path(self):
+        """Parent pointers are walked back to the root."""
+        tree = SearchTree()
+        a = tree.add('A')
+        b = tree.add('B', a)
+        c = tree.add('C', b)
+        self.assertEqual(tree.path(c), ['A', 'B', 'C'])
+        self.assertEqual(tree.path(b, 'G'), ['A', 'B', 'G'])
+        self.assertEqual(tree.path(NO_PARENT, 'G'), ['G'])
+
+    def test_0002_reexpansion_keeps_old_records(self):
+        """A node expanded twice gets two records; older paths stay intact."""
+        tree = SearchTree()
+        a = tree.add('A')
+        x1 = tree.add('X', a)
+        b = tree.add('B', a)
+        x2 = tree.add('X', b)
+        self.assertEqual(tree.path(x1), ['A', 'X'])
+        self.assertEqual(tree.path(x2), ['A', 'B', 'X'])
+        self.assertEqual(len(tree), 4)
+
+    def test_0003_long_chain(self):
+        """A 5000-node chain is solved and rebuilt in order."""
+        n = 5000
+        g = SimpleGraph({i: [(i + 1, 1)] for i in range(n)})
+        path, fvec = astar_solver(0, n, g, zero_h)
+        self.assertEqual(path, list(range(n + 1)))
+        self.assertEqual(fvec, [n, n])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,174 @@
+import bisect
+import math
+import threading
+from collections import deque
+
+MIN_DELTA = 64  # delta size that always fits before a compaction; above it the limit is sqrt(len(base))
+
+class Version:
+    """
+    One published, immutable state of a CopyOnWriteSet: the members are
+    (base - removed) | added. Small writes only copy the delta sets; the
+    base is rebuilt once the delta grows past the compaction threshold.
+    """
+    __slots__ = ('base', 'added', 'removed', 'size', 'epoch', '_sorted')
+
+    def __init__(self, base, added, removed, size, epoch):
+        self.base = base        # frozenset of normalized keys
+        self.added = added      # frozenset, disjoint from base
+        self.removed = removed  # frozenset, subset of base
+        self.size = size
+        self.epoch = epoch
+        self._sorted = None
+
+    def __contains__(self, key):
+        return key in self.added or (key in self.base and key not in self.removed)
+
+    def keys(self):
+        """Members as a sorted tuple, built on first use (racing builders produce equal tuples)."""
+        keys = self._sorted
+        if keys is None:
+            members = (self.base - self.removed) | self.added
+            keys = self._sorted = tuple(sorted(members))
+        return keys
+
+class CopyOnWriteSet:
+    """
+    Read-optimized set: readers never lock, writers publish new versions.
+
+    contains(), contains_many(), snapshot(), range(), __iter__ and len() read
+    the currently published Version once and answer from it, so each call
+    is linearizable at that read and never waits for a writer. Writers
+    append their operation to a pending queue and take the writer lock;
+    whoever holds it applies every queued operation (flat combining) and
+    publishes them as one new version, so a burst of concurrent writes
+    costs one copy of the delta sets instead of one per write. The delta is
+    folded into a new base once it outgrows max(min_delta, sqrt(n)), which
+    keeps both the per-publish copy and the amortized rebuild at O(sqrt(n)).
+
+    There is no epoch-based reclamation: publishing only swaps the
+    reference, and an old version is freed by CPython's reference counting
+    once the last reader holding it lets go. epoch is just a version
+    counter, bumped on every publish.
+
+    add_all() and remove_all() enqueue their whole batch while holding the
+    writer lock, so no combiner can publish part of it; the batch lands in
+    one version (possibly together with other queued writes).
+
+    Same add/remove/contains API and equality as FineGrainedSet; keys come
+    back normalized (scalars as 1-tuples).
+    """
+
+    def __init__(self, min_delta=MIN_DELTA):
+        self.min_delta = min_delta
+        self._version = Version(frozenset(), frozenset(), frozenset(), 0, 0)
+        self._pending = deque()              # [op, key, result] records, result None until applied
+        self._write_lock = threading.Lock()
+        self.compactions = 0
+
+    def _key(self, val):
+        # same equality as _compare in the list-based sets
+        return val if isinstance(val, tuple) else (val,)
+
+    @property
+    def epoch(self):
+        return self._version.epoch
+
+    def _combine(self):
+        """
+        Apply every queued write to a copy of the current delta and publish
+        the result as one version. Caller holds the writer lock.
+        """
+        records = []
+        while self._pending:
+            records.append(self._pending.popleft())
+        if not records:
+            return
+        version = self._version
+        base = version.base
+        added = set(version.added)
+        removed = set(version.removed)
+        size = version.size
+        for record in records:
+            op, key = record[0], record[1]
+            present = key in added or (key in base and key not in removed)
+            if op == 'add':
+                record[2] = not present
+                if not present:
+                    if key in removed:
+                        removed.discard(key)
+                    else:
+                        added.add(key)
+                    size += 1
+            else:
+                record[2] = present
+                if present:
+                    if key in added:
+                        added.discard(key)
+                    else:
+                        removed.add(key)
+                    size -= 1
+        if len(added) + len(removed) > max(self.min_delta, math.isqrt(len(base))):
+            base = (base - removed) | added
+            added, removed = set(), set()
+            self.compactions += 1
+        self._version = Version(base, frozenset(added), frozenset(removed), size, version.epoch + 1)
+
+    def _write(self, records):
+        if len(records) > 1:
+            # a combiner only drains under the lock, so it sees all of the batch or none
+            with self._write_lock:
+                self._pending.extend(records)
+                self._combine()
+            return [record[2] for record in records]
+        self._pending.extend(records)
+        with self._write_lock:
+            if any(record[2] is None for record in records):
+                self._combine()
+        return [record[2] for record in records]
+
+    def add(self, val) -> bool:
+        return self._write([['add', self._key(val), None]])[0]
+
+    def remove(self, val) -> bool:
+        return self._write([['remove', self._key(val), None]])[0]
+
+    def contains(self, val) -> bool:
+        return self._key(val) in self._version
+
+    def add_all(self, vals):
+        """Add every value, published as one version; per-element results like add()."""
+        if not vals:
+            return []
+        return self._write([['add', self._key(v), None] for v in vals])
+
+    def remove_all(self, vals):
+        """Remove every value, published as one version; per-element results like remove()."""
+        if not vals:
+            return []
+        return self._write([['remove', self._key(v), None] for v in vals])
+
+    def contains_many(self, vals):
+        """Membership of every value in the same version."""
+        version = self._version
+        return [self._key(v) in version for v in vals]
+
+    def __len__(self):
+        return self._version.size
+
+    def __iter__(self):
+        return iter(self._version.keys())
+
+    def range(self, lo=None, hi=None):
+        """
+        Sorted keys k with lo <= k < hi (None leaves that side open), by
+        bisection in the sorted keys of one version.
+        """
+        keys = self._version.keys()
+        start = 0 if lo is None else bisect.bisect_left(keys, self._key(lo))
+        end = len(keys) if hi is None else bisect.bisect_left(keys, self._key(hi))
+        return list(keys[start:end])
+
+    def snapshot(self):
+        """Every key of the current version, sorted."""
+        return list(self._version.keys())
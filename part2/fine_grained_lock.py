@@ -1,68 +1,217 @@
 import threading
 
+from part2.thread_counter import ThreadCounter
+
 class Node:
+    __slots__ = ('val', 'next', 'lock')
+
     def __init__(self, val):
-        self.val = val  # giá trị (giả sử là tuple như (x, y))
+        self.val = val  # normalized key: always a tuple (scalars are wrapped once on insert)
         self.next = None
         self.lock = threading.Lock()
 
 class FineGrainedSet:
+    """
+    Linked-list set with hand-over-hand (lock coupling) traversal.
+
+    Operations never restart, so retries stays 0; lock_waits counts lock
+    acquisitions that found the lock held, the contention that
+    OptimisticSet pays for in retries instead. It is kept per thread
+    (see part2.thread_counter), so counting adds no shared lock to the
+    contended path.
+
+    snapshot() and range() walk hand-over-hand like any operation, so they
+    are linearizable at the moment head is locked: updates that locked head
+    earlier stay ahead of the scan and are seen, later ones stay behind it.
+    __iter__ reads next pointers without locks (weakly consistent: keys in
+    increasing order, every key present throughout is yielded, none absent
+    throughout is). len() is an O(1) counter, exact when no update is in
+    flight. Keys come back normalized (scalars as 1-tuples).
+
+    Nodes use __slots__ and store the key already normalized to a tuple;
+    the sentinels are recognized by identity, so a traversal step is a
+    single tuple comparison. Each node keeps its own lock: hand-over-hand
+    holds prev while waiting for curr, and with a shared lock table two
+    threads could wait on each other's stripes out of list order.
+    """
+
     def __init__(self):
         # Sentinel nodes for -∞ and +∞
         self.head = Node(('HEAD',))
         self.tail = Node(('TAIL',))
         self.head.next = self.tail
+        self.retries = 0
+        self._lock_waits = ThreadCounter()
+        self._size = 0
+        self._size_lock = threading.Lock()  # only taken by successful updates
 
-    def _compare(self, a, b):
-        if a == ('HEAD',): return -1
-        if b == ('TAIL',): return -1
-        if a == ('TAIL',): return 1
-        if b == ('HEAD',): return 1
-
+    def _key(self, val):
         # Convert scalars to tuple to unify comparison
-        if not isinstance(a, tuple):
-            a = (a,)
-        if not isinstance(b, tuple):
-            b = (b,)
+        return val if isinstance(val, tuple) else (val,)
+
+    def _batch(self, vals):
+        """
+        Normalized keys of vals with their input positions, sorted by key
+        (stable, so duplicates are applied in input order).
+        """
+        keyed = [(self._key(v), i) for i, v in enumerate(vals)]
+        keyed.sort(key=lambda item: item[0])
+        return keyed
+
+    def _add_size(self, delta):
+        with self._size_lock:
+            self._size += delta
 
-        return (a > b) - (a < b)
+    @property
+    def lock_waits(self):
+        return self._lock_waits.value
 
-    def _find(self, val):
+    def _lock(self, node):
+        if not node.lock.acquire(blocking=False):
+            self._lock_waits.incr()
+            node.lock.acquire()
+
+    def _find(self, key):
+        tail = self.tail
         prev = self.head
-        prev.lock.acquire()
+        self._lock(prev)
         curr = prev.next
-        curr.lock.acquire()
-        while self._compare(curr.val, val) < 0:
+        self._lock(curr)
+        while curr is not tail and curr.val < key:
             prev.lock.release()
             prev, curr = curr, curr.next
-            curr.lock.acquire()
+            self._lock(curr)
         return prev, curr
 
     def add(self, val) -> bool:
-        prev, curr = self._find(val)
+        key = self._key(val)
+        prev, curr = self._find(key)
         added = False
-        if self._compare(curr.val, val) != 0:
-            node = Node(val)
+        if curr is self.tail or curr.val != key:
+            node = Node(key)
             node.next = curr
             prev.next = node
             added = True
+            self._add_size(1)
         curr.lock.release()
         prev.lock.release()
         return added
 
     def remove(self, val) -> bool:
-        prev, curr = self._find(val)
+        key = self._key(val)
+        prev, curr = self._find(key)
         removed = False
-        if self._compare(curr.val, val) == 0:
+        if curr is not self.tail and curr.val == key:
             prev.next = curr.next
             removed = True
+            self._add_size(-1)
         curr.lock.release()
         prev.lock.release()
         return removed
 
     def contains(self, val) -> bool:
-        prev, curr = self._find(val)
-        found = self._compare(curr.val, val) == 0
+        key = self._key(val)
+        prev, curr = self._find(key)
+        found = curr is not self.tail and curr.val == key
         curr.lock.release()
         prev.lock.release()
         return found
+
+    def _apply_batch(self, vals, op):
+        """
+        Apply op ('add', 'remove' or 'contains') to every value of vals in one
+        hand-over-hand pass over the list, visiting the keys in sorted order.
+        Returns a list of bools aligned with vals.
+        """
+        results = [False] * len(vals)
+        batch = self._batch(vals)
+        if not batch:
+            return results
+        tail = self.tail
+        prev = self.head
+        self._lock(prev)
+        curr = prev.next
+        self._lock(curr)
+        try:
+            for key, i in batch:
+                while curr is not tail and curr.val < key:
+                    prev.lock.release()
+                    prev, curr = curr, curr.next
+                    self._lock(curr)
+                found = curr is not tail and curr.val == key
+                if op == 'contains':
+                    results[i] = found
+                elif op == 'add':
+                    if not found:
+                        # the new node becomes curr; nobody can reach it past prev's lock
+                        node = Node(key)
+                        node.lock.acquire()
+                        node.next = curr
+                        prev.next = node
+                        curr.lock.release()
+                        curr = node
+                        results[i] = True
+                elif found:
+                    prev.next = curr.next
+                    curr.lock.release()
+                    curr = prev.next
+                    self._lock(curr)
+                    results[i] = True
+        finally:
+            curr.lock.release()
+            prev.lock.release()
+        if op != 'contains':
+            changed = sum(results)
+            self._add_size(changed if op == 'add' else -changed)
+        return results
+
+    def add_all(self, vals):
+        """Add every value; returns per-element results like add()."""
+        return self._apply_batch(vals, 'add')
+
+    def remove_all(self, vals):
+        """Remove every value; returns per-element results like remove()."""
+        return self._apply_batch(vals, 'remove')
+
+    def contains_many(self, vals):
+        """Membership of every value, from a single traversal."""
+        return self._apply_batch(vals, 'contains')
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        tail = self.tail
+        curr = self.head.next
+        while curr is not tail:
+            yield curr.val
+            curr = curr.next
+
+    def range(self, lo=None, hi=None):
+        """
+        Sorted keys k with lo <= k < hi (None leaves that side open), read in
+        one hand-over-hand pass; linearizable like any other operation.
+        """
+        lo = None if lo is None else self._key(lo)
+        hi = None if hi is None else self._key(hi)
+        tail = self.tail
+        keys = []
+        prev = self.head
+        self._lock(prev)
+        curr = prev.next
+        self._lock(curr)
+        try:
+            while curr is not tail and (hi is None or curr.val < hi):
+                if lo is None or curr.val >= lo:
+                    keys.append(curr.val)
+                prev.lock.release()
+                prev, curr = curr, curr.next
+                self._lock(curr)
+        finally:
+            curr.lock.release()
+            prev.lock.release()
+        return keys
+
+    def snapshot(self):
+        """Every key, sorted; linearizable (see range())."""
+        return self.range()
@@ -0,0 +1,208 @@
+import threading
+
+class Node:
+    def __init__(self, val):
+        self.val = val  # normalized key: always a tuple (scalars are wrapped once on insert)
+        self.next = None
+        self.marked = False  # logically deleted
+        self.lock = threading.Lock()
+
+class LazySet:
+    """
+    Linked-list set with lazy synchronization.
+
+    remove() first sets curr.marked (logical deletion) and then unlinks it
+    (physical deletion), both under the locks of prev and curr. Because a
+    node is always marked before it leaves the list, validation only needs
+    local checks: neither node is marked and prev.next is still curr.
+    contains() takes no locks: an unmarked node with the value reached by a
+    plain traversal was in the set at some point during the call.
+
+    range() and snapshot() collect a window of nodes without locks, lock
+    them in list order (the order every operation locks in) and validate
+    the chain, so a returned result is linearizable. __iter__ takes no
+    locks and is weakly consistent like contains(). len() is an O(1)
+    counter, exact when no update is in flight. Keys come back normalized
+    (scalars as 1-tuples).
+    """
+
+    def __init__(self):
+        # Sentinel nodes for -∞ and +∞
+        self.head = Node(('HEAD',))
+        self.tail = Node(('TAIL',))
+        self.head.next = self.tail
+        self._size = 0
+        self._size_lock = threading.Lock()  # only taken by successful updates
+
+    def _add_size(self, delta):
+        with self._size_lock:
+            self._size += delta
+
+    def _key(self, val):
+        # Convert scalars to tuple to unify comparison
+        return val if isinstance(val, tuple) else (val,)
+
+    def _compare(self, a, b):
+        if a == ('HEAD',): return -1
+        if b == ('TAIL',): return -1
+        if a == ('TAIL',): return 1
+        if b == ('HEAD',): return 1
+
+        # Convert scalars to tuple to unify comparison
+        if not isinstance(a, tuple):
+            a = (a,)
+        if not isinstance(b, tuple):
+            b = (b,)
+
+        return (a > b) - (a < b)
+
+    def _find(self, val, start=None):
+        """
+        Find prev and curr such that prev.val < val <= curr.val, without locks,
+        starting from start (a node with a smaller value) when given.
+        """
+        prev = start if start is not None else self.head
+        curr = prev.next
+        while self._compare(curr.val, val) < 0:
+            prev, curr = curr, curr.next
+        return prev, curr
+
+    def _validate(self, prev, curr):
+        """
+        Local check only: both nodes are still in the list and adjacent.
+        """
+        return not prev.marked and not curr.marked and prev.next is curr
+
+    def add(self, val) -> bool:
+        val = self._key(val)
+        while True:
+            prev, curr = self._find(val)
+            with prev.lock, curr.lock:
+                if self._validate(prev, curr):
+                    if self._compare(curr.val, val) == 0:
+                        return False
+                    node = Node(val)
+                    node.next = curr
+                    prev.next = node
+                    self._add_size(1)
+                    return True
+
+    def remove(self, val) -> bool:
+        val = self._key(val)
+        while True:
+            prev, curr = self._find(val)
+            with prev.lock, curr.lock:
+                if self._validate(prev, curr):
+                    if self._compare(curr.val, val) != 0:
+                        return False
+                    curr.marked = True
+                    prev.next = curr.next
+                    self._add_size(-1)
+                    return True
+
+    def contains(self, val) -> bool:
+        val = self._key(val)
+        curr = self.head
+        while self._compare(curr.val, val) < 0:
+            curr = curr.next
+        return self._compare(curr.val, val) == 0 and not curr.marked
+
+    def _batch(self, vals):
+        """
+        Normalized keys of vals with their input positions, sorted by key
+        (stable, so duplicates are applied in input order).
+        """
+        keyed = [(self._key(v), i) for i, v in enumerate(vals)]
+        keyed.sort(key=lambda item: item[0])
+        return keyed
+
+    def _apply_batch(self, vals, op):
+        """
+        Apply add or remove to every value of vals in sorted order, each search
+        resuming from the prev of the previous value instead of from head.
+        Returns a list of bools aligned with vals.
+        """
+        results = [False] * len(vals)
+        hint = None
+        for val, i in self._batch(vals):
+            while True:
+                start = hint if hint is not None and not hint.marked else None
+                prev, curr = self._find(val, start)
+                with prev.lock, curr.lock:
+                    if not self._validate(prev, curr):
+                        hint = None
+                        continue
+                    found = self._compare(curr.val, val) == 0
+                    if op == 'add' and not found:
+                        node = Node(val)
+                        node.next = curr
+                        prev.next = node
+                        results[i] = True
+                    elif op == 'remove' and found:
+                        curr.marked = True
+                        prev.next = curr.next
+                        results[i] = True
+                    hint = prev
+                    break
+        changed = sum(results)
+        self._add_size(changed if op == 'add' else -changed)
+        return results
+
+    def add_all(self, vals):
+        """Add every value; returns per-element results like add()."""
+        return self._apply_batch(vals, 'add')
+
+    def remove_all(self, vals):
+        """Remove every value; returns per-element results like remove()."""
+        return self._apply_batch(vals, 'remove')
+
+    def contains_many(self, vals):
+        """Membership of every value from one lock-free sweep in sorted order."""
+        results = [False] * len(vals)
+        curr = self.head
+        for val, i in self._batch(vals):
+            while self._compare(curr.val, val) < 0:
+                curr = curr.next
+            results[i] = self._compare(curr.val, val) == 0 and not curr.marked
+        return results
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        tail = self.tail
+        curr = self.head.next
+        while curr is not tail:
+            if not curr.marked:
+                yield curr.val
+            curr = curr.next
+
+    def range(self, lo=None, hi=None):
+        """
+        Sorted values v with lo <= v < hi (None leaves that side open), from a
+        validated window: linearizable at the moment validation succeeds.
+        """
+        lo = None if lo is None else self._key(lo)
+        hi = None if hi is None else self._key(hi)
+        tail = self.tail
+        while True:
+            prev, curr = self._find(lo) if lo is not None else (self.head, self.head.next)
+            window = [prev]
+            while curr is not tail and (hi is None or self._compare(curr.val, hi) < 0):
+                window.append(curr)
+                curr = curr.next
+            window.append(curr)
+            locked = []
+            try:
+                for node in window:
+                    node.lock.acquire()
+                    locked.append(node)
+                if all(not a.marked and a.next is b for a, b in zip(window, window[1:])) and not curr.marked:
+                    return [node.val for node in window[1:-1]]
+            finally:
+                for node in reversed(locked):
+                    node.lock.release()
+
+    def snapshot(self):
+        """Every value, sorted; linearizable (see range())."""
+        return self.range()
@@ -1,95 +1,267 @@
 import threading
 
+from part2.thread_counter import ThreadCounter
+
+NUM_STRIPES = 1024  # number of pooled locks shared by the nodes
+
 class Node:
-    def __init__(self, val):
-        self.val = val  # có thể là tuple như (x, y)
+    __slots__ = ('val', 'next', 'marked', 'lock')
+
+    def __init__(self, val, lock):
+        self.val = val  # normalized key: always a tuple (scalars are wrapped once on insert)
         self.next = None
-        self.lock = threading.Lock()
+        self.marked = False  # set by remove() before the node is unlinked
+        self.lock = lock     # stripe from the set's lock table, shared with other nodes
 
 class OptimisticSet:
-    def __init__(self):
+    """
+    Linked-list set with optimistic synchronization.
+
+    Operations traverse without locks, lock prev and curr, then validate.
+    remove() marks curr before unlinking it, so validation is an O(1)
+    local check (both nodes unmarked and prev.next is curr) instead of a
+    second traversal from head.
+
+    retries counts validation failures and lock_waits counts lock
+    acquisitions that found the lock held; both are comparable with the
+    counters of FineGrainedSet and, like them, kept per thread so the
+    slow paths take no shared stats lock.
+
+    Nodes use __slots__, store the key already normalized to a tuple and
+    borrow one of num_stripes pooled locks (chosen by the key's hash)
+    instead of owning one; the sentinels are recognized by identity. A
+    thread only ever holds the two stripes of prev and curr, taken in a
+    fixed order (or once when they coincide), so sharing cannot deadlock.
+
+    range() and snapshot() collect the window of nodes without locks, take
+    all of their stripes in the same id order and validate the whole chain
+    (every node unmarked and linked to the next), so a returned result is
+    a linearizable view; a failed validation counts as a retry. __iter__
+    takes no locks (weakly consistent: keys in increasing order, every key
+    present throughout is yielded, none absent throughout is). len() is an
+    O(1) counter, exact when no update is in flight. Keys come back
+    normalized (scalars as 1-tuples).
+    """
+
+    def __init__(self, num_stripes=NUM_STRIPES):
         # Dùng tuple để tránh lỗi so sánh với val là tọa độ
-        inf = float('inf')
-        self.head = Node(('HEAD',))
-        self.tail = Node(('TAIL',))
+        self.locks = [threading.Lock() for _ in range(num_stripes)]
+        self.head = Node(('HEAD',), self.locks[0])
+        self.tail = Node(('TAIL',), self.locks[-1])
         self.head.next = self.tail
+        self._retries = ThreadCounter()
+        self._lock_waits = ThreadCounter()
+        self._size = 0
+        self._size_lock = threading.Lock()  # only taken by successful updates
 
-    def _compare(self, a, b):
-        if a == ('HEAD',): return -1
-        if b == ('TAIL',): return -1
-        if a == ('TAIL',): return 1
-        if b == ('HEAD',): return 1
-
+    def _key(self, val):
         # Convert scalars to tuple to unify comparison
-        if not isinstance(a, tuple):
-            a = (a,)
-        if not isinstance(b, tuple):
-            b = (b,)
+        return val if isinstance(val, tuple) else (val,)
 
-        return (a > b) - (a < b)
+    def _new_node(self, key):
+        return Node(key, self.locks[hash(key) % len(self.locks)])
 
-    def _find(self, val):
+    def _batch(self, vals):
         """
-        Tìm vị trí prev và curr sao cho prev.val < val <= curr.val
+        Normalized keys of vals with their input positions, sorted by key
+        (stable, so duplicates are applied in input order).
         """
-        prev, curr = self.head, self.head.next
-        while self._compare(curr.val, val) < 0:
+        keyed = [(self._key(v), i) for i, v in enumerate(vals)]
+        keyed.sort(key=lambda item: item[0])
+        return keyed
+
+    def _find(self, key, start=None):
+        """
+        Tìm vị trí prev và curr sao cho prev.val < key <= curr.val, starting
+        from start (a node with a smaller key) when given, else from head.
+        """
+        tail = self.tail
+        prev = start if start is not None else self.head
+        curr = prev.next
+        while curr is not tail and curr.val < key:
             prev, curr = curr, curr.next
         return prev, curr
 
+    def _add_size(self, delta):
+        with self._size_lock:
+            self._size += delta
+
+    @property
+    def retries(self):
+        return self._retries.value
+
+    @property
+    def lock_waits(self):
+        return self._lock_waits.value
+
+    def _lock(self, lock):
+        if not lock.acquire(blocking=False):
+            self._lock_waits.incr()
+            lock.acquire()
+
+    def _lock_pair(self, prev, curr):
+        """
+        Acquire the stripes of prev and curr in id order; returns them for _unlock.
+        """
+        a, b = prev.lock, curr.lock
+        if a is b:
+            self._lock(a)
+            return (a,)
+        if id(a) > id(b):
+            a, b = b, a
+        self._lock(a)
+        self._lock(b)
+        return (a, b)
+
+    def _unlock(self, locks):
+        for lock in reversed(locks):
+            lock.release()
+
     def _validate(self, prev, curr):
         """
-        Đảm bảo prev vẫn trỏ tới curr sau khi acquire lock.
+        Đảm bảo prev vẫn trỏ tới curr sau khi acquire lock: a removed node is
+        always marked first, so an unmarked prev is still reachable from head.
         """
-        node = self.head
-        while self._compare(node.val, prev.val) <= 0:
-            if node is prev:
-                return prev.next is curr
-            node = node.next
+        if not prev.marked and not curr.marked and prev.next is curr:
+            return True
+        self._retries.incr()
         return False
 
     def add(self, val) -> bool:
+        key = self._key(val)
         while True:
-            prev, curr = self._find(val)
-            prev.lock.acquire()
-            curr.lock.acquire()
+            prev, curr = self._find(key)
+            locks = self._lock_pair(prev, curr)
             try:
                 if self._validate(prev, curr):
-                    if self._compare(curr.val, val) != 0:
-                        node = Node(val)
+                    if curr is self.tail or curr.val != key:
+                        node = self._new_node(key)
                         node.next = curr
                         prev.next = node
+                        self._add_size(1)
                         return True
                     else:
                         return False
             finally:
-                curr.lock.release()
-                prev.lock.release()
+                self._unlock(locks)
 
     def remove(self, val) -> bool:
+        key = self._key(val)
         while True:
-            prev, curr = self._find(val)
-            prev.lock.acquire()
-            curr.lock.acquire()
+            prev, curr = self._find(key)
+            locks = self._lock_pair(prev, curr)
             try:
                 if self._validate(prev, curr):
-                    if self._compare(curr.val, val) == 0:
+                    if curr is not self.tail and curr.val == key:
+                        curr.marked = True
                         prev.next = curr.next
+                        self._add_size(-1)
                         return True
                     else:
                         return False
             finally:
-                curr.lock.release()
-                prev.lock.release()
+                self._unlock(locks)
 
     def contains(self, val) -> bool:
+        key = self._key(val)
         while True:
-            prev, curr = self._find(val)
-            prev.lock.acquire()
-            curr.lock.acquire()
+            prev, curr = self._find(key)
+            locks = self._lock_pair(prev, curr)
             try:
                 if self._validate(prev, curr):
-                    return self._compare(curr.val, val) == 0
+                    return curr is not self.tail and curr.val == key
+            finally:
+                self._unlock(locks)
+
+    def _apply_batch(self, vals, op):
+        """
+        Apply op ('add', 'remove' or 'contains') to every value of vals,
+        visiting the keys in sorted order so each search resumes from the
+        prev of the previous key instead of from head; a key whose
+        validation fails searches again from head. Returns a list of bools
+        aligned with vals.
+        """
+        results = [False] * len(vals)
+        hint = None
+        for key, i in self._batch(vals):
+            while True:
+                start = hint if hint is not None and not hint.marked else None
+                prev, curr = self._find(key, start)
+                locks = self._lock_pair(prev, curr)
+                try:
+                    if not self._validate(prev, curr):
+                        hint = None
+                        continue
+                    found = curr is not self.tail and curr.val == key
+                    if op == 'contains':
+                        results[i] = found
+                    elif op == 'add':
+                        if not found:
+                            node = self._new_node(key)
+                            node.next = curr
+                            prev.next = node
+                            results[i] = True
+                    elif found:
+                        curr.marked = True
+                        prev.next = curr.next
+                        results[i] = True
+                    hint = prev
+                    break
+                finally:
+                    self._unlock(locks)
+        if op != 'contains':
+            changed = sum(results)
+            self._add_size(changed if op == 'add' else -changed)
+        return results
+
+    def add_all(self, vals):
+        """Add every value; returns per-element results like add()."""
+        return self._apply_batch(vals, 'add')
+
+    def remove_all(self, vals):
+        """Remove every value; returns per-element results like remove()."""
+        return self._apply_batch(vals, 'remove')
+
+    def contains_many(self, vals):
+        """Membership of every value, from a single pass over the list."""
+        return self._apply_batch(vals, 'contains')
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        tail = self.tail
+        curr = self.head.next
+        while curr is not tail:
+            if not curr.marked:
+                yield curr.val
+            curr = curr.next
+
+    def range(self, lo=None, hi=None):
+        """
+        Sorted keys k with lo <= k < hi (None leaves that side open), from a
+        validated window: linearizable at the moment validation succeeds.
+        """
+        lo = None if lo is None else self._key(lo)
+        hi = None if hi is None else self._key(hi)
+        tail = self.tail
+        while True:
+            prev, curr = self._find(lo) if lo is not None else (self.head, self.head.next)
+            window = [prev]
+            while curr is not tail and (hi is None or curr.val < hi):
+                window.append(curr)
+                curr = curr.next
+            window.append(curr)
+            locks = sorted({id(node.lock): node.lock for node in window}.values(), key=id)
+            for lock in locks:
+                self._lock(lock)
+            try:
+                if all(not a.marked and a.next is b for a, b in zip(window, window[1:])) and not curr.marked:
+                    return [node.val for node in window[1:-1]]
             finally:
-                curr.lock.release()
-                prev.lock.release()
+                self._unlock(locks)
+            self._retries.incr()
+
+    def snapshot(self):
+        """Every key, sorted; linearizable (see range())."""
+        return self.range()
@@ -0,0 +1,133 @@
+import math
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+NUM_STRIPES = 64  # multiprocessing locks shared by all node ids
+
+class SharedSearchState:
+    """
+    Visited bitmap and g-score array over dense node ids (0 .. num_nodes-1,
+    e.g. CSRGraph indices), kept in one multiprocessing.shared_memory block
+    so worker processes can attach to it by name without copying.
+
+    Layout: g-scores as float64 (initialized to inf) followed by the visited
+    bitmap, one bit per id. Id i is guarded by stripe (i >> 3) % num_stripes,
+    so every bit of a bitmap byte, and the g-score of those ids, sits under
+    the same lock: test_and_set() and relax() are atomic read-modify-writes
+    across processes. is_visited() and g() read without locks; a
+    concurrent update is either seen whole or not at all, since a bit and
+    an aligned float64 are written in one store.
+
+    add/remove/contains alias the visited operations, so the structure
+    also works as a set of dense ids. Every per-id operation raises
+    IndexError for an id outside 0 .. num_nodes-1.
+
+    Create it in the parent, pass handle() to the workers (as Process args)
+    and call attach(handle) there; close() in every process and unlink()
+    once in the parent.
+    """
+
+    def __init__(self, shm, num_nodes, locks, owner):
+        self.shm = shm
+        self.num_nodes = num_nodes
+        self.locks = locks
+        self.owner = owner
+        self.g_score = np.ndarray((num_nodes,), dtype=np.float64, buffer=shm.buf)
+        self.bitmap = np.ndarray((math.ceil(num_nodes / 8),), dtype=np.uint8,
+                                 buffer=shm.buf, offset=8 * num_nodes)
+
+    @classmethod
+    def create(cls, num_nodes, num_stripes=NUM_STRIPES, ctx=None):
+        ctx = ctx or multiprocessing.get_context()
+        size = max(1, 8 * num_nodes + math.ceil(num_nodes / 8))
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        locks = [ctx.Lock() for _ in range(num_stripes)]
+        state = cls(shm, num_nodes, locks, owner=True)
+        state.g_score.fill(math.inf)
+        state.bitmap.fill(0)
+        return state
+
+    def handle(self):
+        """Picklable description (block name, size and locks) for attach()."""
+        return (self.shm.name, self.num_nodes, self.locks)
+
+    @classmethod
+    def attach(cls, handle):
+        """Map an existing state in this process; nothing is copied."""
+        name, num_nodes, locks = handle
+        return cls(shared_memory.SharedMemory(name=name), num_nodes, locks, owner=False)
+
+    def _check(self, i):
+        # negative ids would wrap around in numpy and ids past num_nodes can
+        # land in the padding bits of the last bitmap byte
+        if not 0 <= i < self.num_nodes:
+            raise IndexError(f"node id {i} out of range for {self.num_nodes} nodes")
+
+    def _lock(self, i):
+        return self.locks[(i >> 3) % len(self.locks)]
+
+    # --- visited bitmap ---
+    def test_and_set(self, i) -> bool:
+        """Mark i visited; True if this call set it (it was not visited before)."""
+        self._check(i)
+        byte, bit = i >> 3, 1 << (i & 7)
+        with self._lock(i):
+            old = int(self.bitmap[byte])
+            if old & bit:
+                return False
+            self.bitmap[byte] = old | bit
+            return True
+
+    def clear(self, i) -> bool:
+        """Unmark i; True if it was visited."""
+        self._check(i)
+        byte, bit = i >> 3, 1 << (i & 7)
+        with self._lock(i):
+            old = int(self.bitmap[byte])
+            if not old & bit:
+                return False
+            self.bitmap[byte] = old & ~bit
+            return True
+
+    def is_visited(self, i) -> bool:
+        self._check(i)
+        return bool(self.bitmap[i >> 3] & (1 << (i & 7)))
+
+    add = test_and_set
+    remove = clear
+    contains = is_visited
+
+    def visited_count(self):
+        return int(np.unpackbits(self.bitmap)[:self.num_nodes].sum())
+
+    # --- g-scores ---
+    def g(self, i):
+        self._check(i)
+        return float(self.g_score[i])
+
+    def relax(self, i, g) -> bool:
+        """Lower the g-score of i to g if that improves it; True if it did."""
+        self._check(i)
+        with self._lock(i):
+            if g < self.g_score[i]:
+                self.g_score[i] = g
+                return True
+            return False
+
+    def close(self):
+        # drop the numpy views first, mmap refuses to close while they export the buffer
+        self.g_score = self.bitmap = None
+        self.shm.close()
+
+    def unlink(self):
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        self.unlink()
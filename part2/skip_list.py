@@ -0,0 +1,276 @@
+import random
+import threading
+import time
+
+MAX_LEVEL = 24  # enough for ~2**24 nodes at p = 1/2
+
+class Node:
+    def __init__(self, val, top_level):
+        self.val = val  # normalized key: always a tuple (scalars are wrapped once on insert)
+        self.next = [None] * (top_level + 1)
+        self.top_level = top_level
+        self.marked = False        # logically deleted
+        self.fully_linked = False  # linked at every level up to top_level
+        self.lock = threading.RLock()
+
+class SkipListSet:
+    """
+    Lock-based concurrent skip list (lazy skip list, Herlihy & Shavit).
+
+    Same add/remove/contains API and _compare ordering as FineGrainedSet,
+    but with O(log n) expected traversals. add() locks the predecessors of
+    the new node level by level and validates them locally; remove() marks
+    the victim (logical deletion) before unlinking it top-down. contains()
+    takes no locks: a node counts as present once fully linked and until
+    marked.
+
+    range() and snapshot() collect a window of the bottom level without
+    locks, lock it from the largest key down (the order add() and remove()
+    lock in) and validate the chain, so a returned result is linearizable.
+    __iter__ walks the bottom level without locks and is weakly consistent
+    like contains(). len() is an O(1) counter, exact when no update is in
+    flight. Keys come back normalized (scalars as 1-tuples).
+    """
+
+    def __init__(self):
+        # Sentinel nodes for -∞ and +∞
+        self.head = Node(('HEAD',), MAX_LEVEL)
+        self.tail = Node(('TAIL',), MAX_LEVEL)
+        for level in range(MAX_LEVEL + 1):
+            self.head.next[level] = self.tail
+        self.head.fully_linked = self.tail.fully_linked = True
+        self._size = 0
+        self._size_lock = threading.Lock()  # only taken by successful updates
+
+    def _add_size(self, delta):
+        with self._size_lock:
+            self._size += delta
+
+    def _key(self, val):
+        # Convert scalars to tuple to unify comparison
+        return val if isinstance(val, tuple) else (val,)
+
+    def _compare(self, a, b):
+        if a == ('HEAD',): return -1
+        if b == ('TAIL',): return -1
+        if a == ('TAIL',): return 1
+        if b == ('HEAD',): return 1
+
+        # Convert scalars to tuple to unify comparison
+        if not isinstance(a, tuple):
+            a = (a,)
+        if not isinstance(b, tuple):
+            b = (b,)
+
+        return (a > b) - (a < b)
+
+    def _random_level(self):
+        # geometric: level l with probability 2 ** -(l + 1)
+        bits = random.getrandbits(MAX_LEVEL)
+        level = 0
+        while bits & 1 and level < MAX_LEVEL:
+            level += 1
+            bits >>= 1
+        return level
+
+    def _find(self, val, preds, succs):
+        """
+        Fill preds/succs per level (preds[l].val < val <= succs[l].val) without
+        locks. Returns the highest level at which a node with val was found, or -1.
+        """
+        found = -1
+        pred = self.head
+        for level in range(MAX_LEVEL, -1, -1):
+            curr = pred.next[level]
+            while self._compare(curr.val, val) < 0:
+                pred, curr = curr, curr.next[level]
+            if found == -1 and self._compare(curr.val, val) == 0:
+                found = level
+            preds[level] = pred
+            succs[level] = curr
+        return found
+
+    def add(self, val) -> bool:
+        val = self._key(val)
+        top_level = self._random_level()
+        preds = [None] * (MAX_LEVEL + 1)
+        succs = [None] * (MAX_LEVEL + 1)
+        while True:
+            found = self._find(val, preds, succs)
+            if found != -1:
+                node = succs[found]
+                if not node.marked:
+                    while not node.fully_linked:
+                        time.sleep(0)
+                    return False
+                continue  # being removed, retry
+            locked = []
+            try:
+                valid = True
+                prev_pred = None
+                for level in range(top_level + 1):
+                    pred, succ = preds[level], succs[level]
+                    if pred is not prev_pred:
+                        pred.lock.acquire()
+                        locked.append(pred)
+                        prev_pred = pred
+                    valid = not pred.marked and not succ.marked and pred.next[level] is succ
+                    if not valid:
+                        break
+                if not valid:
+                    continue
+                node = Node(val, top_level)
+                for level in range(top_level + 1):
+                    node.next[level] = succs[level]
+                for level in range(top_level + 1):
+                    preds[level].next[level] = node
+                node.fully_linked = True
+                self._add_size(1)
+                return True
+            finally:
+                for lock_node in locked:
+                    lock_node.lock.release()
+
+    def remove(self, val) -> bool:
+        val = self._key(val)
+        victim = None
+        is_marked = False
+        top_level = -1
+        preds = [None] * (MAX_LEVEL + 1)
+        succs = [None] * (MAX_LEVEL + 1)
+        while True:
+            found = self._find(val, preds, succs)
+            if found != -1:
+                victim = succs[found]
+            if not is_marked:
+                if found == -1 or not victim.fully_linked or victim.top_level != found or victim.marked:
+                    return False
+                top_level = victim.top_level
+                victim.lock.acquire()
+                if victim.marked:
+                    victim.lock.release()
+                    return False
+                victim.marked = True
+                is_marked = True
+            locked = []
+            try:
+                valid = True
+                prev_pred = None
+                for level in range(top_level + 1):
+                    pred = preds[level]
+                    if pred is not prev_pred:
+                        pred.lock.acquire()
+                        locked.append(pred)
+                        prev_pred = pred
+                    valid = not pred.marked and pred.next[level] is victim
+                    if not valid:
+                        break
+                if not valid:
+                    continue
+                for level in range(top_level, -1, -1):
+                    preds[level].next[level] = victim.next[level]
+                victim.lock.release()
+                self._add_size(-1)
+                return True
+            finally:
+                for lock_node in locked:
+                    lock_node.lock.release()
+
+    def contains(self, val) -> bool:
+        val = self._key(val)
+        pred = self.head
+        for level in range(MAX_LEVEL, -1, -1):
+            curr = pred.next[level]
+            while self._compare(curr.val, val) < 0:
+                pred, curr = curr, curr.next[level]
+            if self._compare(curr.val, val) == 0:
+                return curr.fully_linked and not curr.marked
+        return False
+
+    def _batch(self, vals):
+        """
+        Normalized keys of vals with their input positions, sorted by key
+        (stable, so duplicates are applied in input order).
+        """
+        keyed = [(self._key(v), i) for i, v in enumerate(vals)]
+        keyed.sort(key=lambda item: item[0])
+        return keyed
+
+    def add_all(self, vals):
+        """
+        Add every value; returns per-element results like add(). Each search
+        already costs O(log n) from head, so the batch is only sorted (nearby
+        keys share their upper-level path in cache) and applied one by one.
+        """
+        results = [False] * len(vals)
+        for val, i in self._batch(vals):
+            results[i] = self.add(val)
+        return results
+
+    def remove_all(self, vals):
+        """Remove every value; returns per-element results like remove()."""
+        results = [False] * len(vals)
+        for val, i in self._batch(vals):
+            results[i] = self.remove(val)
+        return results
+
+    def contains_many(self, vals):
+        """
+        Membership of every value, via contains() in sorted order: a sweep of
+        the bottom level would cost O(n) where k searches cost O(k log n).
+        """
+        results = [False] * len(vals)
+        for val, i in self._batch(vals):
+            results[i] = self.contains(val)
+        return results
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        tail = self.tail
+        curr = self.head.next[0]
+        while curr is not tail:
+            if curr.fully_linked and not curr.marked:
+                yield curr.val
+            curr = curr.next[0]
+
+    def range(self, lo=None, hi=None):
+        """
+        Sorted values v with lo <= v < hi (None leaves that side open), from a
+        validated bottom-level window: linearizable at the moment validation
+        succeeds. The start is found in O(log n).
+        """
+        lo = None if lo is None else self._key(lo)
+        hi = None if hi is None else self._key(hi)
+        tail = self.tail
+        preds = [None] * (MAX_LEVEL + 1)
+        succs = [None] * (MAX_LEVEL + 1)
+        while True:
+            if lo is None:
+                prev = self.head
+            else:
+                self._find(lo, preds, succs)
+                prev = preds[0]
+            window = [prev]
+            curr = prev.next[0]
+            while curr is not tail and (hi is None or self._compare(curr.val, hi) < 0):
+                window.append(curr)
+                curr = curr.next[0]
+            window.append(curr)
+            locked = []
+            try:
+                for node in reversed(window):
+                    node.lock.acquire()
+                    locked.append(node)
+                if (not curr.marked
+                        and all(not a.marked and a.next[0] is b for a, b in zip(window, window[1:]))
+                        and all(node.fully_linked for node in window[1:-1])):
+                    return [node.val for node in window[1:-1]]
+            finally:
+                for node in locked:
+                    node.lock.release()
+
+    def snapshot(self):
+        """Every value, sorted; linearizable (see range())."""
+        return self.range()
@@ -0,0 +1,183 @@
+import threading
+
+class StripedHashSet:
+    """
+    Closed-addressing hash set with lock striping (Herlihy & Shavit, ch. 13).
+
+    A fixed pool of stripe locks guards a table of bucket lists: bucket j is
+    protected by lock j % num_stripes, which stays valid because the table
+    capacity is always a multiple of the number of stripes. When the
+    average bucket holds more than max_load items the table doubles; the
+    resizing thread takes every stripe lock in order, re-checks that no one
+    else resized first, and holds them only while rehashing.
+
+    Same add/remove/contains API as FineGrainedSet, and the same equality:
+    a scalar v and the tuple (v,) are the same element.
+
+    snapshot() and range() hold every stripe lock while copying, so they are
+    linearizable but pause writers for O(n); buckets have no order, so
+    range() filters the whole table. __iter__ copies one bucket at a time
+    under its stripe lock (weakly consistent). len() sums the per-stripe
+    counters, exact when no update is in flight. Keys come back normalized
+    (scalars as 1-tuples).
+    """
+
+    def __init__(self, num_stripes=16, max_load=4):
+        self.num_stripes = num_stripes
+        self.max_load = max_load
+        self.locks = [threading.Lock() for _ in range(num_stripes)]
+        self.table = [[] for _ in range(num_stripes)]
+        self.counts = [0] * num_stripes  # items per stripe, updated under that stripe's lock
+        self.resizes = 0
+
+    def _key(self, val):
+        # same equality as _compare in the list-based sets
+        return val if isinstance(val, tuple) else (val,)
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def _policy(self):
+        return sum(self.counts) > self.max_load * len(self.table)
+
+    def _acquire_all(self):
+        for lock in self.locks:
+            lock.acquire()
+
+    def _release_all(self):
+        for lock in reversed(self.locks):
+            lock.release()
+
+    def _resize(self, old_capacity):
+        self._acquire_all()
+        try:
+            if len(self.table) != old_capacity:
+                return  # someone else resized first
+            new_table = [[] for _ in range(2 * old_capacity)]
+            for bucket in self.table:
+                for key in bucket:
+                    new_table[hash(key) % len(new_table)].append(key)
+            self.table = new_table
+            self.resizes += 1
+        finally:
+            self._release_all()
+
+    def add(self, val) -> bool:
+        key = self._key(val)
+        h = hash(key)
+        stripe = h % self.num_stripes
+        with self.locks[stripe]:
+            table = self.table
+            bucket = table[h % len(table)]
+            if key in bucket:
+                return False
+            bucket.append(key)
+            self.counts[stripe] += 1
+            capacity = len(table)
+        if self._policy():
+            self._resize(capacity)
+        return True
+
+    def remove(self, val) -> bool:
+        key = self._key(val)
+        h = hash(key)
+        stripe = h % self.num_stripes
+        with self.locks[stripe]:
+            bucket = self.table[h % len(self.table)]
+            if key not in bucket:
+                return False
+            bucket.remove(key)
+            self.counts[stripe] -= 1
+            return True
+
+    def contains(self, val) -> bool:
+        key = self._key(val)
+        h = hash(key)
+        with self.locks[h % self.num_stripes]:
+            return key in self.table[h % len(self.table)]
+
+    def _by_stripe(self, vals):
+        """
+        Group normalized keys of vals, with their input positions, by stripe
+        (input order is kept inside a stripe, so duplicates resolve in order).
+        """
+        groups = {}
+        for i, val in enumerate(vals):
+            key = self._key(val)
+            h = hash(key)
+            groups.setdefault(h % self.num_stripes, []).append((key, h, i))
+        return groups
+
+    def add_all(self, vals) -> list:
+        """
+        Add every value; returns per-element results like add(). Hashing has
+        no order to exploit, so instead of sorting the batch each stripe lock
+        is taken once for all of its keys.
+        """
+        results = [False] * len(vals)
+        for stripe, items in sorted(self._by_stripe(vals).items()):
+            with self.locks[stripe]:
+                table = self.table
+                for key, h, i in items:
+                    bucket = table[h % len(table)]
+                    if key not in bucket:
+                        bucket.append(key)
+                        self.counts[stripe] += 1
+                        results[i] = True
+                capacity = len(table)
+            if self._policy():
+                self._resize(capacity)
+        return results
+
+    def remove_all(self, vals) -> list:
+        """Remove every value, one lock acquisition per stripe."""
+        results = [False] * len(vals)
+        for stripe, items in sorted(self._by_stripe(vals).items()):
+            with self.locks[stripe]:
+                table = self.table
+                for key, h, i in items:
+                    bucket = table[h % len(table)]
+                    if key in bucket:
+                        bucket.remove(key)
+                        self.counts[stripe] -= 1
+                        results[i] = True
+        return results
+
+    def contains_many(self, vals) -> list:
+        """Membership of every value, one lock acquisition per stripe."""
+        results = [False] * len(vals)
+        for stripe, items in sorted(self._by_stripe(vals).items()):
+            with self.locks[stripe]:
+                table = self.table
+                for key, h, i in items:
+                    results[i] = key in table[h % len(table)]
+        return results
+
+    def __iter__(self):
+        # a resize replaces self.table but leaves the old buckets holding every
+        # key present at that moment, so walking the table seen at the start
+        # still yields each key present throughout
+        table = self.table
+        for j, bucket in enumerate(table):
+            with self.locks[j % self.num_stripes]:
+                keys = list(bucket)
+            yield from keys
+
+    def range(self, lo=None, hi=None):
+        """
+        Sorted keys k with lo <= k < hi (None leaves that side open); linearizable.
+        """
+        lo = None if lo is None else self._key(lo)
+        hi = None if hi is None else self._key(hi)
+        self._acquire_all()
+        try:
+            keys = [key for bucket in self.table for key in bucket
+                    if (lo is None or key >= lo) and (hi is None or key < hi)]
+        finally:
+            self._release_all()
+        keys.sort()
+        return keys
+
+    def snapshot(self):
+        """Every key, sorted; linearizable (see range())."""
+        return self.range()
@@ -0,0 +1,27 @@
+import threading
+
+class ThreadCounter:
+    """
+    Event counter for contended code paths: each thread increments its own
+    cell, so counting never takes a lock shared with other threads (a
+    global stats lock would serialize exactly the threads that are already
+    contending). value sums the cells; it is exact once the counting
+    threads are done and may lag increments still in flight.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._cells = []                       # one [count] per thread that ever counted
+        self._cells_lock = threading.Lock()    # only taken on a thread's first increment
+
+    def incr(self):
+        cell = getattr(self._local, 'cell', None)
+        if cell is None:
+            cell = self._local.cell = [0]
+            with self._cells_lock:
+                self._cells.append(cell)
+        cell[0] += 1
+
+    @property
+    def value(self):
+        return sum(cell[0] for cell in self._cells)
@@ -39,6 +39,25 @@ class TestFineGrainedSet(unittest.TestCase):
         for v in vals:
             self.assertFalse(self.set.contains(v))
 
+    def test_bulk_operations(self):
+        """add_all/contains_many/remove_all return per-element results in input order."""
+        self.assertEqual(self.set.add_all([5, 1, 3, 1, (5,)]), [True, True, True, False, False])
+        self.assertEqual(self.set.contains_many([3, 2, (1,), 9]), [True, False, True, False])
+        self.assertEqual(self.set.remove_all([9, 1, 5, 1]), [False, True, True, False])
+        self.assertEqual(self.set.contains_many([1, 3, 5]), [False, True, False])
+        self.assertEqual(self.set.add_all([]), [])
+
+    def test_range_snapshot_and_len(self):
+        """Scans return sorted normalized keys; range is half-open and len is kept in step."""
+        self.set.add_all([(2, 1), 7, (1, 5), 3, 9])
+        self.set.remove(9)
+        self.assertEqual(len(self.set), 4)
+        self.assertEqual(self.set.snapshot(), [(1, 5), (2, 1), (3,), (7,)])
+        self.assertEqual(list(self.set), self.set.snapshot())
+        self.assertEqual(self.set.range((2,), 7), [(2, 1), (3,)])
+        self.assertEqual(self.set.range(hi=2), [(1, 5)])
+        self.assertEqual(self.set.range(lo=8), [])
+
     # --- Multi-threaded tests ---
     def test_concurrent_add_unique(self):
         """
@@ -110,6 +129,8 @@ class TestFineGrainedSet(unittest.TestCase):
                 self.assertTrue(self.set.contains(i), f"Even {i} missing")
             else:
                 self.assertFalse(self.set.contains(i), f"Odd {i} still present")
+        # hand-over-hand traversal never restarts
+        self.assertEqual(self.set.retries, 0)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import threading
+from part2.copy_on_write import CopyOnWriteSet
+
+class TestCopyOnWriteSet(unittest.TestCase):
+    """Unit tests for CopyOnWriteSet (lock-free readers over published versions)."""
+
+    def setUp(self):
+        """Initialize a new CopyOnWriteSet before each test."""
+        self.set = CopyOnWriteSet(min_delta=4)
+
+    # --- Single-threaded tests ---
+    def test_add_and_contains(self):
+        """Test that adding a value and checking its existence behaves correctly."""
+        self.assertFalse(self.set.contains(10))
+        self.assertTrue(self.set.add(10))
+        self.assertTrue(self.set.contains(10))
+        self.assertFalse(self.set.add(10))
+        self.assertTrue(self.set.contains((10,)))
+
+    def test_remove_through_delta_and_compaction(self):
+        """Members stay right across delta updates and compactions into the base."""
+        for v in range(40):
+            self.assertTrue(self.set.add(v))
+        self.assertGreater(self.set.compactions, 0)
+        for v in range(0, 40, 3):
+            self.assertTrue(self.set.remove(v))
+            self.assertFalse(self.set.remove(v))
+        self.assertTrue(self.set.add(3))
+        expected = sorted({v for v in range(40) if v % 3 != 0} | {3})
+        self.assertEqual(self.set.snapshot(), [(v,) for v in expected])
+        self.assertEqual(len(self.set), len(expected))
+        self.assertEqual(self.set.range(10, 20), [(v,) for v in expected if 10 <= v < 20])
+
+    def test_snapshot_is_immutable(self):
+        """An iterator keeps reading the version it started on."""
+        self.set.add_all([1, 2, 3])
+        it = iter(self.set)
+        epoch = self.set.epoch
+        self.set.remove(2)
+        self.set.add(4)
+        self.assertEqual(list(it), [(1,), (2,), (3,)])
+        self.assertEqual(self.set.epoch, epoch + 2)
+
+    def test_bulk_write_publishes_once(self):
+        epoch = self.set.epoch
+        self.assertEqual(self.set.add_all([5, 1, 5, (1,), 2]), [True, True, False, False, True])
+        self.assertEqual(self.set.epoch, epoch + 1)
+        self.assertEqual(self.set.contains_many([1, 3, 5]), [True, False, True])
+        self.assertEqual(self.set.remove_all([1, 1, 9]), [True, False, False])
+
+    # --- Multi-threaded tests ---
+    def test_concurrent_add_same_value(self):
+        """Only one of N threads adding the same value succeeds."""
+        N = 20
+        results = []
+        lock = threading.Lock()
+
+        def worker():
+            r = self.set.add(99)
+            with lock:
+                results.append(r)
+
+        threads = [threading.Thread(target=worker) for _ in range(N)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results.count(True), 1, "Exactly one thread should succeed in adding")
+
+    def test_concurrent_writers_are_combined(self):
+        """Disjoint adds from several threads all land, in at most one version per add."""
+        def worker(start):
+            for i in range(start, 2000, 4):
+                self.assertTrue(self.set.add(i))
+
+        threads = [threading.Thread(target=worker, args=(s,)) for s in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(self.set), 2000)
+        self.assertLessEqual(self.set.epoch, 2000)
+        self.assertTrue(all(self.set.contains_many(list(range(2000)))))
+
+    def test_batches_are_published_whole(self):
+        """Readers see every add_all batch entirely or not at all, even next to single adds."""
+        batches = [list(range(b * 50, b * 50 + 50)) for b in range(40)]
+        torn = []
+
+        def batch_writer(start):
+            for batch in batches[start::2]:
+                self.set.add_all(batch)
+
+        def single_writer():
+            for i in range(10_000, 12_000):
+                self.set.add(i)
+
+        def reader():
+            while any(t.is_alive() for t in writers):
+                seen = self.set.contains_many(batches[-1] + batches[-2])
+                if any(seen[:50]) != all(seen[:50]) or any(seen[50:]) != all(seen[50:]):
+                    torn.append(seen)
+
+        writers = [threading.Thread(target=batch_writer, args=(s,)) for s in range(2)]
+        writers.append(threading.Thread(target=single_writer))
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        for t in writers + readers:
+            t.start()
+        for t in writers + readers:
+            t.join()
+        self.assertEqual(torn, [])
+        self.assertEqual(len(self.set), 2000 + 2000)
+
+if __name__ == '__main__':
+    unittest.main()
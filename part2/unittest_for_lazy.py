@@ -0,0 +1,129 @@
+import unittest
+import threading
+from part2.lazy_synchronization import LazySet
+
+class TestLazySet(unittest.TestCase):
+    """Unit tests for LazySet (a concurrent linked list set using lazy synchronization)."""
+
+    def setUp(self):
+        """Initialize a new LazySet before each test."""
+        self.set = LazySet()
+
+    # --- Single-threaded tests ---
+    def test_add_and_contains(self):
+        """Test that adding a value and checking its existence behaves correctly."""
+        self.assertFalse(self.set.contains(10))
+        self.assertTrue(self.set.add(10))
+        self.assertTrue(self.set.contains(10))
+        self.assertFalse(self.set.add(10))
+
+    def test_remove_marks_node(self):
+        """remove() marks the node before unlinking it, and the value can be re-added."""
+        self.set.add((1, 2))
+        node = self.set.head.next
+        self.assertTrue(self.set.remove((1, 2)))
+        self.assertTrue(node.marked)
+        self.assertIs(self.set.head.next, self.set.tail)
+        self.assertFalse(self.set.contains((1, 2)))
+        self.assertFalse(self.set.remove((1, 2)))
+        self.assertTrue(self.set.add((1, 2)))
+        self.assertTrue(self.set.contains((1, 2)))
+
+    def test_contains_takes_no_locks(self):
+        """contains() completes while every node lock is held by another thread."""
+        for v in range(10):
+            self.set.add(v)
+        locks = []
+        node = self.set.head
+        while node is not None:
+            locks.append(node.lock)
+            node = node.next
+        for lock in locks:
+            lock.acquire()
+        try:
+            results = []
+            t = threading.Thread(target=lambda: results.extend([self.set.contains(5), self.set.contains(50)]))
+            t.start()
+            t.join(timeout=5)
+            self.assertFalse(t.is_alive(), "contains() blocked on a node lock")
+            self.assertEqual(results, [True, False])
+        finally:
+            for lock in locks:
+                lock.release()
+
+    def test_validate_is_local(self):
+        """Validation fails for a marked or no-longer-adjacent pair without traversing from head."""
+        for v in (1, 2, 3):
+            self.set.add(v)
+        one = self.set.head.next
+        two = one.next
+        self.assertTrue(self.set._validate(one, two))
+        self.set.remove(2)
+        self.assertFalse(self.set._validate(one, two))
+        self.assertFalse(self.set._validate(two, two.next))
+
+    def test_range_snapshot_and_len(self):
+        """Scans return sorted normalized keys; range is half-open and len is kept in step."""
+        self.set.add_all([(2, 1), 7, (1, 5), 3, 9])
+        self.set.remove(9)
+        self.assertEqual(len(self.set), 4)
+        self.assertEqual(self.set.snapshot(), [(1, 5), (2, 1), (3,), (7,)])
+        self.assertEqual(list(self.set), self.set.snapshot())
+        self.assertEqual(self.set.range((2,), 7), [(2, 1), (3,)])
+        self.assertEqual(self.set.range(hi=2), [(1, 5)])
+        self.assertEqual(self.set.range(lo=8), [])
+
+    # --- Multi-threaded tests ---
+    def test_concurrent_add_same_value(self):
+        """Only one of N threads adding the same value succeeds."""
+        N = 20
+        results = []
+        lock = threading.Lock()
+
+        def worker():
+            r = self.set.add(99)
+            with lock:
+                results.append(r)
+
+        threads = [threading.Thread(target=worker) for _ in range(N)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results.count(True), 1, "Exactly one thread should succeed in adding")
+
+    def test_concurrent_add_remove_mixed(self):
+        """Threads add evens and remove odds from a set preloaded with 0–99."""
+        for i in range(100):
+            self.set.add(i)
+
+        def add_evens():
+            for i in range(0, 100, 2):
+                self.set.add(i)
+
+        def remove_odds():
+            for i in range(1, 100, 2):
+                self.set.remove(i)
+
+        misses = []
+
+        def read_all():
+            for i in range(0, 100, 2):
+                if not self.set.contains(i):
+                    misses.append(i)
+
+        threads = [threading.Thread(target=f) for f in (add_evens, remove_odds, read_all)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(misses, [], "contains() missed values that were never removed")
+        for i in range(100):
+            if i % 2 == 0:
+                self.assertTrue(self.set.contains(i), f"Even {i} missing")
+            else:
+                self.assertFalse(self.set.contains(i), f"Odd {i} still present")
+
+if __name__ == '__main__':
+    unittest.main()
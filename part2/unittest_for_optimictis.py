@@ -1,5 +1,8 @@
 import unittest
+import threading
+import time
 from collections import deque
+from part2.optimistic_synchronization import OptimisticSet
 from part3.algorithms import astar_parallel  # adjust to your actual package
 
 class SimpleGraph:
@@ -182,12 +185,143 @@ class TestAStar(unittest.TestCase):
         self.assertEqual(path[0], start)
         self.assertEqual(path[-1], goal)
 
+class TestOptimisticSet(unittest.TestCase):
+    """Unit tests for OptimisticSet (mark-based O(1) validation and retry counters)."""
+
+    def setUp(self):
+        """Initialize a new OptimisticSet before each test."""
+        self.set = OptimisticSet()
+
+    # --- Single-threaded tests ---
+    def test_add_and_contains(self):
+        """Test that adding a value and checking its existence behaves correctly."""
+        self.assertFalse(self.set.contains(10))
+        self.assertTrue(self.set.add(10))
+        self.assertTrue(self.set.contains(10))
+        self.assertFalse(self.set.add(10))
+        self.assertEqual(self.set.retries, 0)
+
+    def test_validate_rejects_removed_prev(self):
+        """A prev unlinked after the traversal is caught by its mark and counted as a retry."""
+        for v in (1, 2, 3):
+            self.set.add(v)
+        prev, curr = self.set._find((3,))
+        self.assertEqual((prev.val, curr.val), ((2,), (3,)))
+        self.assertTrue(self.set._validate(prev, curr))
+        self.assertTrue(self.set.remove(2))
+        self.assertTrue(prev.marked)
+        self.assertFalse(self.set._validate(prev, curr))
+        self.assertEqual(self.set.retries, 1)
+
+    def test_validate_rejects_inserted_node(self):
+        """A node inserted between prev and curr after the traversal fails validation as a retry."""
+        for v in (1, 3):
+            self.set.add(v)
+        prev, curr = self.set._find((3,))
+        self.set.add(2)
+        self.assertFalse(self.set._validate(prev, curr))
+        self.assertEqual(self.set.retries, 1)
+
+    def test_validate_does_not_traverse(self):
+        """Validation only looks at prev and curr, even with a detached head."""
+        for v in range(100):
+            self.set.add(v)
+        prev, curr = self.set._find((50,))
+        self.set.head.next = self.set.tail
+        self.assertTrue(self.set._validate(prev, curr))
+
+    def test_bulk_operations(self):
+        """add_all/contains_many/remove_all return per-element results in input order."""
+        self.assertEqual(self.set.add_all([5, 1, 3, 1, (5,)]), [True, True, True, False, False])
+        self.assertEqual(self.set.contains_many([3, 2, (1,), 9]), [True, False, True, False])
+        self.assertEqual(self.set.remove_all([9, 1, 5, 1]), [False, True, True, False])
+        self.assertEqual(self.set.contains_many([1, 3, 5]), [False, True, False])
+        self.assertEqual(self.set.retries, 0)
+
+    def test_range_snapshot_and_len(self):
+        """Scans return sorted normalized keys; range is half-open and len is kept in step."""
+        self.set.add_all([(2, 1), 7, (1, 5), 3, 9])
+        self.set.remove(9)
+        self.assertEqual(len(self.set), 4)
+        self.assertEqual(self.set.snapshot(), [(1, 5), (2, 1), (3,), (7,)])
+        self.assertEqual(list(self.set), self.set.snapshot())
+        self.assertEqual(self.set.range((2,), 7), [(2, 1), (3,)])
+        self.assertEqual(self.set.range(hi=2), [(1, 5)])
+        self.assertEqual(self.set.range(lo=8), [])
+        self.assertEqual(self.set.retries, 0)
+
+    # --- Multi-threaded tests ---
+    def test_concurrent_add_remove_mixed(self):
+        """Threads add evens and remove odds from a set preloaded with 0–199."""
+        for i in range(200):
+            self.set.add(i)
+
+        def add_evens():
+            for i in range(0, 200, 2):
+                self.set.add(i)
+
+        def remove_odds(start):
+            for i in range(start, 200, 4):
+                self.set.remove(i)
+
+        threads = [threading.Thread(target=add_evens),
+                   threading.Thread(target=remove_odds, args=(1,)),
+                   threading.Thread(target=remove_odds, args=(3,))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for i in range(200):
+            self.assertEqual(self.set.contains(i), i % 2 == 0)
+
+    def test_lock_waits_counted_under_contention(self):
+        """An add() that finds its stripes held counts a lock wait, then succeeds without a retry."""
+        for v in (1, 3):
+            self.set.add(v)
+        for lock in self.set.locks:
+            lock.acquire()
+        results = []
+        t = threading.Thread(target=lambda: results.append(self.set.add(2)))
+        try:
+            t.start()
+            deadline = time.monotonic() + 5
+            while self.set.lock_waits == 0 and time.monotonic() < deadline:
+                time.sleep(0.001)
+        finally:
+            for lock in self.set.locks:
+                lock.release()
+        t.join()
+        self.assertEqual(results, [True])
+        self.assertGreaterEqual(self.set.lock_waits, 1)
+        self.assertEqual(self.set.retries, 0)
+
+    def test_counters_sum_over_threads(self):
+        """Retries counted in separate per-thread cells add up exactly."""
+        for v in (1, 2, 3):
+            self.set.add(v)
+        prev, curr = self.set._find((3,))
+        self.set.remove(2)
+
+        def fail_validations():
+            for _ in range(500):
+                self.set._validate(prev, curr)
+
+        threads = [threading.Thread(target=fail_validations) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.set.retries, 2000)
+
 # —————————————————————————————
 
 
 # —————————————————————————————
 if __name__ == "__main__":
     print("Running unit tests without dynamic characteristics...")
-    suite = unittest.TestLoader().loadTestsFromTestCase(TestAStar)
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite([loader.loadTestsFromTestCase(TestAStar),
+                                loader.loadTestsFromTestCase(TestOptimisticSet)])
     unittest.TextTestRunner(verbosity=2).run(suite)
     print("All tests completed.")
\ No newline at end of file
@@ -3,10 +3,15 @@ import unittest
 import time
 import os
 import random
+import tracemalloc
 from collections import Counter
 
 from part2.fine_grained_lock import FineGrainedSet
 from part2.optimistic_synchronization import OptimisticSet
+from part2.lazy_synchronization import LazySet
+from part2.skip_list import SkipListSet
+from part2.striped_hash_set import StripedHashSet
+from part2.copy_on_write import CopyOnWriteSet
 
 # Directory for logs and results
 RESULT_DIR = os.path.join(
@@ -69,14 +74,39 @@ def run_correctness_test(test_case, SET_CLASS, SET_NAME, OPS, THREADS):
 
     chunks = [ops[i::THREADS] for i in range(THREADS)]
     threads = [threading.Thread(target=worker, args=(chunks[i],)) for i in range(THREADS)]
+    done = threading.Event()
+    samples = []
+
+    def monitor():
+        # snapshots taken under load must still be sorted, duplicate-free sets
+        while not done.is_set():
+            snap = s.snapshot()
+            samples.append((len(s), snap == sorted(set(snap))))
+            time.sleep(0.001)
+
+    sampler = threading.Thread(target=monitor)
+    sampler.start()
     for t in threads: t.start()
     for t in threads: t.join()
+    done.set()
+    sampler.join()
+    test_case.assertTrue(all(ok for _, ok in samples), f"{SET_NAME} snapshot under load is not a sorted set")
+    test_case.assertTrue(all(0 <= n <= max_val + 1 for n, _ in samples), f"{SET_NAME} len() out of range under load")
 
+    # every set returns keys normalized to tuples, so scalar x comes back as (x,)
     expected = {
-        x for x in set(adds_success) | set(removes_success)
+        (x,) for x in set(adds_success) | set(removes_success)
         if adds_success[x] > removes_success[x]
     }
-    actual = {x for x in range(max_val + 1) if s.contains(x)}
+    snapshot = s.snapshot()
+    actual = set(snapshot)
+
+    test_case.assertEqual(snapshot, sorted(actual), f"{SET_NAME} snapshot is not sorted")
+    test_case.assertEqual(len(s), len(actual), f"{SET_NAME} len() disagrees with snapshot()")
+    test_case.assertEqual(sorted(s), snapshot, f"{SET_NAME} iteration disagrees with snapshot()")
+    lo, hi = max_val // 4, max_val // 2
+    test_case.assertEqual(s.range(lo, hi), [x for x in snapshot if (lo,) <= x < (hi,)],
+                          f"{SET_NAME} range({lo}, {hi}) disagrees with snapshot()")
 
     test_case.assertEqual(
         actual,
@@ -116,12 +146,131 @@ def run_performance_test(SET_CLASS, SET_NAME, OPS, THREAD_COUNTS):
         for t in threads: t.join()
         duration = time.perf_counter() - start
         log(f"⏱ {SET_NAME} with {num_threads} threads completed in {duration:.4f} seconds")
+        if hasattr(s, 'retries'):
+            log(f"   {SET_NAME} retries: {s.retries}, lock waits: {s.lock_waits}")
+
+def run_read_heavy_test(SET_CLASS, SET_NAME, OPS, THREAD_COUNTS, READS_PER_WRITE=50):
+    """
+    Benchmark a read-heavy mix: READS_PER_WRITE contains() calls per add/remove.
+
+    The set is preloaded with every other value of range(OPS); each thread
+    then runs OPS operations over the same value range, alternating its
+    writes between add and remove so the size stays roughly constant.
+
+    Args:
+        SET_CLASS (class): the set class under test
+        SET_NAME (str): label for log output
+        OPS (int): number of operations per thread
+        THREAD_COUNTS (list[int]): thread counts to test
+        READS_PER_WRITE (int): lookups per update
+    """
+    for num_threads in THREAD_COUNTS:
+        log(f"-- Testing read-heavy ({READS_PER_WRITE}:1) mix of {SET_NAME} with {num_threads} threads")
+        s = SET_CLASS()
+        s.add_all(list(range(0, OPS, 2)))
+
+        def read_heavy_ops(seed):
+            for i in range(OPS):
+                x = (i * 7919 + seed) % OPS
+                if i % (READS_PER_WRITE + 1) == 0:
+                    if (i // (READS_PER_WRITE + 1)) % 2 == 0:
+                        s.add(x)
+                    else:
+                        s.remove(x)
+                else:
+                    s.contains(x)
+
+        threads = [threading.Thread(target=read_heavy_ops, args=(i,)) for i in range(num_threads)]
+        start = time.perf_counter()
+        for t in threads: t.start()
+        for t in threads: t.join()
+        duration = time.perf_counter() - start
+        log(f"⏱ {SET_NAME} read-heavy with {num_threads} threads completed in {duration:.4f} seconds")
+
+def run_memory_test(SET_CLASS, SET_NAME, SIZE):
+    """
+    Measure the memory footprint and single-thread build time of a set.
+
+    Inserts SIZE tuple keys in descending order, so every list-based set
+    adds at its head and the time reflects node creation rather than
+    traversal, and logs the bytes traced per element.
+
+    Args:
+        SET_CLASS (class): the set class under test
+        SET_NAME (str): label for log output
+        SIZE (int): number of elements to insert
+    """
+    log(f"-- Testing memory of {SET_NAME} with {SIZE} elements")
+    tracemalloc.start()
+    start = time.perf_counter()
+    s = SET_CLASS()
+    for i in range(SIZE, 0, -1):
+        s.add((i, i))
+    duration = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    log(f"📦 {SET_NAME}: {current / SIZE:.0f} bytes per element, built in {duration:.4f} seconds")
+    return current / SIZE
+
+def run_bulk_test(test_case, SET_CLASS, SET_NAME, OPS, THREADS, BATCH=8):
+    """
+    Check add_all/remove_all/contains_many under concurrent batches.
+
+    Like run_correctness_test, but every thread applies random batches of
+    BATCH values at a time; per-element results decide the expected final
+    content, which is then read back with a single contains_many call.
+
+    Args:
+        test_case (unittest.TestCase): the active test case instance
+        SET_CLASS (class): the set class under test
+        SET_NAME (str): the name for logging purposes
+        OPS (int): number of values per operation kind
+        THREADS (int): number of concurrent threads
+        BATCH (int): values per bulk call
+    """
+    log(f"-- Testing bulk operations of {SET_NAME}")
+    s = SET_CLASS()
+    rng = random.Random(7)
+    max_val = OPS // 2
+    batches = []
+    for _ in range(OPS // BATCH):
+        batches.append(('add', [rng.randint(0, max_val) for _ in range(BATCH)]))
+        batches.append(('remove', [rng.randint(0, max_val) for _ in range(BATCH)]))
+    rng.shuffle(batches)
+
+    adds_success = Counter()
+    removes_success = Counter()
+    counter_lock = threading.Lock()
+
+    def worker(chunk):
+        for op, xs in chunk:
+            results = s.add_all(xs) if op == 'add' else s.remove_all(xs)
+            with counter_lock:
+                for x, ok in zip(xs, results):
+                    if ok:
+                        (adds_success if op == 'add' else removes_success)[x] += 1
+
+    chunks = [batches[i::THREADS] for i in range(THREADS)]
+    threads = [threading.Thread(target=worker, args=(chunks[i],)) for i in range(THREADS)]
+    start = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    duration = time.perf_counter() - start
+
+    for x in set(adds_success) | set(removes_success):
+        test_case.assertIn(adds_success[x] - removes_success[x], (0, 1), f"{SET_NAME} unbalanced results for {x}")
+    expected = {x for x in adds_success if adds_success[x] > removes_success[x]}
+    values = list(range(max_val + 1))
+    actual = {x for x, found in zip(values, s.contains_many(values)) if found}
+    test_case.assertEqual(actual, expected, f"{SET_NAME} final state mismatch after bulk operations")
+    log(f"✅ {SET_NAME}: PASS bulk operations ({len(batches)} batches of {BATCH} in {duration:.4f} seconds)")
 
 class TestFineGrainedSet(unittest.TestCase):
     def setUp(self):
         self.THREAD = 4
         self.THREADS = [1, 2, 4, 8, 12]
         self.OPS = 1000
+        self.SIZE = 20000
 
     def test_01_finegrained_correctness(self):
         """Test correctness of FineGrainedSet under concurrent operations."""
@@ -131,11 +280,24 @@ class TestFineGrainedSet(unittest.TestCase):
         """Benchmark FineGrainedSet with increasing thread counts."""
         run_performance_test(FineGrainedSet, 'FineGrainedSet', self.OPS, self.THREADS)
 
+    def test_03_finegrained_memory(self):
+        """Measure bytes per element of FineGrainedSet."""
+        run_memory_test(FineGrainedSet, 'FineGrainedSet', self.SIZE)
+
+    def test_04_finegrained_bulk(self):
+        """Test add_all/remove_all/contains_many of FineGrainedSet under concurrent batches."""
+        run_bulk_test(self, FineGrainedSet, 'FineGrainedSet', self.OPS, self.THREAD)
+
+    def test_05_finegrained_read_heavy(self):
+        """Benchmark FineGrainedSet on a read-heavy mix with increasing thread counts."""
+        run_read_heavy_test(FineGrainedSet, 'FineGrainedSet', self.OPS, self.THREADS)
+
 class TestOptimisticSet(unittest.TestCase):
     def setUp(self):
         self.THREAD = 4
         self.THREADS = [1, 2, 4, 8, 12]
         self.OPS = 1000
+        self.SIZE = 20000
 
     def test_01_optimistic_correctness(self):
         """Test correctness of OptimisticSet under concurrent operations."""
@@ -145,6 +307,126 @@ class TestOptimisticSet(unittest.TestCase):
         """Benchmark OptimisticSet with increasing thread counts."""
         run_performance_test(OptimisticSet, 'OptimisticSet', self.OPS, self.THREADS)
 
+    def test_03_optimistic_memory(self):
+        """Measure bytes per element of OptimisticSet."""
+        run_memory_test(OptimisticSet, 'OptimisticSet', self.SIZE)
+
+    def test_04_optimistic_bulk(self):
+        """Test add_all/remove_all/contains_many of OptimisticSet under concurrent batches."""
+        run_bulk_test(self, OptimisticSet, 'OptimisticSet', self.OPS, self.THREAD)
+
+    def test_05_optimistic_read_heavy(self):
+        """Benchmark OptimisticSet on a read-heavy mix with increasing thread counts."""
+        run_read_heavy_test(OptimisticSet, 'OptimisticSet', self.OPS, self.THREADS)
+
+class TestLazySet(unittest.TestCase):
+    def setUp(self):
+        self.THREAD = 4
+        self.THREADS = [1, 2, 4, 8, 12]
+        self.OPS = 1000
+        self.SIZE = 20000
+
+    def test_01_lazy_correctness(self):
+        """Test correctness of LazySet under concurrent operations."""
+        run_correctness_test(self, LazySet, 'LazySet', self.OPS, self.THREAD)
+
+    def test_02_lazy_performance(self):
+        """Benchmark LazySet with increasing thread counts."""
+        run_performance_test(LazySet, 'LazySet', self.OPS, self.THREADS)
+
+    def test_03_lazy_memory(self):
+        """Measure bytes per element of LazySet."""
+        run_memory_test(LazySet, 'LazySet', self.SIZE)
+
+    def test_04_lazy_bulk(self):
+        """Test add_all/remove_all/contains_many of LazySet under concurrent batches."""
+        run_bulk_test(self, LazySet, 'LazySet', self.OPS, self.THREAD)
+
+    def test_05_lazy_read_heavy(self):
+        """Benchmark LazySet on a read-heavy mix with increasing thread counts."""
+        run_read_heavy_test(LazySet, 'LazySet', self.OPS, self.THREADS)
+
+class TestSkipListSet(unittest.TestCase):
+    def setUp(self):
+        self.THREAD = 4
+        self.THREADS = [1, 2, 4, 8, 12]
+        self.OPS = 1000
+        self.SIZE = 20000
+
+    def test_01_skiplist_correctness(self):
+        """Test correctness of SkipListSet under concurrent operations."""
+        run_correctness_test(self, SkipListSet, 'SkipListSet', self.OPS, self.THREAD)
+
+    def test_02_skiplist_performance(self):
+        """Benchmark SkipListSet with increasing thread counts."""
+        run_performance_test(SkipListSet, 'SkipListSet', self.OPS, self.THREADS)
+
+    def test_03_skiplist_memory(self):
+        """Measure bytes per element of SkipListSet."""
+        run_memory_test(SkipListSet, 'SkipListSet', self.SIZE)
+
+    def test_04_skiplist_bulk(self):
+        """Test add_all/remove_all/contains_many of SkipListSet under concurrent batches."""
+        run_bulk_test(self, SkipListSet, 'SkipListSet', self.OPS, self.THREAD)
+
+    def test_05_skiplist_read_heavy(self):
+        """Benchmark SkipListSet on a read-heavy mix with increasing thread counts."""
+        run_read_heavy_test(SkipListSet, 'SkipListSet', self.OPS, self.THREADS)
+
+class TestStripedHashSet(unittest.TestCase):
+    def setUp(self):
+        self.THREAD = 4
+        self.THREADS = [1, 2, 4, 8, 12]
+        self.OPS = 1000
+        self.SIZE = 20000
+
+    def test_01_stripedhash_correctness(self):
+        """Test correctness of StripedHashSet under concurrent operations."""
+        run_correctness_test(self, StripedHashSet, 'StripedHashSet', self.OPS, self.THREAD)
+
+    def test_02_stripedhash_performance(self):
+        """Benchmark StripedHashSet with increasing thread counts."""
+        run_performance_test(StripedHashSet, 'StripedHashSet', self.OPS, self.THREADS)
+
+    def test_03_stripedhash_memory(self):
+        """Measure bytes per element of StripedHashSet."""
+        run_memory_test(StripedHashSet, 'StripedHashSet', self.SIZE)
+
+    def test_04_stripedhash_bulk(self):
+        """Test add_all/remove_all/contains_many of StripedHashSet under concurrent batches."""
+        run_bulk_test(self, StripedHashSet, 'StripedHashSet', self.OPS, self.THREAD)
+
+    def test_05_stripedhash_read_heavy(self):
+        """Benchmark StripedHashSet on a read-heavy mix with increasing thread counts."""
+        run_read_heavy_test(StripedHashSet, 'StripedHashSet', self.OPS, self.THREADS)
+
+class TestCopyOnWriteSet(unittest.TestCase):
+    def setUp(self):
+        self.THREAD = 4
+        self.THREADS = [1, 2, 4, 8, 12]
+        self.OPS = 1000
+        self.SIZE = 20000
+
+    def test_01_copyonwrite_correctness(self):
+        """Test correctness of CopyOnWriteSet under concurrent operations."""
+        run_correctness_test(self, CopyOnWriteSet, 'CopyOnWriteSet', self.OPS, self.THREAD)
+
+    def test_02_copyonwrite_performance(self):
+        """Benchmark CopyOnWriteSet with increasing thread counts."""
+        run_performance_test(CopyOnWriteSet, 'CopyOnWriteSet', self.OPS, self.THREADS)
+
+    def test_03_copyonwrite_memory(self):
+        """Measure bytes per element of CopyOnWriteSet."""
+        run_memory_test(CopyOnWriteSet, 'CopyOnWriteSet', self.SIZE)
+
+    def test_04_copyonwrite_bulk(self):
+        """Test add_all/remove_all/contains_many of CopyOnWriteSet under concurrent batches."""
+        run_bulk_test(self, CopyOnWriteSet, 'CopyOnWriteSet', self.OPS, self.THREAD)
+
+    def test_05_copyonwrite_read_heavy(self):
+        """Benchmark CopyOnWriteSet on a read-heavy mix with increasing thread counts."""
+        run_read_heavy_test(CopyOnWriteSet, 'CopyOnWriteSet', self.OPS, self.THREADS)
+
 if __name__ == '__main__':
     with open(LOG_FILE, 'w', encoding='utf-8') as f:
         f.write("=== Test Log ===\n")
@@ -0,0 +1,112 @@
+import math
+import multiprocessing
+import unittest
+from part2.shared_state import SharedSearchState
+
+N = 5000
+WORKERS = 4
+
+def claim_all(handle, results):
+    """Worker: try to visit every id and relax its g-score; report the ids this process won."""
+    state = SharedSearchState.attach(handle)
+    won = []
+    for i in range(N):
+        if state.test_and_set(i):
+            won.append(i)
+        state.relax(i, float(i + multiprocessing.current_process().pid % 7))
+    results.put(won)
+    state.close()
+
+def write_through(handle):
+    state = SharedSearchState.attach(handle)
+    state.test_and_set(3)
+    state.relax(3, 1.5)
+    state.close()
+
+class TestSharedSearchState(unittest.TestCase):
+    """Unit tests for SharedSearchState (visited bitmap and g-scores in shared memory)."""
+
+    def setUp(self):
+        self.state = SharedSearchState.create(N, num_stripes=8)
+
+    def tearDown(self):
+        self.state.close()
+        self.state.unlink()
+
+    # --- Single-process tests ---
+    def test_test_and_set(self):
+        self.assertFalse(self.state.is_visited(42))
+        self.assertTrue(self.state.test_and_set(42))
+        self.assertFalse(self.state.test_and_set(42))
+        self.assertTrue(self.state.contains(42))
+        self.assertFalse(self.state.is_visited(41) or self.state.is_visited(43))
+        self.assertTrue(self.state.clear(42))
+        self.assertFalse(self.state.remove(42))
+        self.assertEqual(self.state.visited_count(), 0)
+
+    def test_relax(self):
+        self.assertEqual(self.state.g(7), math.inf)
+        self.assertTrue(self.state.relax(7, 3.0))
+        self.assertFalse(self.state.relax(7, 3.0))
+        self.assertTrue(self.state.relax(7, 2.5))
+        self.assertEqual(self.state.g(7), 2.5)
+
+    def test_out_of_range(self):
+        """Negative ids and ids past num_nodes (including the bitmap padding bits) raise."""
+        state = SharedSearchState.create(13)
+        try:
+            for i in (-1, -13, 13, 15, 16, N):
+                for op in (state.test_and_set, state.clear, state.is_visited, state.g):
+                    with self.assertRaises(IndexError):
+                        op(i)
+                with self.assertRaises(IndexError):
+                    state.relax(i, 1.0)
+            self.assertEqual(state.visited_count(), 0)
+            self.assertTrue(state.test_and_set(12))
+        finally:
+            state.close()
+            state.unlink()
+
+    # --- Multi-process tests ---
+    def test_attach_shares_memory(self):
+        """Writes made by a worker process are visible in the parent."""
+        p = multiprocessing.Process(target=write_through, args=(self.state.handle(),))
+        p.start()
+        p.join()
+        self.assertEqual(p.exitcode, 0)
+        self.assertTrue(self.state.is_visited(3))
+        self.assertEqual(self.state.g(3), 1.5)
+
+    def test_concurrent_test_and_set(self):
+        """Every id is won by exactly one of the competing processes."""
+        results = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=claim_all, args=(self.state.handle(), results))
+                 for _ in range(WORKERS)]
+        for p in procs:
+            p.start()
+        won = [results.get(timeout=60) for _ in procs]
+        for p in procs:
+            p.join()
+        self.assertTrue(all(p.exitcode == 0 for p in procs))
+        claimed = sorted(i for ids in won for i in ids)
+        self.assertEqual(claimed, list(range(N)))
+        self.assertEqual(self.state.visited_count(), N)
+        self.assertTrue(all(i <= self.state.g(i) < i + 7 for i in range(0, N, 97)))
+
+    def test_spawn_context(self):
+        """Locks and the shared block also reach workers started with spawn."""
+        ctx = multiprocessing.get_context('spawn')
+        with SharedSearchState.create(N, num_stripes=8, ctx=ctx) as state:
+            results = ctx.Queue()
+            procs = [ctx.Process(target=claim_all, args=(state.handle(), results)) for _ in range(2)]
+            for p in procs:
+                p.start()
+            won = [results.get(timeout=60) for _ in procs]
+            for p in procs:
+                p.join()
+            self.assertTrue(all(p.exitcode == 0 for p in procs))
+            self.assertEqual(sorted(i for ids in won for i in ids), list(range(N)))
+            self.assertEqual(state.visited_count(), N)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import threading
+from part2.skip_list import SkipListSet, MAX_LEVEL
+
+class TestSkipListSet(unittest.TestCase):
+    """Unit tests for SkipListSet (a lock-based concurrent skip list)."""
+
+    def setUp(self):
+        """Initialize a new SkipListSet before each test."""
+        self.set = SkipListSet()
+
+    def level_values(self, level):
+        vals = []
+        node = self.set.head.next[level]
+        while node is not self.set.tail:
+            vals.append(node.val)
+            node = node.next[level]
+        return vals
+
+    # --- Single-threaded tests ---
+    def test_add_and_contains(self):
+        """Test that adding a value and checking its existence behaves correctly."""
+        self.assertFalse(self.set.contains(10))
+        self.assertTrue(self.set.add(10))
+        self.assertTrue(self.set.contains(10))
+        self.assertFalse(self.set.add(10))
+
+    def test_remove(self):
+        """Removing unlinks the node at every level; removing again returns False."""
+        for v in range(200):
+            self.set.add((v % 20, v))
+        for v in range(0, 200, 2):
+            self.assertTrue(self.set.remove((v % 20, v)))
+            self.assertFalse(self.set.remove((v % 20, v)))
+        for level in range(MAX_LEVEL + 1):
+            vals = self.level_values(level)
+            self.assertEqual(vals, sorted(vals))
+            self.assertTrue(all(v[1] % 2 == 1 for v in vals))
+        self.assertEqual(len(self.level_values(0)), 100)
+
+    def test_levels_are_sorted_sublists(self):
+        """Every level is a sorted sublist of the level below, with mixed scalar/tuple keys."""
+        for v in [5, (3, 1), 7, (5, 0), 1, (9,)]:
+            self.set.add(v)
+        bottom = self.level_values(0)
+        self.assertEqual(bottom, [(1,), (3, 1), (5,), (5, 0), (7,), (9,)])
+        for level in range(1, MAX_LEVEL + 1):
+            self.assertTrue(set(self.level_values(level)) <= set(self.level_values(level - 1)))
+
+    def test_levels_grow_logarithmically(self):
+        for v in range(2000):
+            self.set.add(v)
+        self.assertGreater(len(self.level_values(1)), 700)
+        self.assertLess(len(self.level_values(4)), 300)
+
+    def test_range_snapshot_and_len(self):
+        """Scans return sorted normalized keys; range is half-open and len is kept in step."""
+        self.set.add_all([(2, 1), 7, (1, 5), 3, 9])
+        self.set.remove(9)
+        self.assertEqual(len(self.set), 4)
+        self.assertEqual(self.set.snapshot(), [(1, 5), (2, 1), (3,), (7,)])
+        self.assertEqual(list(self.set), self.set.snapshot())
+        self.assertEqual(self.set.range((2,), 7), [(2, 1), (3,)])
+        self.assertEqual(self.set.range(hi=2), [(1, 5)])
+        self.assertEqual(self.set.range(lo=8), [])
+
+    # --- Multi-threaded tests ---
+    def test_concurrent_add_same_value(self):
+        """Only one of N threads adding the same value succeeds."""
+        N = 20
+        results = []
+        lock = threading.Lock()
+
+        def worker():
+            r = self.set.add(99)
+            with lock:
+                results.append(r)
+
+        threads = [threading.Thread(target=worker) for _ in range(N)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results.count(True), 1, "Exactly one thread should succeed in adding")
+
+    def test_concurrent_add_remove_mixed(self):
+        """Threads add evens and remove odds from a set preloaded with 0–199."""
+        for i in range(200):
+            self.set.add(i)
+
+        def add_evens():
+            for i in range(0, 200, 2):
+                self.set.add(i)
+
+        def remove_odds(start):
+            for i in range(start, 200, 4):
+                self.set.remove(i)
+
+        threads = [threading.Thread(target=add_evens),
+                   threading.Thread(target=remove_odds, args=(1,)),
+                   threading.Thread(target=remove_odds, args=(3,))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(self.level_values(0), [(i,) for i in range(0, 200, 2)])
+        for i in range(200):
+            self.assertEqual(self.set.contains(i), i % 2 == 0)
+
+if __name__ == '__main__':
+    unittest.main()
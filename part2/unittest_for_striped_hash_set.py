@@ -0,0 +1,87 @@
+import unittest
+import threading
+from part2.striped_hash_set import StripedHashSet
+
+class TestStripedHashSet(unittest.TestCase):
+    """Unit tests for StripedHashSet (a lock-striped resizable hash set)."""
+
+    def setUp(self):
+        """Initialize a new StripedHashSet before each test."""
+        self.set = StripedHashSet(num_stripes=4, max_load=2)
+
+    # --- Single-threaded tests ---
+    def test_add_and_contains(self):
+        """Test that adding a value and checking its existence behaves correctly."""
+        self.assertFalse(self.set.contains(10))
+        self.assertTrue(self.set.add(10))
+        self.assertTrue(self.set.contains(10))
+        self.assertFalse(self.set.add(10))
+
+    def test_remove(self):
+        for v in range(50):
+            self.set.add((v, v))
+        for v in range(0, 50, 2):
+            self.assertTrue(self.set.remove((v, v)))
+            self.assertFalse(self.set.remove((v, v)))
+        for v in range(50):
+            self.assertEqual(self.set.contains((v, v)), v % 2 == 1)
+        self.assertEqual(len(self.set), 25)
+
+    def test_scalar_and_tuple_are_equal(self):
+        """Same equality as the list-based sets: v and (v,) are one element."""
+        self.assertTrue(self.set.add(7))
+        self.assertTrue(self.set.contains((7,)))
+        self.assertFalse(self.set.add((7,)))
+        self.assertTrue(self.set.remove((7,)))
+        self.assertFalse(self.set.contains(7))
+
+    def test_resize_keeps_stripes_aligned(self):
+        """The table doubles past max_load and each bucket stays under its stripe lock."""
+        for v in range(500):
+            self.set.add(v)
+        self.assertGreater(self.set.resizes, 0)
+        capacity = len(self.set.table)
+        self.assertEqual(capacity % self.set.num_stripes, 0)
+        self.assertLessEqual(len(self.set), self.set.max_load * capacity)
+        for j, bucket in enumerate(self.set.table):
+            for key in bucket:
+                self.assertEqual(hash(key) % capacity, j)
+        self.assertTrue(all(self.set.contains(v) for v in range(500)))
+
+    # --- Multi-threaded tests ---
+    def test_concurrent_add_same_value(self):
+        """Only one of N threads adding the same value succeeds."""
+        N = 20
+        results = []
+        lock = threading.Lock()
+
+        def worker():
+            r = self.set.add(99)
+            with lock:
+                results.append(r)
+
+        threads = [threading.Thread(target=worker) for _ in range(N)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results.count(True), 1, "Exactly one thread should succeed in adding")
+
+    def test_concurrent_add_during_resize(self):
+        """Disjoint adds from several threads survive the resizes they trigger."""
+        def worker(start):
+            for i in range(start, 2000, 4):
+                self.assertTrue(self.set.add(i))
+
+        threads = [threading.Thread(target=worker, args=(s,)) for s in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(self.set), 2000)
+        self.assertTrue(all(self.set.contains(i) for i in range(2000)))
+        self.assertEqual(sum(len(b) for b in self.set.table), 2000)
+
+if __name__ == '__main__':
+    unittest.main()
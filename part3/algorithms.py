@@ -1,10 +1,15 @@
 import threading
 import math
 import time
-from queue import PriorityQueue, Empty
+from queue import Empty
 from collections import defaultdict
 from part2.fine_grained_lock import FineGrainedSet
 from part2.optimistic_synchronization import OptimisticSet
+from part2.lazy_synchronization import LazySet
+from part2.skip_list import SkipListSet
+from part2.striped_hash_set import StripedHashSet
+from part1.search_state import SearchTree, NO_PARENT
+from part1.open_list import make_open_list
 
 def get_edge_cost(graph, u, v):
     """
@@ -46,12 +51,56 @@ def is_within_ellipse(p, a, b, graph, factor=100):
     except KeyError:
         return True
 
-def astar_parallel(start, goal, graph, h_func, f_vector_func=None, version="FineGrain", num_threads=4):
+# visited-set implementations selectable by version; other names use OptimisticSet
+VISITED_SETS = {
+    "FineGrain": FineGrainedSet,
+    "Optimistic": OptimisticSet,
+    "Lazy": LazySet,
+    "SkipList": SkipListSet,
+    "StripedHash": StripedHashSet,
+}
+
+class LockedOpenList:
+    """
+    A part1 open list behind a lock, with the put()/get_nowait() calls of
+    queue.PriorityQueue that the workers use; other threads steal from it.
+    Entries are ((f, hop), node, g, parent).
+    """
+
+    def __init__(self, kind='heap'):
+        self.queue = make_open_list(kind)
+        self.lock = threading.Lock()
+
+    def put(self, entry):
+        key, node, g_val, parent = entry
+        with self.lock:
+            self.queue.push(key, node, (g_val, parent))
+
+    def get_nowait(self):
+        with self.lock:
+            if not self.queue:
+                raise Empty
+            key, node, (g_val, parent) = self.queue.pop()
+        return key, node, g_val, parent
+
+def astar_parallel(start, goal, graph, h_func, f_vector_func=None, version="FineGrain", num_threads=4,
+                   open_list='heap'):
+    """
+    Parallel A*: num_threads workers share the visited set named by version
+    (see VISITED_SETS) and each owns one open list, stealing from the others
+    when its own is empty. open_list picks the queue as in astar_solver
+    ('heap', 'indexed', 'dary' or a factory); 'radix' is rejected because
+    keys are (f, hop) pairs and workers push below each other's last pop.
+    Returns: (path, [f, hop]) or (None, None)
+    """
+    if open_list == 'radix':
+        raise ValueError("astar_parallel needs an open list that takes (f, hop) keys in any order")
     print(f"[Main] Starting A* from {start} to {goal} with {num_threads} threads using {version}")
 
-    open_queues = [PriorityQueue() for _ in range(num_threads)]
-    visited = FineGrainedSet() if version == "FineGrain" else OptimisticSet()
+    open_queues = [LockedOpenList(open_list) for _ in range(num_threads)]
+    visited = VISITED_SETS.get(version, OptimisticSet)()
     g_score = defaultdict(lambda: float('inf'))
+    tree = SearchTree(thread_safe=True)
     g_score[start] = 0.0
 
     g_lock = threading.Lock()
@@ -68,7 +117,7 @@ def astar_parallel(start, goal, graph, h_func, f_vector_func=None, version="Fine
     done_lock = threading.Lock()
 
     h0 = h_func(start, goal, graph)
-    open_queues[0].put(((h0, 0), start, 0.0, [start]))
+    open_queues[0].put(((h0, 0), start, 0.0, NO_PARENT))
     # print(f"[Main] Initial node {start} pushed with h={h0}")
 
     def worker(tid):
@@ -78,7 +127,7 @@ def astar_parallel(start, goal, graph, h_func, f_vector_func=None, version="Fine
             for i in range(num_threads):
                 q = open_queues[(tid + i) % num_threads]
                 try:
-                    (f_val, hopper), node, g_val, path = q.get_nowait()
+                    (f_val, hopper), node, g_val, parent = q.get_nowait()
                     # print(f"[Thread {tid}] Got node {node} with f={f_val}, g={g_val}")
                     found_work = True
                     break
@@ -110,18 +159,24 @@ def astar_parallel(start, goal, graph, h_func, f_vector_func=None, version="Fine
                 continue
 
             visited.add(node)
+            record = tree.add(node, parent)
             # print(f"[Thread {tid}] Visiting node {node}")
 
             if node == goal:
                 with best_goal_lock:
                     if f_val < result['f_vec'][0]:
-                        result['path'] = path
+                        result['path'] = tree.path(record)
                         result['f_vec'] = [f_val, hopper]
                         # print(f"[Thread {tid}] Goal {goal} reached! Path length: {len(path)}")
                         stop_event.set()
                         return
 
-            for nbr in graph.neighbors(node):
+            # one batched lookup for the whole expansion; visited neighbors would be skipped when popped anyway
+            nbrs = list(graph.neighbors(node))
+            closed = visited.contains_many(nbrs)
+            for nbr, is_closed in zip(nbrs, closed):
+                if is_closed:
+                    continue
                 # print(f"[Thread {tid}] Checking neighbor {nbr} of {node}")
                 edge_cost = get_edge_cost(graph, node, nbr)
                 tentative_g = g_val + edge_cost
@@ -140,7 +195,7 @@ def astar_parallel(start, goal, graph, h_func, f_vector_func=None, version="Fine
 
                 h_nbr = h_func(nbr, goal, graph)
                 new_f = tentative_g + h_nbr
-                open_queues[tid % num_threads].put(((new_f, new_hop), nbr, tentative_g, path + [nbr]))
+                open_queues[tid % num_threads].put(((new_f, new_hop), nbr, tentative_g, record))
                 # print(f"[Thread {tid}] Pushed {nbr} with f={new_f}, g={tentative_g}, hop={new_hop}")
 
     threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(num_threads)]
@@ -1,14 +1,14 @@
 import os
 import unittest
-import osmnx as ox
 import networkx as nx
 import time
 
 from part3.algorithms import astar_parallel as astar_parallel_solver
+from common.heuristics import HeuristicTable
+from common.snapping import load_spatial_index
 from common.common import (
     load_map,
     load_point_pairs,
-    dynamic_heuristic as dynamic_h,
     f_vector_basic,
     save_results,
     save_route_image
@@ -18,14 +18,16 @@ CITY = "Ho Chi Minh City"
 POINT_FILE = "setup_points_list.env"
 OUTPUT_BASE_DIR = "results"
 THREAD_COUNTS = [1, 2, 4, 8, 12]
-VERSIONS = ["FineGrain", "Optimictis"]
+VERSIONS = ["FineGrain", "Optimictis", "Lazy", "SkipList", "StripedHash"]
 
 class TestParallelAStar(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         cls.graph = load_map(CITY)
+        cls.h_table = HeuristicTable(cls.graph)
         point_pairs_by_city = load_point_pairs(POINT_FILE)
         cls.point_pairs = point_pairs_by_city.get(CITY, [])
+        cls.node_pairs = load_spatial_index(CITY, cls.graph).snap_pairs(cls.point_pairs)
         os.makedirs(OUTPUT_BASE_DIR, exist_ok=True)
 
     def run_astar_version(self, name, version, threads):
@@ -34,13 +36,11 @@ class TestParallelAStar(unittest.TestCase):
                                  f"run_with_{threads}_threads", "images")
         os.makedirs(image_dir, exist_ok=True)
 
-        for (name1, coord1), (name2, coord2) in self.point_pairs:
-            node1 = ox.nearest_nodes(self.graph, coord1[1], coord1[0])
-            node2 = ox.nearest_nodes(self.graph, coord2[1], coord2[0])
+        for ((name1, _), (name2, _)), (node1, node2) in zip(self.point_pairs, self.node_pairs):
             start_time = time.time()
             path, f_vec = astar_parallel_solver(
                 node1, node2, self.graph,
-                dynamic_h, f_vector_basic,
+                self.h_table.dynamic, f_vector_basic,
                 version=version, num_threads=threads
             )
             elapsed = time.time() - start_time
@@ -0,0 +1,75 @@
+import unittest
+from unittest import mock
+from part3.algorithms import astar_parallel, VISITED_SETS
+from part2.lazy_synchronization import LazySet
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return { v: [ {'length': cost} ]
+                 for v, cost in self._adj.get(u, []) }
+
+def zero_h(u, v, _):
+    return 0
+
+def manhattan_h(u, v, graph):
+    # assume nodes are (x,y) tuples
+    ux, uy = u; vx, vy = v
+    return abs(ux - vx) + abs(uy - vy)
+
+
+class TestAStarLazy(unittest.TestCase):
+    def test_0001(self):
+        """version="Lazy" uses LazySet as the visited set"""
+        self.assertIs(VISITED_SETS["Lazy"], LazySet)
+        g = SimpleGraph({'A':[('B',1)], 'B':[('C',1)], 'C':[]})
+        with mock.patch.dict(VISITED_SETS, {"Lazy": mock.Mock(wraps=LazySet)}) as sets:
+            path, fvec = astar_parallel('A','C', g, zero_h, None, "Lazy", 2)
+            sets["Lazy"].assert_called_once()
+        self.assertEqual(path, ['A','B','C'])
+        self.assertEqual(fvec[0], 2)
+
+    def test_0002(self):
+        """Single‐obstacle detour A→{B,C}→D, cost=2"""
+        g = SimpleGraph({
+            'A':[('B',1),('C',1)],
+            'B':[('D',1)],
+            'C':[('D',1)],
+            'D':[]
+        })
+        path, fvec = astar_parallel('A','D', g, zero_h, None, "Lazy", 4)
+        self.assertIn(path, [['A','B','D'], ['A','C','D']])
+        self.assertEqual(fvec[0], 2)
+
+    def test_0003(self):
+        """No path available => (None,None)"""
+        g = SimpleGraph({'A':[('B',1)], 'B':[], 'G':[]})
+        path, fvec = astar_parallel('A','G', g, zero_h, None, "Lazy", 4)
+        self.assertIsNone(path)
+        self.assertIsNone(fvec)
+
+    def test_0004(self):
+        """3x3 grid, obstacle row in middle, cost=4"""
+        edges = {}
+        blocked = {(0,1), (1,1)}
+        for x in range(3):
+            for y in range(3):
+                nbrs = []
+                for dx,dy in [(1,0),(-1,0),(0,1),(0,-1)]:
+                    v = (x+dx, y+dy)
+                    if 0<=v[0]<3 and 0<=v[1]<3 and v not in blocked:
+                        nbrs.append((v,1))
+                edges[(x,y)] = nbrs
+        g = SimpleGraph(edges)
+        path, fvec = astar_parallel((0,0), (2,2), g, manhattan_h, None, "Lazy", 4)
+        self.assertEqual(path, [(0,0),(1,0),(2,0),(2,1),(2,2)])
+        self.assertEqual(fvec[0], 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from part3.algorithms import astar_parallel, VISITED_SETS
+from part2.striped_hash_set import StripedHashSet
+
+class SimpleGraph:
+    def __init__(self, edges):
+        # edges: dict node -> list of (neighbor, cost)
+        self._adj = edges
+
+    def neighbors(self, u):
+        return [v for v, _ in self._adj.get(u, [])]
+
+    def __getitem__(self, u):
+        return { v: [ {'length': cost} ]
+                 for v, cost in self._adj.get(u, []) }
+
+def zero_h(u, v, _):
+    return 0
+
+def manhattan_h(u, v, graph):
+    # assume nodes are (x,y) tuples
+    ux, uy = u; vx, vy = v
+    return abs(ux - vx) + abs(uy - vy)
+
+def grid(size, blocked=()):
+    edges = {}
+    for x in range(size):
+        for y in range(size):
+            nbrs = []
+            for dx,dy in [(1,0),(-1,0),(0,1),(0,-1)]:
+                v = (x+dx, y+dy)
+                if 0<=v[0]<size and 0<=v[1]<size and v not in blocked:
+                    nbrs.append((v,1))
+            edges[(x,y)] = nbrs
+    return SimpleGraph(edges)
+
+
+class TestAStarStripedHash(unittest.TestCase):
+    def test_0001(self):
+        """version="StripedHash" is registered and finds A→B→C"""
+        self.assertIs(VISITED_SETS["StripedHash"], StripedHashSet)
+        g = SimpleGraph({'A':[('B',1)], 'B':[('C',1)], 'C':[]})
+        path, fvec = astar_parallel('A','C', g, zero_h, None, "StripedHash", 4)
+        self.assertEqual(path, ['A','B','C'])
+        self.assertEqual(fvec[0], 2)
+
+    def test_0002(self):
+        """3x3 grid, obstacle row in middle, cost=4"""
+        g = grid(3, blocked={(0,1), (1,1)})
+        path, fvec = astar_parallel((0,0), (2,2), g, manhattan_h, None, "StripedHash", 4)
+        self.assertEqual(path, [(0,0),(1,0),(2,0),(2,1),(2,2)])
+        self.assertEqual(fvec[0], 4)
+
+    def test_0003(self):
+        """12x12 open grid with one thread: optimal cost 22"""
+        g = grid(12)
+        path, fvec = astar_parallel((0,0), (11,11), g, manhattan_h, None, "StripedHash", 1)
+        self.assertEqual((path[0], path[-1]), ((0,0), (11,11)))
+        self.assertEqual(fvec[0], 22)
+
+    def test_0004(self):
+        """No path available => (None,None)"""
+        g = SimpleGraph({'A':[('B',1)], 'B':[], 'G':[]})
+        path, fvec = astar_parallel('A','G', g, zero_h, None, "StripedHash", 4)
+        self.assertIsNone(path)
+        self.assertIsNone(fvec)
+
+    def test_0005(self):
+        """Indexed and 4-ary open lists give the same optimal cost; radix is rejected"""
+        g = grid(12, blocked={(5, y) for y in range(11)})
+        for open_list in ('heap', 'indexed', 'dary'):
+            path, fvec = astar_parallel((0,0), (11,11), g, manhattan_h, None, "StripedHash", 4,
+                                        open_list=open_list)
+            self.assertEqual((path[0], path[-1]), ((0,0), (11,11)))
+            self.assertEqual(fvec[0], 22)
+        with self.assertRaises(ValueError):
+            astar_parallel((0,0), (11,11), g, manhattan_h, None, "StripedHash", 4, open_list='radix')
+
+if __name__ == "__main__":
+    unittest.main()